@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""ML modülleri düz dizinde; testler onları doğrudan import eder."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""forecast_store: upsert semantiği, staging UPDATE ... FROM satır sayıları, NaN -> NULL."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import db_config
+from forecast_store import save_week_actuals, save_week_forecasts, update_forecast_components
+
+# database.ts şeması (bileşen kolonları dahil)
+SCHEMA = """
+    CREATE TABLE forecast_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week_start DATE NOT NULL,
+        week_end DATE NOT NULL,
+        forecast_datetime TEXT NOT NULL,
+        predicted_price REAL NOT NULL,
+        actual_price REAL,
+        absolute_error REAL,
+        percentage_error REAL,
+        prophet_component REAL,
+        xgboost_component REAL,
+        lstm_component REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(week_start, forecast_datetime)
+    );
+    CREATE TABLE weekly_performance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week_start DATE NOT NULL,
+        week_end DATE NOT NULL,
+        mape REAL NOT NULL,
+        mae REAL NOT NULL,
+        rmse REAL NOT NULL,
+        total_predictions INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(week_start)
+    );
+"""
+
+WEEK, WEEK_END = '2025-09-22', '2025-09-28'
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Geçici DB; forecast_store'un paylaşılan yazıcı bağlantısı buraya açılır"""
+    path = str(tmp_path / 'forecast.db')
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA)
+    monkeypatch.setattr(db_config, 'DB_PATH', path)
+
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+    db_config.close_connections()
+
+
+def forecast(start, hours, price=2500.0, **components):
+    ds = pd.date_range(start, periods=hours, freq='h', tz='Europe/Istanbul')
+    return pd.DataFrame({'ds': ds, 'yhat': price + np.arange(hours, dtype=float), **components})
+
+
+def rows(conn, week=WEEK):
+    return conn.execute("""
+        SELECT forecast_datetime, predicted_price, actual_price, absolute_error,
+               prophet_component, xgboost_component, lstm_component
+        FROM forecast_history WHERE week_start = ? ORDER BY forecast_datetime
+    """, (week,)).fetchall()
+
+
+def test_replace_week_vs_upsert(db):
+    assert save_week_forecasts(forecast('2025-09-22 00:00', 3), WEEK, WEEK_END) == 3
+    save_week_forecasts(forecast('2025-09-29 00:00', 2), '2025-09-29', '2025-10-05')
+    save_week_actuals(WEEK, ['2025-09-22 00:00:00', '2025-09-22 01:00:00'],
+                      [2600.0, 2700.0], [100.0, 199.0], [3.8, 7.4])
+
+    # replace_week=False: aynı saat güncellenir ve gerçek değeri sıfırlanır, diğerleri kalır
+    save_week_forecasts(forecast('2025-09-22 01:00', 3, price=3000.0), WEEK, WEEK_END,
+                        replace_week=False)
+    assert rows(db) == [
+        ('2025-09-22 00:00:00', 2500.0, 2600.0, 100.0, None, None, None),
+        ('2025-09-22 01:00:00', 3000.0, None, None, None, None, None),
+        ('2025-09-22 02:00:00', 3001.0, None, None, None, None, None),
+        ('2025-09-22 03:00:00', 3002.0, None, None, None, None, None),
+    ]
+
+    # replace_week=True: haftanın eski kayıtları silinir, diğer haftalar etkilenmez
+    save_week_forecasts(forecast('2025-09-22 05:00', 1), WEEK, WEEK_END)
+    assert rows(db) == [('2025-09-22 05:00:00', 2500.0, None, None, None, None, None)]
+    assert len(rows(db, '2025-09-29')) == 2
+
+
+def test_actuals_update_counts_and_performance_upsert(db):
+    save_week_forecasts(forecast('2025-09-22 00:00', 4), WEEK, WEEK_END)
+    # Aynı saat başka bir haftanın kaydında da var: sadece week_start eşleşen güncellenir
+    save_week_forecasts(forecast('2025-09-22 00:00', 1), '2025-09-15', '2025-09-21')
+
+    performance = {'week_end': WEEK_END, 'mape': 4.2, 'mae': 110.0, 'rmse': 150.0,
+                   'total_predictions': 2}
+    updated = save_week_actuals(
+        WEEK, ['2025-09-22 00:00:00', '2025-09-22 01:00:00', '2025-09-30 00:00:00'],
+        [2600.0, 2700.0, 2800.0], [100.0, 199.0, 0.0], [3.8, 7.4, 0.0],
+        performance=performance
+    )
+    assert updated == 2
+    assert rows(db, '2025-09-15')[0][2] is None
+
+    # İkinci çağrı aynı haftanın performans kaydını günceller (yeni satır eklemez)
+    assert save_week_actuals(WEEK, ['2025-09-22 02:00:00'], [2550.0], [48.0], [1.9],
+                             performance={**performance, 'mape': 3.1, 'total_predictions': 3}) == 1
+    assert db.execute("SELECT COUNT(*), mape, total_predictions FROM weekly_performance"
+                      ).fetchone() == (1, 3.1, 3)
+    # Staging tabloları her çağrıdan sonra boşaltılır
+    assert save_week_actuals(WEEK, [], [], [], []) == 0
+
+
+def test_nan_is_stored_as_null(db):
+    df = forecast('2025-09-22 00:00', 3,
+                  prophet_component=[2400.0, np.nan, 2410.0],
+                  xgboost_component=[np.nan, 5.0, 6.0])
+    save_week_forecasts(df, WEEK, WEEK_END)
+    save_week_actuals(WEEK, ['2025-09-22 00:00:00', '2025-09-22 01:00:00'],
+                      [np.nan, 2700.0], [np.nan, 199.0], [np.nan, 7.4])
+
+    stored = rows(db)
+    assert [r[4] for r in stored] == [2400.0, None, 2410.0]
+    assert [r[5] for r in stored] == [None, 5.0, 6.0]
+    assert [r[6] for r in stored] == [None, None, None]      # kolon hiç yok
+    assert stored[0][2:4] == (None, None)
+
+    ids = [i for (i,) in db.execute("SELECT id FROM forecast_history ORDER BY id")]
+    assert update_forecast_components(ids[:2] + [9999], [1.0, np.nan, 3.0],
+                                      [np.nan, 2.0, 3.0], [0.5, 0.5, np.nan]) == 2
+    stored = rows(db)
+    assert [r[4:] for r in stored[:2]] == [(1.0, None, 0.5), (None, 2.0, 0.5)]
+    assert stored[2][4:] == (2410.0, 6.0, None)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""lstm_numpy: katlanmış NumPy ağı, katlanmamış (BatchNorm + Dropout) referansla aynı."""
+
+import os
+
+import numpy as np
+import pytest
+
+from lstm_numpy import NumpyLSTM, _source_info, fold_layers, is_current, save_layers
+
+SEQ, FEATURES = 24, 6
+EPSILON = 1e-3
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def keras_layers(seed=0):
+    """LSTM -> BN -> Dropout -> LSTM -> BN -> Dense(relu) -> Dropout -> Dense (keras sırası)"""
+    rng = np.random.default_rng(seed)
+
+    def lstm(n_in, units, return_sequences):
+        weights = [rng.normal(0, 0.3, (n_in, 4 * units)),
+                   rng.normal(0, 0.3, (units, 4 * units)),
+                   rng.normal(0, 0.3, 4 * units)]
+        config = {'name': 'lstm', 'units': units, 'return_sequences': return_sequences}
+        return 'LSTM', config, [w.astype(np.float32) for w in weights]
+
+    def batch_norm(n):
+        weights = [rng.uniform(0.5, 1.5, n), rng.normal(0, 0.5, n),
+                   rng.normal(0, 0.5, n), rng.uniform(0.1, 2.0, n)]
+        return 'BatchNormalization', {'epsilon': EPSILON}, [w.astype(np.float32) for w in weights]
+
+    def dense(n_in, n_out, activation):
+        weights = [rng.normal(0, 0.4, (n_in, n_out)), rng.normal(0, 0.1, n_out)]
+        return 'Dense', {'activation': activation}, [w.astype(np.float32) for w in weights]
+
+    return [
+        ('InputLayer', {}, []),
+        lstm(FEATURES, 16, True),
+        batch_norm(16),
+        ('Dropout', {'rate': 0.2}, []),
+        lstm(16, 8, False),
+        batch_norm(8),
+        dense(8, 8, 'relu'),
+        ('Dropout', {'rate': 0.1}, []),
+        dense(8, 1, 'linear'),
+    ]
+
+
+def reference_predict(layers, x):
+    """Katlanmamış float64 ileri besleme; kapılar adlarıyla (i, f, c, o) ayrılır"""
+    out = x.astype(np.float64)
+    for class_name, config, weights in layers:
+        weights = [w.astype(np.float64) for w in weights]
+        if class_name == 'LSTM':
+            kernel, recurrent, bias = weights
+            units = config['units']
+            gates = {name: slice(k * units, (k + 1) * units) for k, name in enumerate('ifco')}
+            h = np.zeros((len(out), units))
+            c = np.zeros((len(out), units))
+            sequence = []
+            for t in range(out.shape[1]):
+                z = {name: out[:, t] @ kernel[:, s] + h @ recurrent[:, s] + bias[s]
+                     for name, s in gates.items()}
+                c = sigmoid(z['f']) * c + sigmoid(z['i']) * np.tanh(z['c'])
+                h = sigmoid(z['o']) * np.tanh(c)
+                sequence.append(h)
+            out = np.stack(sequence, axis=1) if config['return_sequences'] else h
+        elif class_name == 'BatchNormalization':
+            gamma, beta, mean, variance = weights
+            out = gamma * (out - mean) / np.sqrt(variance + config['epsilon']) + beta
+        elif class_name == 'Dense':
+            out = out @ weights[0] + weights[1]
+            if config['activation'] == 'relu':
+                out = np.maximum(out, 0)
+    return out
+
+
+def numpy_model(layers, dtype, tmp_path):
+    path = str(tmp_path / f'model_{dtype}.npz')
+    save_layers(fold_layers(layers), path, dtype=dtype)
+    return NumpyLSTM.load(path)
+
+
+def windows(n=64, seed=1):
+    return np.random.default_rng(seed).normal(0, 1, (n, SEQ, FEATURES)).astype(np.float32)
+
+
+def test_fold_layers_matches_unfolded_reference():
+    layers = keras_layers()
+    folded = fold_layers(layers)
+
+    assert [layer['type'] for layer in folded] == ['lstm', 'lstm', 'dense', 'dense']
+    # BatchNorm'lar sonraki katmanın girdi ağırlıklarına katlanır
+    assert folded[1]['kernel'].shape == (16, 32)
+    assert folded[2]['kernel'].shape == (8, 8)
+
+    x = windows()
+    expected = reference_predict(layers, x)
+    arrays = {}
+    for i, layer in enumerate(folded):
+        for name in ('kernel', 'recurrent_kernel', 'bias'):
+            if name in layer:
+                arrays[f'{i}_{name}'] = layer[name]
+    spec = {'dtype': 'float64',
+            'layers': [{k: v for k, v in layer.items() if not isinstance(v, np.ndarray)}
+                       for layer in folded]}
+    model = NumpyLSTM(spec, arrays)
+    np.testing.assert_allclose(model.predict_on_batch(x), expected, rtol=0, atol=1e-5)
+
+
+def test_gate_order_is_i_f_c_o():
+    units = 4
+    kernel = np.zeros((1, 4 * units), dtype=np.float32)
+    bias = np.zeros(4 * units, dtype=np.float32)
+    # i ve o açık, f kapalı, aday değer tanh(2): kapı sırası karışırsa çıktı değişir
+    bias[:units], bias[units:2 * units] = 20.0, -20.0
+    bias[2 * units:3 * units], bias[3 * units:] = 2.0, 20.0
+    layers = [('LSTM', {'units': units, 'return_sequences': False},
+               [kernel, np.zeros((units, 4 * units), dtype=np.float32), bias])]
+
+    spec = {'dtype': 'float32', 'layers': [{'type': 'lstm', 'units': units, 'return_sequences': False}]}
+    folded = fold_layers(layers)[0]
+    model = NumpyLSTM(spec, {'0_kernel': folded['kernel'], '0_recurrent_kernel': folded['recurrent_kernel'],
+                             '0_bias': folded['bias']})
+
+    h = model.predict_on_batch(np.zeros((2, 5, 1)))
+    np.testing.assert_allclose(h, np.tanh(np.tanh(2.0)), rtol=1e-5)
+    np.testing.assert_allclose(h, reference_predict(layers, np.zeros((2, 5, 1))), rtol=1e-5)
+
+
+@pytest.mark.parametrize('dtype, atol', [('float32', 1e-5), ('float16', 5e-3), ('int8', 5e-2)])
+def test_saved_precisions_track_reference(dtype, atol, tmp_path):
+    layers = keras_layers()
+    x = windows()
+    expected = reference_predict(layers, x)
+
+    model = numpy_model(layers, dtype, tmp_path)
+    predicted = model.predict(x, batch_size=10)
+
+    assert model.dtype == dtype
+    assert predicted.shape == (len(x), 1) and predicted.dtype == np.float32
+    scale = np.abs(expected).max()
+    np.testing.assert_allclose(predicted, expected, rtol=0, atol=atol * scale)
+
+    with np.load(str(tmp_path / f'model_{dtype}.npz')) as data:
+        assert data['0_kernel'].dtype == np.dtype(dtype)
+        assert ('0_kernel_scale' in data.files) == (dtype == 'int8')
+        assert data['0_bias'].dtype == np.float32
+
+
+def test_freshness_follows_keras_contents_not_mtime(tmp_path):
+    keras_path = tmp_path / 'model.keras'
+    keras_path.write_bytes(b'keras-model-v1')
+    path = str(tmp_path / 'model_numpy.npz')
+    save_layers(fold_layers(keras_layers()), path, dtype='float32',
+                source=_source_info(str(keras_path)))
+
+    # Temiz checkout: içerik aynı, mtime farklı
+    os.utime(keras_path, ns=(0, 0))
+    assert is_current(path, str(keras_path), 'float32')
+    assert not is_current(path, str(keras_path), 'int8')
+
+    keras_path.write_bytes(b'keras-model-v2')
+    assert not is_current(path, str(keras_path), 'float32')
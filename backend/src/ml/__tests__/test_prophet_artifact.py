@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""prophet_artifact: kayıtlı in-sample tahminler modelin kendi tahminiyle aynı olmalı."""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('prophet')
+
+from prophet import Prophet
+from prophet_artifact import artifact_path, load_fitted, load_prophet, save_prophet
+
+
+def synthetic_history(days=21, seed=0):
+    """Sürekli (standartlaştırılan) ve ikili regressor'lu saatlik seri"""
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range('2025-06-02', periods=days * 24, freq='h')
+    consumption = 30000 + 5000 * np.sin(np.arange(len(ds)) * 2 * np.pi / 24) + rng.normal(0, 500, len(ds))
+    peak = ((ds.hour >= 17) & (ds.hour <= 21)).astype(float)
+    y = 2000 + 0.05 * consumption + 300 * peak + rng.normal(0, 50, len(ds))
+    return pd.DataFrame({'ds': ds, 'y': y, 'consumption': consumption, 'is_peak_hour': peak})
+
+
+def build_model():
+    for name in ('cmdstanpy', 'prophet'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    model = Prophet(daily_seasonality=True, weekly_seasonality=False, yearly_seasonality=False)
+    model.add_regressor('consumption')
+    model.add_regressor('is_peak_hour')
+    return model
+
+
+def test_stored_fitted_matches_predict(tmp_path):
+    df = synthetic_history()
+    model = build_model()
+    model.fit(df)
+
+    json_path = str(tmp_path / 'prophet_model.json')
+    save_prophet(model, json_path)
+
+    stored = load_fitted(artifact_path(json_path), ['yhat'])['yhat'].to_numpy()
+    predicted = load_prophet(json_path).predict(
+        df[['ds', 'consumption', 'is_peak_hour']], intervals=None
+    )['yhat'].to_numpy()
+
+    np.testing.assert_allclose(stored, predicted, rtol=0, atol=1e-6 * model.y_scale)
+    # Residual'lar sıfır civarında (çift standartlaştırma yüzlerce birim kaydırıyordu)
+    assert abs(np.mean(df['y'].to_numpy() - stored)) < 25
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""prophet_warm_start: değişmeyen veriyle ikinci fit warm start yapmalı."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('prophet')
+
+from features import get_prophet_features
+from prophet_artifact import save_prophet
+from prophet_warm_start import fit_prophet
+from train_prophet import build_prophet_model
+
+
+def synthetic_features(days=21, seed=0):
+    """train_prophet regressor'larının hepsini içeren saatlik seri"""
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range('2025-06-02', periods=days * 24, freq='h')
+    hour = ds.hour.to_numpy()
+    consumption = 30000 + 5000 * np.sin(hour * 2 * np.pi / 24) + rng.normal(0, 500, len(ds))
+    df = pd.DataFrame({
+        'ds': ds,
+        'hour': hour,
+        'is_weekend': (ds.dayofweek >= 5).astype(int),
+        'is_peak_hour': ((hour >= 17) & (hour <= 21)).astype(int),
+        'is_daytime': ((hour >= 8) & (hour <= 18)).astype(int),
+        'day_of_week': ds.dayofweek,
+        'consumption': consumption,
+        'supply_demand_gap': rng.normal(0, 1000, len(ds)),
+        'renewable_ratio': rng.uniform(0.2, 0.6, len(ds)),
+        'fossil_ratio': rng.uniform(0.3, 0.7, len(ds)),
+        'price_lag_24h': rng.normal(2500, 300, len(ds)),
+    })
+    df['y'] = 1000 + 0.05 * consumption + rng.normal(0, 50, len(ds))
+    return df[['ds', 'y'] + get_prophet_features()]
+
+
+def test_second_fit_on_same_data_is_warm(tmp_path):
+    df = synthetic_features()
+    model_path = str(tmp_path / 'prophet_model.json')
+
+    first = build_prophet_model(None, verbose=False)
+    first_info = fit_prophet(first, df, model_path)
+    save_prophet(first, model_path, fit_info=first_info)
+    assert first_info['mode'] == 'cold'
+
+    second = build_prophet_model(None, verbose=False)
+    second_info = fit_prophet(second, df, model_path)
+    assert second_info['mode'] == 'warm', second_info['reason']
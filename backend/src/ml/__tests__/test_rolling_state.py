@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""rolling_mean_std: kümülatif durumdan devam eden hesap toplu hesapla bit bit aynı."""
+
+import numpy as np
+import pandas as pd
+
+from features import ROLLING_WINDOW, rolling_mean_std
+
+
+def prices(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 2500 + np.cumsum(rng.normal(0, 40, n))
+    values[100:130] = 0.0  # sabit pencere: std tam 0 olmalı
+    return values
+
+
+def test_matches_pandas_rolling():
+    values = prices()
+    mean, std, _ = rolling_mean_std(values)
+    rolling = pd.Series(values).rolling(ROLLING_WINDOW, min_periods=1)
+
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=0, atol=1e-8)
+    np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=0, atol=1e-6)
+    assert np.isnan(std[0])
+    assert std[129] == 0.0
+
+
+def test_state_continuation_is_bit_identical():
+    values = prices()
+    mean, std, state = rolling_mean_std(values)
+
+    _, _, head = rolling_mean_std(values[:3000])
+    # Meta'ya yazılan durum gibi sadece son satırlar tutulur
+    head = {key: list(arrays[-ROLLING_WINDOW:]) for key, arrays in head.items()}
+    tail_mean, tail_std, tail_state = rolling_mean_std(values[3000:], state=head)
+
+    assert np.array_equal(tail_mean, mean[3000:])
+    assert np.array_equal(tail_std, std[3000:], equal_nan=True)
+    assert np.array_equal(tail_state['sum'][-ROLLING_WINDOW:], state['sum'][-ROLLING_WINDOW:])
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""seasonal_profile: son SETTLE_HOURS kalıcı toplamlara girmez, pencereli df kayıtlı profili ezmez."""
+
+import numpy as np
+import pandas as pd
+
+from hourly_series import to_epoch_hours
+from seasonal_profile import PROFILE_COLUMNS, SETTLE_HOURS, SeasonalProfile, get_profile
+
+
+def history(start='2024-01-01', end='2025-09-30 23:00', seed=0):
+    ds = pd.date_range(start, end, freq='h')
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'ds': ds})
+    for i, col in enumerate(PROFILE_COLUMNS):
+        df[col] = 1000.0 * (i + 1) + rng.normal(0, 50, len(ds))
+    return df
+
+
+def test_unsettled_tail_is_not_persisted():
+    df = history()
+    # Son saatlerde tüketim henüz yok: ffill yer tutucu
+    placeholder = df.copy()
+    placeholder.loc[len(df) - SETTLE_HOURS:, 'consumption'] = 99999.0
+
+    profile = SeasonalProfile.build(placeholder.iloc[:-24])
+    profile.update(placeholder)
+    assert profile.watermark == to_epoch_hours(df['ds'])[-SETTLE_HOURS - 1]
+
+    # Kayıt + yükleme sonrası düzeltilmiş veri geldiğinde toplu hesapla aynı
+    restored = SeasonalProfile(profile.columns, profile.sums.copy(), profile.counts.copy(),
+                               profile.quantiles, profile.first, profile.watermark, profile.rows)
+    assert restored.covers(df)
+    restored.update(df)
+
+    expected = SeasonalProfile.build(df)
+    np.testing.assert_array_equal(restored.counts + restored.tail_counts,
+                                  expected.counts + expected.tail_counts)
+    np.testing.assert_allclose(restored.lookup('consumption', df['ds']),
+                               expected.lookup('consumption', df['ds']), rtol=1e-12)
+
+
+def test_windowed_slice_does_not_overwrite_saved_profile(tmp_path):
+    df = history()
+    path = str(tmp_path / 'profile.npz')
+    full = get_profile(df, path=path)
+
+    # Eğitim penceresi / walk-forward dilimi: daha geç başlar
+    window = df[df['ds'] >= '2025-01-01'].reset_index(drop=True)
+    windowed = get_profile(window, path=path)
+
+    saved = SeasonalProfile.load(path)
+    assert windowed.first == to_epoch_hours(window['ds'])[0]
+    assert saved.first == full.first and saved.rows == full.rows
+    np.testing.assert_array_equal(saved.sums, full.sums)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""training_window: eski geçmiş MAX_YEARS ile sınırlı, satır sayısı tavanı aşmaz."""
+
+import pandas as pd
+
+from training_window import apply_training_window, window_start
+
+
+def hourly(start, end):
+    return pd.DataFrame({'ds': pd.date_range(start, end, freq='h')})
+
+
+def test_row_ceiling_holds_as_history_grows():
+    months, every, years = 24, 5, 5
+    ceiling = months * 744 + years * 8784 // every
+
+    short = apply_training_window(hourly('2015-01-01', '2025-09-30 23:00'),
+                                  months, every, verbose=False, max_years=years)
+    long = apply_training_window(hourly('1995-01-01', '2025-09-30 23:00'),
+                                 months, every, verbose=False, max_years=years)
+
+    assert len(long) == len(short) <= ceiling
+    oldest = window_start('2025-09-30 23:00', months) - pd.DateOffset(years=years)
+    assert long['ds'].min() >= oldest
+
+
+def test_max_years_zero_keeps_all_older_days():
+    df = hourly('2015-01-01', '2025-09-30 23:00')
+    capped = apply_training_window(df, 24, 5, verbose=False, max_years=5)
+    unbounded = apply_training_window(df, 24, 5, verbose=False, max_years=0)
+
+    assert len(unbounded) > len(capped)
+    assert unbounded['ds'].min() < pd.Timestamp('2015-01-06')
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Takvim Tablosu - Epoch-Saat Anahtarlı Türkiye Takvimi
+======================================================
+
+Tüm modellerin kullandığı takvim kolonlarını bir kez, vektörel olarak üretir:
+- Zaman: hour, day_of_week, day_of_month, month
+- Bayraklar: is_weekend, is_peak_hour, is_daytime, is_sunday, is_midday,
+  extreme_low_risk
+- Tatiller: is_holiday (resmi tatil), is_bayram (Ramazan/Kurban bloğu:
+  arife + bayram + köprü günleri + bitişik hafta sonu), is_bridge_day,
+  days_to_holiday
+
+Tablo bir HourlySeries'tir (indeks = epoch-saat, hourly_panel.ts ile aynı);
+bir ds dizisinin takvim kolonları satır pozisyonu aritmetiğiyle okunur,
+.dt erişimcileriyle tarih tekrar çözülmez.
+
+Resmi tatiller (Ramazan/Kurban dahil, hicri takvimden hesaplanan) `holidays`
+paketinden gelir (Prophet bağımlılığı). Köprü günü kuralı: bayram bloğu ile
+hafta sonu arasında kalan tek iş günü (örn. 2024 Ramazan: 8 Nisan Pazartesi).
+Böylece yeni yıllar için elle tarih eklemek gerekmez.
+
+Kullanım:
+    python calendar_table.py 2024 2026   -> bayram blokları ve özet
+"""
+
+import numpy as np
+import pandas as pd
+import holidays
+from datetime import date
+
+from hourly_series import HourlySeries, to_epoch_hours
+
+# Peak saatler (Sabah 8-10, Akşam 18-21)
+PEAK_HOURS = [8, 9, 10, 18, 19, 20, 21]
+
+# Gündüz saatleri (Güneş var, 10:00-16:00)
+DAYTIME_HOURS = range(10, 16)
+
+# Öğle saatleri (extreme_low_risk için, 10-14)
+MIDDAY_HOURS = [10, 11, 12, 13, 14]
+
+# Ramazan / Kurban bayramı isimleri (holidays paketi) -> Prophet holiday adı
+BAYRAM_NAMES = {
+    'Ramazan Bayramı': 'Ramazan_Bayrami',
+    'Kurban Bayramı': 'Kurban_Bayrami',
+}
+
+# Varsayılan yıl aralığının başı (veri 2024'te başlıyor, pay bırakıldı)
+CALENDAR_START_YEAR = 2020
+
+# Tablo bir kez üretilir, daha geniş aralık istenirse genişletilir
+_calendar = None
+
+
+def _day_holidays(first_day, n_days):
+    """
+    Gün bazlı tatil dizileri.
+
+    Args:
+        first_day (np.datetime64): İlk gün
+        n_days (int): Gün sayısı
+
+    Returns:
+        dict: is_holiday, is_bayram, is_bridge_day, days_to_holiday, bayram_name
+    """
+    days = first_day + np.arange(n_days)
+    years = range(pd.Timestamp(days[0]).year, pd.Timestamp(days[-1]).year + 1)
+    calendar = holidays.Turkey(years=years, categories=('public', 'half_day'))
+
+    is_holiday = np.zeros(n_days, dtype=bool)
+    is_bayram = np.zeros(n_days, dtype=bool)
+    bayram_name = np.full(n_days, '', dtype=object)
+
+    for day, names in calendar.items():
+        i = (np.datetime64(day) - first_day).astype(np.int64)
+        if not 0 <= i < n_days:
+            continue
+        for name in names.split('; '):
+            # Yarım gün (arife, "saat 13.00'ten") resmi tatil sayılmaz,
+            # bayram arifesi ise bayram bloğuna dahildir
+            half_day = '(' in name
+            base = name.split(' (')[0]
+            if not half_day:
+                is_holiday[i] = True
+            if base in BAYRAM_NAMES:
+                is_bayram[i] = True
+                bayram_name[i] = BAYRAM_NAMES[base]
+
+    day_of_week = (days.astype(np.int64) + 3) % 7
+    off = is_bayram | is_holiday | (day_of_week >= 5)
+
+    # Köprü: bayram bloğuna bitişik, iki yanı da tatil/hafta sonu olan tek iş günü
+    prev_off = np.r_[False, off[:-1]]
+    next_off = np.r_[off[1:], False]
+    near_bayram = np.r_[False, is_bayram[:-1]] | np.r_[is_bayram[1:], False]
+    is_bridge = ~off & prev_off & next_off & near_bayram
+
+    # Köprü günleri ve bloğa bitişik hafta sonları bayram bloğuna katılır
+    # (örn. 2024 Ramazan: 6-14 Nisan, 9 gün)
+    off = off | is_bridge
+    while True:
+        grow = off & ~is_bayram & (
+            np.r_[False, is_bayram[:-1]] | np.r_[is_bayram[1:], False]
+        )
+        if not grow.any():
+            break
+        for i in np.flatnonzero(grow):
+            bayram_name[i] = bayram_name[i - 1] or bayram_name[i + 1]
+        is_bayram |= grow
+
+    # Bir sonraki tatil/bayram gününe kalan gün (o gün 0); aralık sonrasında tatil yoksa -1
+    special = np.flatnonzero(is_holiday | is_bayram)
+    nxt = np.searchsorted(special, np.arange(n_days))
+    found = nxt < len(special)
+    days_to_holiday = np.full(n_days, -1, dtype=np.int16)
+    days_to_holiday[found] = special[nxt[found]] - np.arange(n_days)[found]
+
+    return {
+        'is_holiday': is_holiday,
+        'is_bayram': is_bayram,
+        'is_bridge_day': is_bridge,
+        'days_to_holiday': days_to_holiday,
+        'bayram_name': bayram_name,
+    }
+
+
+def build_calendar(start_year, end_year):
+    """
+    [start_year, end_year] yılları için saatlik takvim tablosu üretir.
+
+    Returns:
+        HourlySeries: epoch-saat indeksli takvim kolonları
+    """
+    first_day = np.datetime64(f'{start_year}-01-01', 'D')
+    last_day = np.datetime64(f'{end_year + 1}-01-01', 'D')
+    n_days = int((last_day - first_day).astype(np.int64))
+
+    # days_to_holiday yıl sonunda da dolu olsun diye bir yıl ileri bakılır
+    lookahead = int((np.datetime64(f'{end_year + 2}-01-01', 'D') - first_day).astype(np.int64))
+    day = {name: values[:n_days] for name, values in _day_holidays(first_day, lookahead).items()}
+
+    start = int(first_day.astype(np.int64)) * 24
+    ts = start + np.arange(n_days * 24, dtype=np.int64)
+    day_index = (ts - start) // 24
+
+    # Pandas .dt erişimcileriyle aynı dtype'lar (int32)
+    days = ts // 24
+    dates = days.astype('datetime64[D]')
+    months = dates.astype('datetime64[M]')
+    hour = (ts % 24).astype(np.int32)
+    day_of_week = ((days + 3) % 7).astype(np.int32)   # 1970-01-01 Perşembe
+    day_of_month = ((dates - months).astype(np.int64) + 1).astype(np.int32)
+    month = (months.astype(np.int64) % 12 + 1).astype(np.int32)
+
+    is_sunday = day_of_week == 6
+    is_midday = np.isin(hour, MIDDAY_HOURS)
+
+    columns = {
+        'hour': hour,
+        'day_of_week': day_of_week,
+        'day_of_month': day_of_month,
+        'month': month,
+        'is_weekend': (day_of_week >= 5).astype(np.int64),
+        'is_peak_hour': np.isin(hour, PEAK_HOURS).astype(np.int64),
+        'is_daytime': np.isin(hour, DAYTIME_HOURS).astype(np.int64),
+        'is_sunday': is_sunday,
+        'is_midday': is_midday,
+        'extreme_low_risk': (is_sunday & is_midday).astype(np.int64),
+        'is_holiday': day['is_holiday'][day_index].astype(np.int64),
+        'is_bayram': day['is_bayram'][day_index].astype(np.int64),
+        'is_bridge_day': day['is_bridge_day'][day_index].astype(np.int64),
+        'days_to_holiday': day['days_to_holiday'][day_index],
+    }
+    return HourlySeries(start, columns)
+
+
+def get_calendar(start_year=None, end_year=None):
+    """
+    Önbellekteki takvim tablosunu döndürür; istenen yıllar yoksa genişletir.
+
+    Args:
+        start_year (int, optional): Varsayılan CALENDAR_START_YEAR
+        end_year (int, optional): Varsayılan bu yıl + 1
+    """
+    global _calendar
+
+    start_year = min(start_year or CALENDAR_START_YEAR, CALENDAR_START_YEAR)
+    end_year = max(end_year or date.today().year + 1, date.today().year + 1)
+
+    if _calendar is not None:
+        first = pd.Timestamp(_calendar.start * 3600, unit='s').year
+        last = pd.Timestamp((_calendar.end - 1) * 3600, unit='s').year
+        if first <= start_year and end_year <= last:
+            return _calendar
+        start_year = min(start_year, first)
+        end_year = max(end_year, last)
+
+    _calendar = build_calendar(start_year, end_year)
+    return _calendar
+
+
+def calendar_positions(ds):
+    """
+    ds değerlerinin takvim tablosundaki satır pozisyonları.
+
+    Returns:
+        tuple: (takvim HourlySeries, pozisyon dizisi)
+    """
+    ts = to_epoch_hours(ds)
+    if len(ts) == 0:
+        return get_calendar(), ts
+
+    lo = pd.Timestamp(int(ts.min()) * 3600, unit='s').year
+    hi = pd.Timestamp(int(ts.max()) * 3600, unit='s').year
+    calendar = get_calendar(lo, hi)
+    return calendar, ts - calendar.start
+
+
+def bayram_holidays(start_year=None, end_year=None):
+    """
+    Prophet için Ramazan/Kurban bayramı tatil DataFrame'i.
+
+    Arife, bayram, köprü günleri ve bitişik hafta sonlarını içerir (add_country_holidays('TR')
+    resmi tatilleri ayrıca ekler).
+
+    Returns:
+        pd.DataFrame: holiday, ds, lower_window, upper_window
+    """
+    start_year = start_year or CALENDAR_START_YEAR
+    end_year = end_year or date.today().year + 1
+
+    first_day = np.datetime64(f'{start_year}-01-01', 'D')
+    n_days = int((np.datetime64(f'{end_year + 1}-01-01', 'D') - first_day).astype(np.int64))
+    day = _day_holidays(first_day, n_days)
+
+    idx = np.flatnonzero(day['is_bayram'])
+    return pd.DataFrame({
+        'holiday': day['bayram_name'][idx],
+        'ds': pd.to_datetime(first_day + idx),
+        'lower_window': 0,
+        'upper_window': 1,  # Bayram sonrası gün etkisini de yakala
+    })
+
+
+if __name__ == "__main__":
+    import sys
+
+    start_year = int(sys.argv[1]) if len(sys.argv) > 1 else date.today().year
+    end_year = int(sys.argv[2]) if len(sys.argv) > 2 else start_year + 1
+
+    print("=" * 60)
+    print(f"Türkiye Takvimi {start_year}-{end_year}")
+    print("=" * 60)
+
+    bayrams = bayram_holidays(start_year, end_year)
+    for name, group in bayrams.groupby((bayrams['ds'].diff().dt.days != 1).cumsum()):
+        print(f"   {group['holiday'].iloc[0]:<16} {group['ds'].min().date()} - "
+              f"{group['ds'].max().date()} ({len(group)} gün)")
+
+    calendar = build_calendar(start_year, end_year)
+    print(f"\n[+] {len(calendar)} saatlik satır")
+    print(f"[*] Resmi tatil günü: {calendar['is_holiday'].sum() // 24}")
+    print(f"[*] Köprü günü: {calendar['is_bridge_day'].sum() // 24}")
@@ -8,24 +8,21 @@ import pandas as pd
 import numpy as np
 from prophet import Prophet
 from prophet.serialize import model_from_json
-import sqlite3
 from datetime import timedelta
 import os
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model.json')
 
 def load_data():
     """Veri tabanından veri yükle"""
-    conn = sqlite3.connect(DB_PATH)
     query = "SELECT date as ds, price as y FROM mcp_data ORDER BY date"
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    df = pd.read_sql_query(query, get_read_connection())
     df['ds'] = pd.to_datetime(df['ds']).dt.tz_localize(None)
     return df
 
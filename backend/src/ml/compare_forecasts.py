@@ -14,17 +14,19 @@ Bu script:
 
 import pandas as pd
 import numpy as np
-import sqlite3
 import os
 from datetime import datetime, timedelta
 import sys
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
+
+from forecast_store import save_week_actuals
+from hourly_series import HourlySeries
 
 def compare_week(week_start, week_end):
     """
@@ -41,7 +43,7 @@ def compare_week(week_start, week_end):
     print(f"HAFTALIK KARŞILAŞTIRMA: {week_start} - {week_end}")
     print("="*70)
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
 
     # 1. Tahminleri çek
     print(f"\n[*] {week_start} - {week_end} için tahminler yükleniyor...")
@@ -55,7 +57,6 @@ def compare_week(week_start, week_end):
 
     if len(forecasts) == 0:
         print(f"[!] UYARI: {week_start} için tahmin bulunamadı!")
-        conn.close()
         return None
 
     print(f"[+] {len(forecasts)} tahmin kaydı bulundu")
@@ -76,28 +77,24 @@ def compare_week(week_start, week_end):
 
     if len(actuals) == 0:
         print(f"[!] UYARI: {week_start} - {week_end} için gerçek veri bulunamadı!")
-        conn.close()
         return None
 
     print(f"[+] {len(actuals)} gerçek kayıt bulundu")
 
     # 3. Tahmin ve gerçek verileri birleştir
-    # forecast_datetime ve date'i normalize et
-    forecasts['ds'] = pd.to_datetime(forecasts['forecast_datetime']).dt.tz_localize(None)
-    actuals['ds'] = pd.to_datetime(actuals['date']).dt.tz_localize(None)
-
-    # Merge
-    comparison = pd.merge(
-        forecasts,
-        actuals,
-        left_on='ds',
-        right_on='ds',
-        how='inner'
+    # Gerçek değerler epoch-saat indeksli seriye alınır, her tahmin saati
+    # O(1) pozisyon hesabıyla eşleştirilir (merge yerine)
+    actual_series = HourlySeries.from_frame(
+        actuals.assign(ds=pd.to_datetime(actuals['date'])),
+        columns=['price']
     )
+    prices, found = actual_series.lookup('price', pd.to_datetime(forecasts['forecast_datetime']))
+
+    comparison = forecasts[found].reset_index(drop=True)
+    comparison['price'] = prices
 
     if len(comparison) == 0:
         print("[!] HATA: Tahmin ve gerçek veriler eşleştirilemedi!")
-        conn.close()
         return None
 
     print(f"[+] {len(comparison)} eşleşme bulundu")
@@ -127,53 +124,23 @@ def compare_week(week_start, week_end):
     print(f"   Toplam Tahmin                : {len(comparison)}")
 
     # 5. forecast_history'yi güncelle (actual_price, errors)
-    print(f"\n[*] forecast_history tablosu güncelleniyor...")
-
-    for idx, row in comparison.iterrows():
-        update_query = """
-            UPDATE forecast_history
-            SET actual_price = ?,
-                absolute_error = ?,
-                percentage_error = ?
-            WHERE week_start = ? AND forecast_datetime = ?
-        """
-        conn.execute(update_query, (
-            row['price'],
-            absolute_errors[idx],
-            percentage_errors[idx],
-            week_start,
-            row['forecast_datetime']
-        ))
-
-    conn.commit()
-    print(f"[+] {len(comparison)} kayıt güncellendi")
-
-    # 6. weekly_performance tablosuna kaydet
-    print(f"[*] weekly_performance tablosuna kaydediliyor...")
-
-    # Önce bu hafta için kayıt var mı kontrol et
-    check_query = "SELECT COUNT(*) as count FROM weekly_performance WHERE week_start = ?"
-    result = conn.execute(check_query, (week_start,)).fetchone()
-
-    if result[0] > 0:
-        # Güncelle
-        update_query = """
-            UPDATE weekly_performance
-            SET mape = ?, mae = ?, rmse = ?, total_predictions = ?
-            WHERE week_start = ?
-        """
-        conn.execute(update_query, (mape, mae, rmse, len(comparison), week_start))
-    else:
-        # Yeni kayıt ekle
-        insert_query = """
-            INSERT INTO weekly_performance (week_start, week_end, mape, mae, rmse, total_predictions)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """
-        conn.execute(insert_query, (week_start, week_end, mape, mae, rmse, len(comparison)))
-
-    conn.commit()
-    conn.close()
-
+    # 6. weekly_performance kaydı da aynı transaction'da (staging + UPDATE ... FROM)
+    print(f"\n[*] forecast_history ve weekly_performance güncelleniyor...")
+    updated = save_week_actuals(
+        week_start,
+        comparison['forecast_datetime'],
+        y_true,
+        absolute_errors,
+        percentage_errors,
+        performance={
+            'week_end': week_end,
+            'mape': mape,
+            'mae': mae,
+            'rmse': rmse,
+            'total_predictions': len(comparison)
+        }
+    )
+    print(f"[+] {updated} kayıt güncellendi")
     print(f"[+] Performans metrikleri kaydedildi")
     print("="*70)
 
@@ -1,6 +1,8 @@
 
 import os
 import sys
+import sqlite3
+import time
 from dotenv import load_dotenv
 
 # Get the absolute path to the backend directory
@@ -28,5 +30,115 @@ def get_db_path():
 
 DB_PATH = get_db_path()
 
+# Her bağlantıda uygulanan pragma'lar
+# (journal_mode=WAL kalıcıdır; Express sunucusu da WAL kullanır)
+CONNECTION_PRAGMAS = {
+    'busy_timeout': 30000,        # ms - kilitliyse beklemeden hata verme
+    'synchronous': 'NORMAL',      # WAL'da güvenli, FULL'dan çok daha hızlı
+    'mmap_size': 268435456,       # 256 MB memory-mapped okuma
+    'cache_size': -65536,         # 64 MB page cache (negatif = KB)
+    'temp_store': 'MEMORY',
+}
+
+# SQLITE_BUSY durumunda yazma işleminin kaç kez deneneceği
+WRITE_RETRIES = 5
+WRITE_RETRY_DELAY = 0.5  # saniye (her denemede iki katına çıkar)
+
+# Süreç başına paylaşılan bağlantılar: {(db_path, 'read'|'write'): (pid, conn)}
+_connections = {}
+
+
+def _open_connection(db_path, readonly):
+    """Pragma'ları uygulanmış yeni bir bağlantı açar"""
+    if readonly:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    for name, value in CONNECTION_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def _get_connection(db_path, readonly):
+    """Süreç içinde tekrar kullanılan bağlantıyı döndürür (fork sonrası yeniden açar)"""
+    db_path = db_path or DB_PATH
+    key = (db_path, 'read' if readonly else 'write')
+
+    entry = _connections.get(key)
+    if entry is not None and entry[0] == os.getpid():
+        return entry[1]
+
+    if readonly:
+        # WAL modunu okuyucudan önce yazıcı bağlantı ayarlar
+        # (read-only bağlantı journal_mode değiştiremez)
+        _get_connection(db_path, readonly=False)
+
+    conn = _open_connection(db_path, readonly)
+    _connections[key] = (os.getpid(), conn)
+    return conn
+
+
+def get_read_connection(db_path=None):
+    """
+    Salt okunur (mode=ro URI) paylaşılan bağlantı.
+
+    WAL sayesinde yazma sürerken okumalar beklemez. Bağlantı süreç
+    boyunca tekrar kullanılır; çağıran taraf close() ÇAĞIRMAMALIDIR.
+    """
+    return _get_connection(db_path, readonly=True)
+
+
+def get_write_connection(db_path=None):
+    """
+    Süreç başına tek yazıcı bağlantı (paylaşılan).
+
+    Çağıran taraf commit() yapar, close() ÇAĞIRMAMALIDIR.
+    Kilit çakışmalarına karşı run_write() tercih edilmelidir.
+    """
+    return _get_connection(db_path, readonly=False)
+
+
+def run_write(fn, *args, db_path=None, **kwargs):
+    """
+    fn(conn, *args, **kwargs) fonksiyonunu tek bir yazma transaction'ında çalıştırır.
+
+    Transaction BEGIN IMMEDIATE ile açılır (yazma kilidi baştan alınır);
+    busy_timeout'a rağmen SQLITE_BUSY alınırsa geri alınır ve artan
+    beklemeyle WRITE_RETRIES kez yeniden denenir.
+
+    Returns:
+        fn'in döndürdüğü değer
+    """
+    conn = get_write_connection(db_path)
+    delay = WRITE_RETRY_DELAY
+
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            result = fn(conn, *args, **kwargs)
+            conn.commit()
+            return result
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            busy = 'locked' in str(e) or 'busy' in str(e)
+            if not busy or attempt == WRITE_RETRIES:
+                raise
+            print(f"[!] Veritabanı meşgul, yeniden deneniyor ({attempt + 1}/{WRITE_RETRIES})...")
+            time.sleep(delay)
+            delay *= 2
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def close_connections():
+    """Bu sürecin açtığı paylaşılan bağlantıları kapatır"""
+    for key, (pid, conn) in list(_connections.items()):
+        if pid == os.getpid():
+            conn.close()
+        del _connections[key]
+
 if __name__ == "__main__":
     print(f"Database Path: {DB_PATH}")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Drift Monitörü - Koşullu Haftalık Yeniden Eğitim
+================================================
+
+weekly_workflow_v2 her hafta modeli yeniden eğitiyordu; geçen haftanın
+hatası normal aralıktaysa ve girdilerin dağılımı değişmediyse bu gereksiz.
+Bu modül ucuz sinyallerle karar verir:
+
+- Veri revizyonu: modelin eğitim geçmişi (artifact) ile DB'deki fiyatlar
+  aynı saatlerde farklıysa -> tam (cold) yeniden eğitim
+- Feature drift: modelin görmediği saatler (eğitim sonu sonrası) ile
+  eğitimin son REFERENCE_WEEKS haftası arasında PSI ve KS istatistikleri
+- Hata trendi: weekly_performance'ta son haftanın MAPE'si / önceki
+  haftaların medyanı
+- Bayatlık: model MAX_UNSEEN_WEEKS haftadan fazla veriyi görmediyse
+
+Karar: 'skip' (sadece tahmin), 'warm' (warm start ile yeniden eğit) veya
+'full' (cold fit). En ağır sinyal kazanır; her karar gerekçeleriyle
+retrain_decisions tablosuna yazılır.
+
+Kullanım:
+    python drift_monitor.py [YYYY-MM-DD]   (karar ver ve kaydet, eğitim yapmaz)
+"""
+
+import numpy as np
+import pandas as pd
+import json
+import os
+import sqlite3
+import sys
+
+# Database path configuration
+try:
+    from db_config import get_read_connection, run_write
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import get_read_connection, run_write
+
+# Feature drift: izlenen kolonlar ve referans penceresi
+DRIFT_COLUMNS = ['y', 'consumption', 'supply_demand_gap', 'renewable_ratio', 'fossil_ratio']
+REFERENCE_WEEKS = 8
+PSI_BINS = 10
+
+# Eşikler (PSI: 0.1 orta, 0.25 büyük kayma - yaygın kullanım)
+PSI_WARM = 0.10
+PSI_FULL = 0.25
+KS_WARM = 0.20
+ERROR_RATIO_WARM = 1.3
+ERROR_RATIO_FULL = 2.0
+ERROR_BASELINE_WEEKS = 8
+MIN_ERROR_WEEKS = 3
+MAX_UNSEEN_WEEKS = 3
+
+# Revizyon kontrolünde tolerans (TRY)
+REVISION_ATOL = 1e-6
+
+DECISION_LEVELS = ['skip', 'warm', 'full']
+
+CREATE_DECISIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS retrain_decisions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week_start DATE,
+        model TEXT NOT NULL,
+        decision TEXT NOT NULL,
+        reasons TEXT NOT NULL,
+        metrics TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+# ========================================
+# İSTATİSTİKLER
+# ========================================
+
+def psi(reference, recent, bins=PSI_BINS):
+    """
+    Population Stability Index (referans kantillerinden kutular).
+
+    Returns:
+        float: PSI (hesaplanamazsa None)
+    """
+    reference = reference[~np.isnan(reference)]
+    recent = recent[~np.isnan(recent)]
+    if len(reference) < bins or len(recent) == 0:
+        return None
+
+    edges = np.unique(np.quantile(reference, np.linspace(0, 1, bins + 1)[1:-1]))
+    if len(edges) == 0:
+        return None
+    ref_share = np.bincount(np.searchsorted(edges, reference, side='right'),
+                            minlength=len(edges) + 1) / len(reference)
+    rec_share = np.bincount(np.searchsorted(edges, recent, side='right'),
+                            minlength=len(edges) + 1) / len(recent)
+    ref_share = np.clip(ref_share, 1e-4, None)
+    rec_share = np.clip(rec_share, 1e-4, None)
+    return float(np.sum((rec_share - ref_share) * np.log(rec_share / ref_share)))
+
+
+def ks_statistic(reference, recent):
+    """
+    İki örneklem Kolmogorov-Smirnov D istatistiği.
+
+    Returns:
+        float: max |F_ref - F_recent| (hesaplanamazsa None)
+    """
+    reference = np.sort(reference[~np.isnan(reference)])
+    recent = np.sort(recent[~np.isnan(recent)])
+    if len(reference) == 0 or len(recent) == 0:
+        return None
+    values = np.concatenate([reference, recent])
+    cdf_ref = np.searchsorted(reference, values, side='right') / len(reference)
+    cdf_rec = np.searchsorted(recent, values, side='right') / len(recent)
+    return float(np.max(np.abs(cdf_ref - cdf_rec)))
+
+
+# ========================================
+# SİNYALLER
+# ========================================
+
+def feature_drift(history_end, end_date=None, columns=DRIFT_COLUMNS):
+    """
+    Modelin görmediği saatler vs eğitimin son REFERENCE_WEEKS haftası.
+
+    Args:
+        history_end (pd.Timestamp): Modelin son eğitim saati
+        end_date (str, optional): Bu tarihe KADAR veri (dahil değil!)
+
+    Returns:
+        dict: kolon -> {'psi', 'ks'}; görülmemiş saat yoksa boş
+    """
+    from feature_store import load_features
+
+    df = load_features(end_date=end_date, columns=['ds'] + list(columns))
+    ds = df['ds'].to_numpy(dtype='datetime64[ns]')
+    end = np.datetime64(pd.Timestamp(history_end), 'ns')
+    split = int(np.searchsorted(ds, end, side='right'))
+    start = int(np.searchsorted(ds, end - np.timedelta64(REFERENCE_WEEKS * 7, 'D'), side='right'))
+    if split >= len(df):
+        return {}
+
+    drift = {}
+    for col in columns:
+        values = df[col].to_numpy(dtype=np.float64)
+        drift[col] = {
+            'psi': psi(values[start:split], values[split:]),
+            'ks': ks_statistic(values[start:split], values[split:]),
+        }
+    return drift
+
+
+def error_trend(week_start=None):
+    """
+    Son haftanın MAPE'si ve önceki haftaların medyanı (weekly_performance).
+
+    Args:
+        week_start (str, optional): Bu haftadan ÖNCEKİ haftalar dikkate alınır
+
+    Returns:
+        dict: last_week, last_mape, baseline_mape, ratio, weeks (veri yoksa None)
+    """
+    conn = get_read_connection()
+    query = """
+        SELECT week_start, mape FROM weekly_performance
+        WHERE week_start < ? AND mape IS NOT NULL
+        ORDER BY week_start DESC LIMIT ?
+    """
+    try:
+        rows = conn.execute(query, (week_start or '9999-12-31', ERROR_BASELINE_WEEKS + 1)).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    if len(rows) < MIN_ERROR_WEEKS:
+        return None
+
+    last_week, last_mape = rows[0]
+    baseline = float(np.median([mape for _, mape in rows[1:]]))
+    return {
+        'last_week': last_week,
+        'last_mape': float(last_mape),
+        'baseline_mape': baseline,
+        'ratio': float(last_mape) / baseline if baseline > 0 else None,
+        'weeks': len(rows) - 1,
+    }
+
+
+def data_revision(model_path, data):
+    """
+    Modelin eğitim geçmişindeki fiyatlar DB'de değişti mi?
+
+    Sadece ortak saatler karşılaştırılır (eğitim penceresinin kayması
+    revizyon sayılmaz); geçmişteki bir saat DB'den silinmişse revizyondur.
+
+    Args:
+        model_path (str): Prophet JSON model dosyası (artifact yanında)
+        data: Güncel ds, y verisi
+
+    Returns:
+        str: Revizyon açıklaması (yoksa / kontrol edilemezse None)
+    """
+    from prophet_artifact import artifact_path, is_current, load_history
+
+    path = artifact_path(model_path)
+    if len(data) == 0 or not is_current(path, model_path):
+        return None
+
+    previous = load_history(path, ['y'])
+    ds = data['ds'].to_numpy(dtype='datetime64[ns]')
+    positions = np.searchsorted(ds, previous['ds'].to_numpy(dtype='datetime64[ns]'))
+    positions = np.clip(positions, 0, len(ds) - 1)
+    found = ds[positions] == previous['ds'].to_numpy(dtype='datetime64[ns]')
+    if not found.all():
+        return f"{int((~found).sum())} eğitim saati DB'de yok"
+
+    current = data['y'].to_numpy(dtype=np.float64)[positions]
+    changed = ~np.isclose(current, previous['y'].to_numpy(dtype=np.float64), atol=REVISION_ATOL)
+    if changed.any():
+        first = pd.Timestamp(previous['ds'].iloc[int(np.argmax(changed))])
+        return f"{int(changed.sum())} saatte fiyat revizyonu (ilk: {first})"
+    return None
+
+
+# ========================================
+# KARAR
+# ========================================
+
+def decide_retrain(week_start=None):
+    """
+    Bu hafta yeniden eğitim gerekli mi?
+
+    Args:
+        week_start (str, optional): Tahmin haftasının Pazartesisi; veri bu
+                                    tarihe KADAR kullanılır
+
+    Returns:
+        dict: model, decision ('skip' | 'warm' | 'full'), reasons, metrics
+    """
+    from prophet_hourly import FAMILY_PATH, HourlyProphetFamily, use_hourly_family
+    from prophet_artifact import load_prophet
+    from train_prophet_improved import MODEL_PATH, load_data
+
+    family = use_hourly_family()
+    model_name = 'prophet_hourly' if family else 'prophet_v2'
+    model_path = FAMILY_PATH if family else MODEL_PATH
+
+    signals = []     # (seviye, gerekçe)
+    metrics = {}
+
+    if not os.path.exists(model_path):
+        signals.append(('full', "kayıtlı model yok"))
+    else:
+        model = HourlyProphetFamily.load(model_path) if family else load_prophet(model_path)
+        history_end = pd.Timestamp(model.history_end)
+        data = load_data(end_date=week_start)
+        metrics['history_end'] = str(history_end)
+
+        # 1. Veri revizyonu (saatlik ailede eğitim geçmişi saklanmıyor)
+        if not family:
+            revision = data_revision(model_path, data)
+            if revision:
+                signals.append(('full', f"veri revizyonu: {revision}"))
+
+        # 2. Bayatlık
+        unseen_hours = int((data['ds'] > history_end).sum())
+        metrics['unseen_hours'] = unseen_hours
+        if unseen_hours >= MAX_UNSEEN_WEEKS * 168:
+            signals.append(('warm', f"model {unseen_hours // 168} haftalık veriyi görmedi"))
+
+        # 3. Feature drift
+        drift = feature_drift(history_end, end_date=week_start)
+        metrics['drift'] = drift
+        for col, stats in drift.items():
+            if stats['psi'] is not None and stats['psi'] >= PSI_FULL:
+                signals.append(('full', f"{col} PSI {stats['psi']:.2f} >= {PSI_FULL}"))
+            elif stats['psi'] is not None and stats['psi'] >= PSI_WARM:
+                signals.append(('warm', f"{col} PSI {stats['psi']:.2f} >= {PSI_WARM}"))
+            elif stats['ks'] is not None and stats['ks'] >= KS_WARM:
+                signals.append(('warm', f"{col} KS {stats['ks']:.2f} >= {KS_WARM}"))
+
+    # 4. Hata trendi
+    trend = error_trend(week_start)
+    metrics['error_trend'] = trend
+    if trend is None:
+        signals.append(('warm', f"performans geçmişi yetersiz (< {MIN_ERROR_WEEKS} hafta)"))
+    elif trend['ratio'] is not None and trend['ratio'] >= ERROR_RATIO_FULL:
+        signals.append(('full', f"MAPE {trend['last_mape']:.2f}% = medyanın x{trend['ratio']:.2f} katı"))
+    elif trend['ratio'] is not None and trend['ratio'] >= ERROR_RATIO_WARM:
+        signals.append(('warm', f"MAPE {trend['last_mape']:.2f}% = medyanın x{trend['ratio']:.2f} katı"))
+
+    if signals:
+        decision = max((level for level, _ in signals), key=DECISION_LEVELS.index)
+        reasons = [reason for _, reason in signals]
+    else:
+        decision = 'skip'
+        reasons = ["hata normal aralıkta, drift / revizyon yok"]
+
+    return {
+        'week_start': week_start,
+        'model': model_name,
+        'decision': decision,
+        'reasons': reasons,
+        'metrics': metrics,
+    }
+
+
+def ensure_decisions_table(conn):
+    """retrain_decisions tablosunu oluşturur"""
+    conn.execute(CREATE_DECISIONS_SQL)
+
+
+def log_decision(result):
+    """Kararı gerekçeleriyle yazdırır ve retrain_decisions tablosuna kaydeder"""
+    print(f"[*] Yeniden egitim karari ({result['model']}): {result['decision'].upper()}")
+    for reason in result['reasons']:
+        print(f"    - {reason}")
+
+    def write(conn):
+        ensure_decisions_table(conn)
+        conn.execute("""
+            INSERT INTO retrain_decisions (week_start, model, decision, reasons, metrics)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            result['week_start'], result['model'], result['decision'],
+            json.dumps(result['reasons'], ensure_ascii=False),
+            json.dumps(result['metrics'], ensure_ascii=False, default=str),
+        ))
+
+    run_write(write)
+
+
+if __name__ == "__main__":
+    result = decide_retrain(sys.argv[1] if len(sys.argv) > 1 else None)
+    log_decision(result)
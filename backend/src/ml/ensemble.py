@@ -16,7 +16,6 @@ Bu modül:
 
 import pandas as pd
 import numpy as np
-from prophet.serialize import model_from_json
 import joblib
 import json
 import os
@@ -24,23 +23,20 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
-# TensorFlow import
+# LSTM NumPy runtime ile çalışır; TensorFlow sadece ağırlık dosyası
+# keras modelinden yeniden üretilecekse import edilir (lstm_numpy.load_lstm)
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-try:
-    from tensorflow import keras
-    LSTM_AVAILABLE = True
-except ImportError:
-    LSTM_AVAILABLE = False
-    print("[!] TensorFlow yok, LSTM devre dışı")
 
 # Feature engineering
 from features import (
-    load_combined_data,
-    engineer_features,
     get_prophet_features,
     get_xgboost_features,
     prepare_future_features
 )
+from feature_store import load_features
+from prophet_artifact import load_prophet
+from lstm_inference import predict_sequences
+from lstm_numpy import load_lstm, numpy_path
 
 # Model yolları
 PROPHET_MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model.json')
@@ -136,8 +132,7 @@ class EnsembleModel:
         print("[*] Modeller yükleniyor...")
         
         # Prophet
-        with open(PROPHET_MODEL_PATH, 'r') as f:
-            self.prophet_model = model_from_json(f.read())
+        self.prophet_model = load_prophet(PROPHET_MODEL_PATH)
         print(f"   [+] Prophet yüklendi: {PROPHET_MODEL_PATH}")
         
         # XGBoost
@@ -147,12 +142,13 @@ class EnsembleModel:
         print(f"   [+] XGBoost yüklendi: {XGBOOST_MODEL_PATH}")
         
         # LSTM (opsiyonel)
-        if LSTM_AVAILABLE and os.path.exists(LSTM_MODEL_PATH) and os.path.exists(LSTM_SCALER_PATH):
+        lstm_exists = os.path.exists(LSTM_MODEL_PATH) or os.path.exists(numpy_path(LSTM_MODEL_PATH))
+        if lstm_exists and os.path.exists(LSTM_SCALER_PATH):
             try:
-                self.lstm_model = keras.models.load_model(LSTM_MODEL_PATH)
+                self.lstm_model = load_lstm(LSTM_MODEL_PATH)
                 self.lstm_scaler = joblib.load(LSTM_SCALER_PATH)
                 self.use_lstm = True
-                print(f"   [+] LSTM yüklendi: {LSTM_MODEL_PATH}")
+                print(f"   [+] LSTM yüklendi (NumPy, {self.lstm_model.dtype}): {LSTM_MODEL_PATH}")
             except Exception as e:
                 print(f"   [!] LSTM yüklenemedi: {e}")
                 self.use_lstm = False
@@ -168,8 +164,38 @@ class EnsembleModel:
         
         return self
     
-    def _predict_lstm(self, df):
-        """LSTM ile tahmin yapar"""
+    def _lstm_seed(self, df, start):
+        """
+        start'tan önceki son seq_length saatin feature satırları.
+        
+        Gerçek geçmiş satırları kullanılır; geçmiş start'a kadar uzanmıyorsa
+        aradaki saatler gelecek feature tanımlarıyla doldurulur.
+        
+        Returns:
+            pd.DataFrame: Tohum satırları (geçmiş yoksa None)
+        """
+        seq_length = self.lstm_scaler['sequence_length']
+        history = df[df['ds'] < start]
+        if len(history) == 0:
+            return None
+        
+        seed = history.tail(seq_length)
+        gap = pd.date_range(start=history['ds'].max() + timedelta(hours=1),
+                            end=start - timedelta(hours=1), freq='H')[-seq_length:]
+        if len(gap):
+            gap_df = prepare_future_features(history, pd.DataFrame({'ds': gap}))
+            seed = pd.concat([seed, gap_df], ignore_index=True).tail(seq_length)
+        return seed
+    
+    def _predict_lstm(self, df, history=None):
+        """
+        LSTM ile tahmin yapar
+        
+        Args:
+            df: Feature'lar içeren DataFrame
+            history: df'den hemen önceki saatlerin feature satırları (opsiyonel);
+                     verilirse ilk seq_length saat de bu pencerelerle tahmin edilir
+        """
         if not self.use_lstm:
             return np.zeros(len(df))
         
@@ -184,23 +210,20 @@ class EnsembleModel:
             return np.zeros(len(df))
         
         X = df[available_features].values
+        n_seed = 0
+        if history is not None and all(f in history.columns for f in features):
+            X = np.vstack([history[features].values, X])
+            n_seed = len(history)
         X_scaled = scaler_X.transform(X)
         
-        # Sequence oluştur ve tahmin yap
-        predictions = []
-        for i in range(len(X_scaled)):
-            if i < seq_length:
-                # İlk seq_length satır için yeterli geçmiş yok
-                predictions.append(0)
-            else:
-                seq = X_scaled[i-seq_length:i].reshape(1, seq_length, -1)
-                pred_scaled = self.lstm_model.predict(seq, verbose=0)
-                pred = scaler_y.inverse_transform(pred_scaled).flatten()[0]
-                predictions.append(pred)
+        # Tüm pencereler tek toplu çağrıyla tahmin edilir; tohum + df'de
+        # ilk seq_length satır için yeterli geçmiş yok (0)
+        predictions = np.zeros(len(X_scaled))
+        predictions[seq_length:] = predict_sequences(self.lstm_model, X_scaled, scaler_y, seq_length)
         
-        return np.array(predictions)
+        return predictions[n_seed:]
     
-    def predict(self, df, mode='weighted'):
+    def predict(self, df, mode='weighted', history=None):
         """
         Ensemble tahmin yapar
         
@@ -210,6 +233,7 @@ class EnsembleModel:
                 - weighted: Ağırlıklı ortalama
                 - residual: Prophet + XGBoost residual + LSTM residual
                 - individual: Tüm modelleri ayrı döndür
+            history: LSTM pencereleri için df'den önceki saatler (_lstm_seed)
             
         Returns:
             dict: Tahminler
@@ -231,7 +255,7 @@ class EnsembleModel:
         xgboost_pred = self.xgboost_model.predict(df[available_xgb_features].values)
         
         # LSTM tahminleri
-        lstm_pred = self._predict_lstm(df)
+        lstm_pred = self._predict_lstm(df, history=history)
         
         # Ensemble stratejisi - Inverse Error Weighting
         if mode == 'residual':
@@ -297,8 +321,12 @@ class EnsembleModel:
         # Feature'ları hazırla
         future_df = prepare_future_features(df, future_df)
         
+        # LSTM pencereleri gerçek son saatlerle başlar: ufkun tamamı tek
+        # toplu çağrıyla tahmin edilir (ilk seq_length saat 0 kalmaz)
+        history = self._lstm_seed(df, future_dates[0]) if self.use_lstm else None
+        
         # Tahmin yap
-        predictions = self.predict(future_df)
+        predictions = self.predict(future_df, history=history)
         
         # Sonuçları DataFrame'e ekle
         future_df['predicted_price'] = predictions['ensemble_pred']
@@ -377,9 +405,8 @@ def main():
     print("EPİAŞ MCP Fiyat Tahmini - Ensemble Model (3 Model)")
     print("=" * 60)
     
-    # 1. Veri yükle
-    df = load_combined_data()
-    df = engineer_features(df)
+    # 1. Veri yükle (feature store üzerinden)
+    df = load_features()
     
     # 2. Ensemble model yükle
     ensemble = EnsembleModel()
@@ -11,7 +11,6 @@ Bu script:
 """
 
 import pandas as pd
-import sqlite3
 import json
 import os
 from datetime import datetime, timedelta
@@ -19,10 +18,10 @@ import sys
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '../../public/forecasts.json')
 
 def get_current_week_monday():
@@ -41,7 +40,7 @@ def export_forecasts():
     print("JSON EXPORT - Frontend için veri hazırlama")
     print("="*70)
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
 
     # Bu haftanın Pazartesi'si
     this_week_monday = get_current_week_monday()
@@ -148,8 +147,6 @@ def export_forecasts():
     else:
         print(f"[!] Performans trendi bulunamadı")
 
-    conn.close()
-
     # 5. JSON oluştur
     print(f"\n[*] JSON dosyası oluşturuluyor...")
     output_data = {
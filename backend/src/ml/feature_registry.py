@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Feature Registry - Bildirimsel Feature Tanımları
+================================================
+
+Her feature bir kez tanımlanır:
+- inputs: Bağlı olduğu diğer feature'lar
+- raw: Okuduğu ham kolonlar (ds, y, DB kolonları)
+- lookback: Kendi hesabı için gereken geçmiş saat sayısı (lag/rolling)
+- compute: Geçmiş veri üzerinde hesap
+- future: Gelecek tarihler için hesap (None ise compute aynen kullanılır,
+  örn. sadece ds'e bağlı zaman feature'ları)
+
+FeatureFrame istenen kolonları tembel (lazy) hesaplar: sadece istenen
+feature'lar ve bağımlılıkları hesaplanır, ortak ara sonuçlar (örn. rolling
+ortalama + std) bir kez hesaplanıp paylaşılır.
+
+Tanımlar features.py'de @register ile yapılır; engineer_features() ve
+prepare_future_features() aynı tanımları kullandığı için birbirinden
+kopamaz.
+"""
+
+
+class Feature:
+    """Tek bir feature tanımı"""
+
+    def __init__(self, name, compute, inputs=(), raw=(), lookback=0, future=None):
+        self.name = name
+        self.compute = compute
+        self.inputs = list(inputs)
+        self.raw = list(raw)
+        self.lookback = lookback
+        self.future = future
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, inputs={self.inputs}, lookback={self.lookback})"
+
+
+# Kayıt sırası korunur (engineer_features kolon sırası bu sıradır)
+FEATURES = {}
+
+
+def register(name, inputs=(), raw=(), lookback=0, future=None):
+    """
+    Feature tanımlama decorator'ı.
+
+    Örnek:
+        @register('price_lag_24h', raw=['y'], lookback=24, future=...)
+        def price_lag_24h(ctx):
+            return ctx['y'].shift(24)
+    """
+    def decorator(compute):
+        FEATURES[name] = Feature(name, compute, inputs, raw, lookback, future)
+        return compute
+    return decorator
+
+
+def plan(columns):
+    """
+    İstenen kolonlar için hesaplanacak feature'ları bağımlılık sırasıyla döndürür.
+
+    Returns:
+        list: Feature isimleri (önce bağımlılıklar)
+    """
+    order = []
+    visiting = set()
+
+    def visit(name):
+        if name in order:
+            return
+        if name not in FEATURES:
+            raise KeyError(f"Tanımsız feature: {name}")
+        if name in visiting:
+            raise ValueError(f"Feature bağımlılıklarında döngü: {name}")
+        visiting.add(name)
+        for dep in FEATURES[name].inputs:
+            visit(dep)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in columns:
+        visit(name)
+    return order
+
+
+def required_lookback(columns):
+    """
+    İstenen kolonların tam değerle hesaplanabilmesi için gereken geçmiş saat sayısı.
+
+    Zincirler toplanır (örn. lag'in lag'i), paralel bağımlılıklarda en uzunu alınır.
+    """
+    memo = {}
+
+    def lookback(name):
+        if name not in FEATURES:
+            return 0
+        if name not in memo:
+            feature = FEATURES[name]
+            memo[name] = feature.lookback + max(
+                [lookback(dep) for dep in feature.inputs], default=0
+            )
+        return memo[name]
+
+    return max([lookback(name) for name in columns], default=0)
+
+
+class FeatureFrame:
+    """
+    Bir DataFrame üzerinde feature'ları tembel hesaplayan bağlam.
+
+    ctx['isim'] -> feature ise (önbellekten veya hesaplanarak) değeri,
+    değilse DataFrame'deki ham kolonu döndürür.
+    """
+
+    def __init__(self, df, history=None, precomputed=False, state=None, state_rows=0):
+        """
+        Args:
+            df: Ham veri (geçmiş modda) veya ds kolonlu gelecek tarihleri
+            history (FeatureFrame, optional): Verilirse gelecek modu; feature'ların
+                                              future hesabı bu geçmişi kullanır
+            precomputed (bool): df'deki mevcut kolonlar hesaplanmış feature kabul
+                                edilir (örn. engineer_features çıktısı)
+            state (dict, optional): Durumlu feature'lar (örn. rolling kümülatif
+                                    toplamları) önceki durumu buradan okur,
+                                    yeni durumu buraya yazar
+            state_rows (int): df'nin state'in zaten kapsadığı ilk satır sayısı
+                              (artımlı moddaki bağlam satırları)
+        """
+        self.df = df
+        self.history = history
+        self.precomputed = precomputed
+        self.state = {} if state is None else state
+        self.state_rows = state_rows
+        self.cache = {}
+
+    @property
+    def is_future(self):
+        return self.history is not None
+
+    def raw(self, name):
+        """DataFrame'deki ham kolon (feature tanımı olsa bile)"""
+        return self.df[name]
+
+    def __getitem__(self, name):
+        if name in self.cache:
+            return self.cache[name]
+
+        feature = FEATURES.get(name)
+        if feature is None or (self.precomputed and name in self.df.columns):
+            return self.df[name]
+
+        if self.is_future and feature.future is not None:
+            value = feature.future(self, self.history)
+        else:
+            value = feature.compute(self)
+
+        self.cache[name] = value
+        return value
+
+    def materialize(self, columns, out=None):
+        """
+        İstenen kolonları hesaplar ve out DataFrame'ine yazar.
+
+        Args:
+            columns (list): Feature isimleri
+            out (pd.DataFrame, optional): Yazılacak frame (None ise self.df, yerinde)
+
+        Returns:
+            pd.DataFrame: out
+        """
+        out = self.df if out is None else out
+        # Gelecek modunda future hesapları geçmişten okur, compute bağımlılıkları
+        # (örn. renewable -> solar, wind) gerekmez; ctx[...] ile tembel çözülür
+        if not self.is_future:
+            for name in plan(columns):
+                self[name]
+        for name in columns:
+            out[name] = self[name]
+        return out
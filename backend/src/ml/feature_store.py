@@ -0,0 +1,517 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Feature Store - Disk Üzerinde Kolon Bazlı Feature Deposu
+=========================================================
+
+engineer_features() çıktısını diskte NumPy (.npy) segmentleri olarak saklar.
+Böylece her eğitim/backfill çalıştırmasında 3 tablolu JOIN ve tüm feature
+engineering baştan yapılmaz.
+
+Yapı:
+    feature_store/
+        meta.json          -> kolonlar, dtype'lar, watermark, segment listesi
+        seg_00000/ds.npy   -> sıralı zaman damgası kolonu (datetime64[ns])
+        seg_00000/y.npy    -> diğer kolonlar (her kolon ayrı dosya)
+        seg_00001/...      -> artımlı eklenen yeni saatler
+
+Özellikler:
+- Artımlı güncelleme: Son saklanan timestamp (watermark) sonrası eklenir,
+  feature'lar sadece yeni satırlar için hesaplanır (engineer_features_incremental)
+- end_date sınırlı okuma: Sıralı ds kolonunda binary search (np.searchsorted)
+- Kolonlar memory-map ile okunur (mmap_mode='r'), sadece gereken dilim kopyalanır
+- Düşük bellek: ham veri load_combined_data_compact ile akıtılır, feature'lar
+  engineer_features(compact=True) dtype'larıyla saklanır (y float64, zaman/
+  bayrak kolonları int8, diğerleri float32); artımlı satırlar aynı dtype'lara
+  çevrilir
+- Veri revizyonu: kaynak tablolara (mcp_data, consumption_data,
+  generation_data) her yazım INSERT OR REPLACE olduğundan revize edilen
+  satır yeni bir id alır. Meta'da tablo başına MAX(id) tutulur (O(log n));
+  değişince sadece yeni id'li satırların en erken saati okunur ve bu saat
+  kararlı geçmişe düşüyorsa store yeniden oluşturulur. Geç gelen
+  tüketim/üretim normal durumdur (MCP gün öncesi, tüketim sonra
+  yayınlanır): son REVISION_HOURS saatin imzası (satır sayısı + kolon
+  başına ts ağırlıklı toplamlar) değişirse store o noktaya kırpılır ve
+  kuyruk artımlı yeniden hesaplanır
+- Durumlu feature'ların (rolling 24h kümülatif toplamları) son
+  STATE_ROWS satırlık durumu meta'da tutulur; artımlı güncelleme bu
+  durumdan devam eder (yeni satır başına O(1), toplu hesapla bit bit aynı)
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import shutil
+import sys
+from datetime import timedelta
+
+# Database path configuration
+try:
+    from db_config import DB_PATH, get_read_connection
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import DB_PATH, get_read_connection
+
+from features import (
+    load_combined_data_compact,
+    engineer_features,
+    engineer_features_incremental,
+    MAX_LAG_HOURS,
+    RAW_COLUMNS,
+    ROLLING_WINDOW
+)
+from hourly_panel import sync_hourly_panel, date_to_ts, ts_to_datetime
+
+# Store, veritabanı dosyasının yanında tutulur (dev/prod DB'leri karışmasın diye DB adıyla)
+FEATURE_STORE_DIR = os.path.join(
+    os.path.dirname(DB_PATH),
+    f"feature_store_{os.path.splitext(os.path.basename(DB_PATH))[0]}"
+)
+
+# Format değişirse store otomatik yeniden oluşturulur
+STORE_VERSION = 6
+
+# Geç gelen veri için her güncellemede imzası ayrıca kontrol edilen kuyruk (saat)
+REVISION_HOURS = 48
+
+# Meta'da saklanan durum satırı sayısı (kuyruk kırpılınca da devam edebilmek için)
+STATE_ROWS = REVISION_HOURS + ROLLING_WINDOW
+
+# İmzaya giren hourly_panel kolonları (feature'ların okuduğu ham kolonlar)
+SIGNATURE_COLUMNS = ['price'] + RAW_COLUMNS[3:]
+
+# Revizyon watermark'ı tutulan kaynak tablolar (id INTEGER PRIMARY KEY AUTOINCREMENT)
+SOURCE_TABLES = ('mcp_data', 'consumption_data', 'generation_data')
+
+# Bu sayıdan fazla segment birikirse tek segmente sıkıştırılır
+MAX_SEGMENTS = 16
+
+
+class FeatureStore:
+    """engineer_features() çıktısı için disk üzerinde kolon bazlı depo"""
+
+    def __init__(self, path=FEATURE_STORE_DIR):
+        self.path = path
+        self.meta_path = os.path.join(path, 'meta.json')
+        self.meta = self._read_meta()
+
+    # ========================================
+    # META
+    # ========================================
+
+    def _read_meta(self):
+        """meta.json dosyasını okur (yoksa None)"""
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, 'r') as f:
+            return json.load(f)
+
+    def _write_meta(self, meta):
+        """meta.json dosyasını atomik olarak yazar"""
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, self.meta_path)
+        self.meta = meta
+
+    @property
+    def watermark(self):
+        """Store'daki son timestamp (yoksa None)"""
+        if not self.meta or self.meta.get('watermark') is None:
+            return None
+        return pd.Timestamp(self.meta['watermark'])
+
+    def is_valid(self):
+        """Store mevcut ve güncel formatta mı?"""
+        return (
+            self.meta is not None
+            and self.meta.get('version') == STORE_VERSION
+            and len(self.meta.get('segments', [])) > 0
+            and self.meta.get('feature_state') is not None
+        )
+
+    # ========================================
+    # SEGMENT YAZMA / OKUMA
+    # ========================================
+
+    def _write_segment(self, df, name):
+        """DataFrame'i kolon başına bir .npy dosyası olarak yazar"""
+        tmp_dir = os.path.join(self.path, name + '.tmp')
+        seg_dir = os.path.join(self.path, name)
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        for col in df.columns:
+            np.save(os.path.join(tmp_dir, f'{col}.npy'), df[col].to_numpy())
+
+        if os.path.exists(seg_dir):
+            shutil.rmtree(seg_dir)
+        os.replace(tmp_dir, seg_dir)
+
+    def _segment_column(self, name, col):
+        """Segmentteki bir kolonu memory-map olarak açar"""
+        return np.load(os.path.join(self.path, name, f'{col}.npy'), mmap_mode='r')
+
+    def _next_segment_name(self):
+        """Sıradaki segment adını üretir"""
+        return f"seg_{self.meta['next_segment']:05d}"
+
+    def _source_signature(self, start, end):
+        """
+        hourly_panel'de start < ds <= end satırlarının imzası.
+
+        Satır sayısı + her kolon için ts ağırlıklı toplam (NULL -1 sayılır;
+        sonradan gelen değer imzayı değiştirir). Toplamlar ts sırasıyla
+        hesaplandığından aynı veri için birebir aynıdır.
+
+        Returns:
+            list: [count, kolon toplamları...] (JSON'a yazılabilir)
+        """
+        sync_hourly_panel()
+        sums = ', '.join(f"TOTAL(IFNULL({col}, -1) * (ts % 1009 + 1))" for col in SIGNATURE_COLUMNS)
+        row = get_read_connection().execute(
+            f"SELECT COUNT(*), {sums} FROM hourly_panel WHERE ts > ? AND ts <= ?",
+            (date_to_ts(start) if start is not None else -2**62, date_to_ts(end))
+        ).fetchone()
+        return list(row)
+
+    def _signatures(self, watermark, source_ids):
+        """Kaynak watermark'ı ve kuyruk imzası (meta alanları)"""
+        stable_end = watermark - timedelta(hours=REVISION_HOURS)
+        return {
+            'source_ids': source_ids,
+            'tail_signature': self._source_signature(stable_end, watermark),
+        }
+
+    @staticmethod
+    def _source_ids():
+        """
+        Kaynak tabloların revizyon watermark'ı (tablo başına MAX(id)).
+
+        Tablolara INSERT OR REPLACE ile yazılır: yeni veya revize edilen her
+        satır daha büyük bir id alır. MAX(id) rowid B-tree'sinden O(log n).
+
+        Returns:
+            dict: {tablo: MAX(id)}
+        """
+        conn = get_read_connection()
+        return {
+            table: conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+            for table in SOURCE_TABLES
+        }
+
+    @staticmethod
+    def _first_changed(source_ids):
+        """
+        source_ids watermark'ından sonra yazılan satırların en erken saati.
+
+        Sadece yeni id'li satırlar okunur (rowid aralığı, O(değişen satır)).
+        Saat kolonu boşsa gün başı alınır (ihtiyatlı).
+
+        Returns:
+            pd.Timestamp veya None: Değişen satır yoksa None
+        """
+        conn = get_read_connection()
+        first = None
+        for table in SOURCE_TABLES:
+            ts = conn.execute(
+                f"""
+                SELECT MIN(CAST(strftime('%s', substr(date, 1, 10)) AS INTEGER) / 3600
+                           + IFNULL(CAST(substr(hour, 1, 2) AS INTEGER), 0))
+                FROM {table} WHERE id > ?
+                """,
+                (source_ids.get(table) or 0,)
+            ).fetchone()[0]
+            if ts is not None and (first is None or ts < first):
+                first = ts
+        return ts_to_datetime(first) if first is not None else None
+
+    @staticmethod
+    def _trim_state(state, drop=0):
+        """
+        Feature durumunu meta'ya yazılacak hale getirir: son `drop` satırın
+        durumu atılır, en fazla STATE_ROWS satır tutulur.
+
+        Returns:
+            dict: Listeye çevrilmiş durum (devam için yetersizse None)
+        """
+        trimmed = {}
+        for name, arrays in state.items():
+            trimmed[name] = {}
+            for key, values in arrays.items():
+                values = values[:len(values) - drop]
+                if drop and len(values) < ROLLING_WINDOW:
+                    return None
+                trimmed[name][key] = [float(v) for v in values[-STATE_ROWS:]]
+        return trimmed
+
+    def _truncate(self, cut):
+        """
+        ds > cut satırlarını store'dan çıkarır.
+
+        Segment dosyaları yeniden yazılmaz: meta'daki satır sayısı kısaltılır,
+        tamamen kesilen segmentler silinir (alan compact'ta geri kazanılır).
+        Feature durumu da kırpılan satır kadar geri alınır.
+
+        Returns:
+            int: Kalan satır sayısı
+        """
+        meta = dict(self.meta)
+        segments = []
+        dropped = []
+        for seg in meta['segments']:
+            ds = self._segment_column(seg['name'], 'ds')[:seg['rows']]
+            rows = int(np.searchsorted(ds, np.datetime64(cut), side='right'))
+            if rows > 0:
+                segments.append({'name': seg['name'], 'rows': rows})
+            else:
+                dropped.append(seg['name'])
+
+        removed = sum(seg['rows'] for seg in meta['segments']) - sum(seg['rows'] for seg in segments)
+        meta['segments'] = segments
+        meta['watermark'] = str(pd.Timestamp(cut)) if segments else None
+        meta['feature_state'] = self._trim_state(meta['feature_state'], drop=removed)
+        self._write_meta(meta)
+        for name in dropped:
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+        return sum(seg['rows'] for seg in segments)
+
+    # ========================================
+    # OLUŞTURMA / GÜNCELLEME
+    # ========================================
+
+    def rebuild(self):
+        """Store'u sıfırdan oluşturur (tüm veri yüklenir ve engineer edilir)"""
+        print(f"[*] Feature store sıfırdan oluşturuluyor: {self.path}")
+
+        # Veri yüklenmeden önce okunur: arada yazılan satırlar sonraki refresh'te görülür
+        source_ids = self._source_ids()
+        state = {}
+        df = engineer_features(load_combined_data_compact(), compact=True, state=state)
+        df = df.reset_index(drop=True)
+
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(self.path)
+
+        self.meta = {'next_segment': 0}
+        name = self._next_segment_name()
+        self._write_segment(df, name)
+
+        watermark = df['ds'].max() if len(df) > 0 else None
+        self._write_meta({
+            'version': STORE_VERSION,
+            'columns': list(df.columns),
+            'dtypes': {col: str(df[col].dtype) for col in df.columns},
+            'segments': [{'name': name, 'rows': len(df)}],
+            'next_segment': 1,
+            'watermark': str(watermark) if watermark is not None else None,
+            'feature_state': self._trim_state(state),
+            **(self._signatures(watermark, source_ids) if watermark is not None else {}),
+        })
+
+        print(f"[+] Feature store oluşturuldu: {len(df)} satır, {len(df.columns)} kolon")
+        return len(df)
+
+    def refresh(self):
+        """
+        Store'u günceller: watermark sonrası yeni saatleri ekler.
+
+        Sadece watermark sonrası ham satırlar yüklenir; lag/rolling feature'lar
+        store'un son MAX_LAG_HOURS satırı durum olarak kullanılarak
+        engineer_features_incremental() ile hesaplanır (O(yeni satır)).
+        Son REVISION_HOURS saatte geç gelen / değişen veri varsa bu saatler
+        de yeniden hesaplanır.
+
+        Returns:
+            int: Eklenen (yeniden hesaplananlar dahil) satır sayısı
+        """
+        if not self.is_valid() or self.watermark is None:
+            return self.rebuild()
+
+        watermark = self.watermark
+        stable_end = watermark - timedelta(hours=REVISION_HOURS)
+        source_ids = self._source_ids()
+
+        # Kararlı geçmiş revize edilmiş mi? (sadece watermark'tan sonra yazılan satırlar okunur)
+        if source_ids != self.meta.get('source_ids'):
+            changed = self._first_changed(self.meta.get('source_ids') or {})
+            if changed is not None and changed <= stable_end:
+                print(f"[!] Feature store: geçmiş veride değişiklik tespit edildi ({changed}), "
+                      f"yeniden oluşturuluyor")
+                return self.rebuild()
+
+        # Kuyrukta geç gelen veri: store kararlı kısma kırpılır, kuyruk yeniden hesaplanır
+        if self._source_signature(stable_end, watermark) != self.meta.get('tail_signature'):
+            cut = stable_end
+            print(f"[*] Feature store: son {REVISION_HOURS} saatte güncellenen veri, "
+                  f"{cut} sonrası yeniden hesaplanıyor")
+            if self._truncate(cut) == 0 or not self.is_valid():
+                return self.rebuild()
+            watermark = self.watermark
+
+        raw = load_combined_data_compact(start_date=str(watermark + timedelta(hours=1)))
+        if len(raw) == 0:
+            print(f"[+] Feature store güncel (watermark: {watermark})")
+            return 0
+
+        state = {
+            name: {key: np.asarray(values) for key, values in arrays.items()}
+            for name, arrays in self.meta['feature_state'].items()
+        }
+        df = engineer_features_incremental(self.tail(MAX_LAG_HOURS), raw, state=state)
+
+        if list(df.columns) != self.meta['columns']:
+            print("[!] Feature store: kolon yapısı değişmiş, yeniden oluşturuluyor")
+            return self.rebuild()
+
+        # Store'daki dtype'larla uyumlu tut
+        df = df.astype(self.meta['dtypes'])
+
+        meta = dict(self.meta)
+        name = self._next_segment_name()
+        self._write_segment(df, name)
+
+        new_watermark = df['ds'].max()
+        meta['segments'] = meta['segments'] + [{'name': name, 'rows': len(df)}]
+        meta['next_segment'] = meta['next_segment'] + 1
+        meta['watermark'] = str(new_watermark)
+        meta['feature_state'] = self._trim_state(state)
+        meta.update(self._signatures(new_watermark, source_ids))
+        self._write_meta(meta)
+
+        print(f"[+] Feature store: {len(df)} yeni satır eklendi (watermark: {new_watermark})")
+
+        if len(self.meta['segments']) > MAX_SEGMENTS:
+            self.compact()
+
+        return len(df)
+
+    def compact(self):
+        """Tüm segmentleri tek segmentte birleştirir"""
+        print(f"[*] Feature store sıkıştırılıyor ({len(self.meta['segments'])} segment)...")
+
+        df = self.load()
+        meta = dict(self.meta)
+        old_segments = [seg['name'] for seg in meta['segments']]
+
+        name = self._next_segment_name()
+        self._write_segment(df, name)
+
+        meta['segments'] = [{'name': name, 'rows': len(df)}]
+        meta['next_segment'] = meta['next_segment'] + 1
+        self._write_meta(meta)
+
+        for seg in old_segments:
+            shutil.rmtree(os.path.join(self.path, seg), ignore_errors=True)
+
+        print(f"[+] Feature store sıkıştırıldı: {len(df)} satır")
+
+    # ========================================
+    # OKUMA
+    # ========================================
+
+    def tail(self, n):
+        """Store'un son n satırını okur (sadece son segment(ler) açılır)"""
+        parts = []
+        remaining = n
+        for seg in reversed(self.meta['segments']):
+            if remaining <= 0:
+                break
+            take = min(remaining, seg['rows'])
+            parts.append(pd.DataFrame({
+                col: np.asarray(self._segment_column(seg['name'], col)[seg['rows'] - take:seg['rows']])
+                for col in self.meta['columns']
+            }))
+            remaining -= take
+
+        return pd.concat(parts[::-1], ignore_index=True)
+
+    def load(self, end_date=None, columns=None):
+        """
+        Store'dan feature'ları okur.
+
+        Args:
+            end_date (str, optional): Bu tarihe KADAR (dahil değil!).
+                                      Binary search ile sınır bulunur.
+            columns (list, optional): Sadece bu kolonları oku (ds her zaman dahil)
+
+        Returns:
+            pd.DataFrame: engineer_features(load_combined_data_compact(end_date),
+                          compact=True) ile aynı yapı
+        """
+        columns = columns or self.meta['columns']
+        if 'ds' not in columns:
+            columns = ['ds'] + list(columns)
+
+        end_ts = pd.Timestamp(end_date) if end_date else None
+
+        parts = {col: [] for col in columns}
+        for seg in self.meta['segments']:
+            ds = self._segment_column(seg['name'], 'ds')[:seg['rows']]
+            stop = len(ds)
+            if end_ts is not None:
+                # ds sıralı -> ilk ds >= end_date pozisyonu
+                stop = int(np.searchsorted(ds, np.datetime64(end_ts), side='left'))
+            if stop == 0:
+                break
+            for col in columns:
+                parts[col].append(np.asarray(self._segment_column(seg['name'], col)[:stop]))
+            if stop < len(ds):
+                break
+
+        if not parts['ds']:
+            return pd.DataFrame({
+                col: pd.Series(dtype=self.meta['dtypes'][col]) for col in columns
+            })
+
+        return pd.DataFrame({col: np.concatenate(parts[col]) for col in columns})
+
+
+def load_features(end_date=None, refresh=True, columns=None):
+    """
+    Engineer edilmiş veri setini feature store üzerinden yükler.
+
+    load_combined_data() + engineer_features() çiftinin yerine kullanılır.
+
+    Args:
+        end_date (str, optional): Bu tarihe KADAR veri (dahil değil!)
+        refresh (bool): Okumadan önce store'u DB'den güncelle
+        columns (list, optional): Sadece bu kolonları döndür
+
+    Returns:
+        pd.DataFrame: Feature'lar eklenmiş veri seti (compact dtype'lar:
+                      y float64, zaman/bayrak int8, diğerleri float32)
+    """
+    store = FeatureStore()
+    if refresh or not store.is_valid():
+        store.refresh()
+
+    if end_date:
+        print(f"[*] Data leakage önleme: {end_date} tarihine KADAR veri kullanılacak")
+
+    df = store.load(end_date=end_date, columns=columns)
+    print(f"[+] Feature store'dan {len(df)} satır okundu")
+    return df
+
+
+if __name__ == "__main__":
+    # Kullanım:
+    #   python feature_store.py            -> artımlı güncelle
+    #   python feature_store.py --rebuild  -> sıfırdan oluştur
+    print("=" * 60)
+    print("Feature Store")
+    print("=" * 60)
+
+    store = FeatureStore()
+    if '--rebuild' in sys.argv:
+        store.rebuild()
+    else:
+        store.refresh()
+
+    print(f"\n[*] Konum: {store.path}")
+    print(f"[*] Watermark: {store.watermark}")
+    print(f"[*] Segment sayısı: {len(store.meta['segments'])}")
+    print(f"[*] Toplam satır: {sum(seg['rows'] for seg in store.meta['segments'])}")
@@ -16,20 +16,25 @@ Hem Prophet hem de XGBoost modelleri bu modülü kullanır.
 
 import pandas as pd
 import numpy as np
-import sqlite3
 import os
 from datetime import datetime, timedelta
 import sys
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 
+from hourly_panel import sync_hourly_panel, date_to_ts, ts_to_datetime
+from hourly_series import HourlySeries
+from feature_registry import register, required_lookback, FeatureFrame
+from calendar_table import calendar_positions
+from seasonal_profile import get_profile, PROFILE_COLUMNS
 
-def load_combined_data(end_date=None):
+
+def load_combined_data(end_date=None, start_date=None):
     """
     3 tabloyu (MCP, Consumption, Generation) birleştirerek yükler.
     
@@ -37,6 +42,8 @@ def load_combined_data(end_date=None):
         end_date (str, optional): Bu tarihe KADAR veri yükle (dahil değil!).
                                   Format: 'YYYY-MM-DD' veya 'YYYY-MM-DD HH:MM:SS'
                                   None ise tüm veriyi yükler.
+        start_date (str, optional): Bu tarihten İTİBAREN veri yükle (dahil).
+                                    Feature store'un artımlı güncellemesi için kullanılır.
     Returns:
         pd.DataFrame: Birleştirilmiş veri seti
     """
@@ -45,41 +52,37 @@ def load_combined_data(end_date=None):
     if end_date:
         print(f"[*] Data leakage önleme: {end_date} tarihine KADAR veri kullanılacak")
     
-    conn = sqlite3.connect(DB_PATH)
+    # 3 tablo hourly_panel'de önceden birleştirilmiş halde tutuluyor
+    # (ts = epoch-saat, PRIMARY KEY -> düz range scan, DATE() JOIN yok)
+    sync_hourly_panel()
+    conn = get_read_connection()
     
-    # 3 tabloyu JOIN ile birleştir
-    # LEFT JOIN kullanıyoruz çünkü bazı saatlerde consumption/generation verisi eksik olabilir
     query = """
         SELECT 
-            m.date as ds,
-            m.price as y,
-            m.hour,
-            c.consumption,
-            g.total as generation_total,
-            g.solar,
-            g.wind,
-            g.hydro,
-            g.natural_gas,
-            g.lignite,
-            g.geothermal,
-            g.biomass
-        FROM mcp_data m
-        LEFT JOIN consumption_data c 
-            ON DATE(m.date) = DATE(c.date) AND m.hour = c.hour
-        LEFT JOIN generation_data g 
-            ON DATE(m.date) = DATE(g.date) AND m.hour = g.hour
+            ts,
+            price as y,
+            ts % 24 as hour,
+            consumption,
+            generation_total,
+            solar,
+            wind,
+            hydro,
+            natural_gas,
+            lignite,
+            geothermal,
+            biomass
+        FROM hourly_panel
+        WHERE ts >= ? AND ts < ?
+        ORDER BY ts
     """
     
-    if end_date:
-        query += f" WHERE m.date < '{end_date}'"
-    
-    query += " ORDER BY m.date"
+    start_ts = date_to_ts(start_date) if start_date else 0
+    end_ts = date_to_ts(end_date) if end_date else 2**62
     
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    df = pd.read_sql_query(query, conn, params=[start_ts, end_ts])
     
-    # Tarih formatını düzelt
-    df['ds'] = pd.to_datetime(df['ds']).dt.tz_localize(None)
+    # Epoch-saat -> timezone'suz datetime (yerel saat)
+    df.insert(0, 'ds', ts_to_datetime(df.pop('ts')))
     
     print(f"[+] {len(df)} kayıt yüklendi")
     print(f"[*] Tarih aralığı: {df['ds'].min()} -> {df['ds'].max()}")
@@ -96,135 +99,531 @@ def load_combined_data(end_date=None):
     return df
 
 
-def engineer_features(df):
+# Rolling ortalama/std pencere uzunluğu
+ROLLING_WINDOW = 24
+
+# load_combined_data() çıktısındaki ham kolonlar (artımlı mod için gereken durum)
+RAW_COLUMNS = [
+    'ds', 'y', 'hour', 'consumption', 'generation_total', 'solar', 'wind',
+    'hydro', 'natural_gas', 'lignite', 'geothermal', 'biomass',
+]
+
+
+# Compact modda int8'e indirilen zaman/bayrak kolonları (0-31 arası değerler)
+INT8_COLUMNS = [
+    'hour', 'day_of_week', 'day_of_month', 'month',
+    'is_weekend', 'is_peak_hour', 'is_daytime',
+]
+
+# Streaming loader'ın tek seferde DB'den çektiği satır sayısı
+CHUNK_SIZE = 50_000
+
+
+def load_hourly_series(end_date=None, start_date=None, chunk_size=CHUNK_SIZE):
     """
-    Ham veriden feature'lar oluşturur.
+    hourly_panel'i düşük bellekle HourlySeries olarak yükler.
     
-    Prophet ve XGBoost için ortak feature engineering.
+    - Aralığın MIN/MAX ts'i önce bulunur, kolonlar için NumPy dizileri
+      önceden ayrılır ve cursor.fetchmany(chunk_size) ile parça parça
+      doldurulur (read_sql_query'deki tüm satırların Python tuple listesi oluşmaz)
+    - Her satır ts - start pozisyonuna yazılır (O(1)); eksik saatler
+      HourlySeries.present bitmap'inde False kalır
+    - Hedef (y) float64 kalır; exogen kolonlar float32, hour int8
+    
+    Sorgular aynı okuma transaction'ında çalışır, aradaki insert'ler
+    dizi boyutunu bozmaz.
     
     Args:
-        df: load_combined_data() çıktısı
+        end_date (str, optional): Bu tarihe KADAR veri (dahil değil!)
+        start_date (str, optional): Bu tarihten İTİBAREN veri (dahil)
+        chunk_size (int): fetchmany parça boyutu
         
     Returns:
-        pd.DataFrame: Feature'lar eklenmiş veri seti
+        HourlySeries: y, hour ve RAW_COLUMNS'taki exogen kolonlar
     """
-    print("\n[*] Feature engineering yapılıyor...")
+    float_columns = RAW_COLUMNS[3:]
+    
+    sync_hourly_panel()
+    conn = get_read_connection()
+    
+    start_ts = date_to_ts(start_date) if start_date else 0
+    end_ts = date_to_ts(end_date) if end_date else 2**62
+    
+    conn.execute("BEGIN")
+    first_ts, last_ts = conn.execute(
+        "SELECT MIN(ts), MAX(ts) FROM hourly_panel WHERE ts >= ? AND ts < ?", (start_ts, end_ts)
+    ).fetchone()
+    n_hours = last_ts - first_ts + 1 if first_ts is not None else 0
+    first_ts = first_ts or 0
+    
+    present = np.zeros(n_hours, dtype=bool)
+    y = np.full(n_hours, np.nan, dtype=np.float64)
+    columns = {col: np.full(n_hours, np.nan, dtype=np.float32) for col in float_columns}
+    
+    cursor = conn.execute(
+        f"""
+        SELECT ts, price, {', '.join(float_columns)}
+        FROM hourly_panel
+        WHERE ts >= ? AND ts < ?
+        """,
+        (start_ts, end_ts)
+    )
     
-    df = df.copy()
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        # None (eksik değer) -> NaN
+        block = np.array(rows, dtype=np.float64)
+        pos = block[:, 0].astype(np.int64) - first_ts
+        present[pos] = True
+        y[pos] = block[:, 1]
+        for i, col in enumerate(float_columns):
+            columns[col][pos] = block[:, i + 2]
+    
+    conn.rollback()
+    
+    hour = ((first_ts + np.arange(n_hours, dtype=np.int64)) % 24).astype(np.int8)
+    data = {'y': y, 'hour': hour}
+    data.update(columns)
+    return HourlySeries(first_ts, data, present=present)
+
+
+def load_combined_data_compact(end_date=None, start_date=None, chunk_size=CHUNK_SIZE):
+    """
+    load_combined_data() ile aynı veri, düşük bellekli yükleme.
     
-    # ========================================
-    # 1. ZAMAN BAZLI FEATURE'LAR
-    # ========================================
+    load_hourly_series() ile okunur; boşluksuz aralıkta DataFrame kolonları
+    dizilerin kopyası değil kendisidir.
     
-    # Saat bilgisi (0-23)
-    df['hour'] = df['ds'].dt.hour
+    Args:
+        end_date (str, optional): Bu tarihe KADAR veri (dahil değil!)
+        start_date (str, optional): Bu tarihten İTİBAREN veri (dahil)
+        chunk_size (int): fetchmany parça boyutu
+        
+    Returns:
+        pd.DataFrame: RAW_COLUMNS yapısında, sıkıştırılmış dtype'larla
+    """
+    print("[*] Birleştirilmiş veri yükleniyor (streaming, compact dtype)...")
     
-    # Haftanın günü (0=Pazartesi, 6=Pazar)
-    df['day_of_week'] = df['ds'].dt.dayofweek
+    if end_date:
+        print(f"[*] Data leakage önleme: {end_date} tarihine KADAR veri kullanılacak")
     
-    # Hafta sonu mu?
-    df['is_weekend'] = (df['ds'].dt.dayofweek >= 5).astype(int)
+    series = load_hourly_series(end_date=end_date, start_date=start_date, chunk_size=chunk_size)
+    df = series.to_frame()
     
-    # Peak saat mi? (Sabah 8-10, Akşam 18-21)
-    df['is_peak_hour'] = df['hour'].isin([8, 9, 10, 18, 19, 20, 21]).astype(int)
+    print(f"[+] {len(df)} kayıt yüklendi ({df.memory_usage(deep=True).sum() / 1024**2:.1f} MB)")
+    if len(df) > 0:
+        print(f"[*] Tarih aralığı: {df['ds'].min()} -> {df['ds'].max()}")
     
-    # Gündüz mü? (Güneş var, 10:00-16:00)
-    df['is_daytime'] = df['hour'].isin(range(10, 16)).astype(int)
+    missing_consumption = int(df['consumption'].isna().sum())
+    missing_generation = int(df['generation_total'].isna().sum())
     
-    # Ayın günü
-    df['day_of_month'] = df['ds'].dt.day
+    if missing_consumption > 0:
+        print(f"[!] Uyarı: {missing_consumption} satırda consumption verisi eksik")
+    if missing_generation > 0:
+        print(f"[!] Uyarı: {missing_generation} satırda generation verisi eksik")
     
-    # Ay
-    df['month'] = df['ds'].dt.month
+    return df
+
+
+def _downcast_features(df):
+    """Zaman/bayrak kolonlarını int8'e, y dışındaki float kolonları float32'ye indirir (yerinde)"""
+    for col in df.columns:
+        if col in ('ds', 'y'):
+            continue
+        if col in INT8_COLUMNS:
+            df[col] = df[col].astype(np.int8)
+        elif df[col].dtype.kind == 'f' and df[col].dtype != np.float32:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def rolling_mean_std(values, window=ROLLING_WINDOW, state=None):
+    """
+    Her satır için son `window` değerin ortalaması ve standart sapması (ddof=1).
     
-    # ========================================
-    # 2. ARZ/TALEP BAZLI FEATURE'LAR
-    # ========================================
+    pandas rolling(window, min_periods=1) ile aynı semantik: ilk satırlarda
+    pencere kısmi, tek değerli pencerede std NaN.
     
-    # Eksik verileri doldur (forward fill + backward fill)
-    df['consumption'] = df['consumption'].fillna(method='ffill').fillna(method='bfill')
-    df['generation_total'] = df['generation_total'].fillna(method='ffill').fillna(method='bfill')
+    Değerlerin ve karelerinin kümülatif toplamlarından hesaplanır (pencere
+    toplamı = C[i] - C[i - window]); maliyet O(n). np.cumsum soldan sağa
+    sırayla topladığından, önceki kümülatif toplamlardan (state) devam eden
+    artımlı hesap toplu hesapla bit bit aynıdır.
     
+    Args:
+        values: Değer dizisi (NaN içermemeli)
+        window: Pencere uzunluğu
+        state (dict, optional): Önceki çağrının döndürdüğü durum; verilirse
+                                values o serinin devamıdır. Saklarken son
+                                en az `window` satır tutulmalıdır.
+        
+    Returns:
+        tuple: (mean, std, state) - state: {'sum', 'sumsq'} satır başına
+               kümülatif toplamlar (önceki durum + bu satırlar)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    prev_sum = np.asarray(state['sum'] if state else [], dtype=np.float64)
+    prev_sumsq = np.asarray(state['sumsq'] if state else [], dtype=np.float64)
+    
+    # Son kümülatif değerden devam (ilk eleman önceki toplam, sonra atılır)
+    carry = min(len(prev_sum), 1)
+    csum = np.cumsum(np.concatenate([prev_sum[-carry:][:carry], values]))[carry:]
+    csumsq = np.cumsum(np.concatenate([prev_sumsq[-carry:][:carry], values * values]))[carry:]
+    total_sum = np.concatenate([prev_sum, csum])
+    total_sumsq = np.concatenate([prev_sumsq, csumsq])
+    
+    # Pencere öncesindeki kümülatif değer C[i - window]; seri başından önceyse 0
+    position = np.arange(len(prev_sum), len(total_sum))
+    before = position - window
+    has_before = before >= 0
+    window_sum = csum - np.where(has_before, total_sum[np.maximum(before, 0)], 0.0)
+    window_sumsq = csumsq - np.where(has_before, total_sumsq[np.maximum(before, 0)], 0.0)
+    count = np.minimum(position + 1, window)
+    
+    mean = window_sum / count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Yuvarlama kaynaklı küçük negatif varyans 0'a kırpılır
+        var = np.maximum(window_sumsq - window_sum * mean, 0.0) / (count - 1)
+        std = np.where(count > 1, np.sqrt(var), np.nan)
+    
+    return mean, std, {'sum': total_sum, 'sumsq': total_sumsq}
+
+
+# ========================================
+# FEATURE TANIMLARI (feature_registry)
+# ========================================
+# Her feature bir kez tanımlanır; geçmiş (engineer_features) ve gelecek
+# (prepare_future_features) hesabı aynı tanımlardan yapılır.
+
+@register('_seasonal_profile', inputs=PROFILE_COLUMNS)
+def _seasonal_profile_table(ctx):
+    # Geçmişin ay x haftanın saati profili (kayıtlı profil artımlı güncellenir)
+    return get_profile(ctx.df)
+
+
+def _seasonal_profile(column):
+    """Gelecek değeri: geçmişin ay x haftanın saati ortalaması (seasonal_profile)"""
+    def future(ctx, history):
+        values = history['_seasonal_profile'].lookup(column, ctx['ds'])
+        return pd.Series(values, index=ctx.df.index, name=column)
+    return future
+
+
+def _ratio(numerator, denominator):
+    """Payda > 0 ise oran, değilse 0"""
+    return np.where(denominator > 0, numerator / denominator, 0)
+
+
+# 1. ZAMAN BAZLI FEATURE'LAR (calendar_table'dan, gelecekte de aynı hesap)
+
+@register('_calendar', raw=['ds'])
+def _calendar(ctx):
+    # ds -> takvim tablosu satır pozisyonları (tüm takvim kolonları paylaşır)
+    return calendar_positions(ctx['ds'])
+
+
+def _register_calendar_column(name):
+    """Takvim tablosundaki kolonu feature olarak tanımlar"""
+    def compute(ctx):
+        calendar, positions = ctx['_calendar']
+        return pd.Series(calendar[name][positions], index=ctx.df.index, name=name)
+    register(name, inputs=['_calendar'])(compute)
+
+
+for _col in [
+    'hour',             # Saat bilgisi (0-23)
+    'day_of_week',      # Haftanın günü (0=Pazartesi, 6=Pazar)
+    'is_weekend',
+    'is_peak_hour',     # Sabah 8-10, Akşam 18-21
+    'is_daytime',       # Güneş var, 10:00-16:00
+    'day_of_month',
+    'month',
+    'is_sunday',        # Prophet v2 regressor'ı (Pazar + öğle saati)
+    'is_midday',
+    'extreme_low_risk',
+    'is_holiday',       # Resmi tatil
+    'is_bayram',        # Ramazan/Kurban bloğu (arife + köprü dahil)
+    'is_bridge_day',
+    'days_to_holiday',
+]:
+    _register_calendar_column(_col)
+
+
+# 2. ARZ/TALEP BAZLI FEATURE'LAR (gelecekte mevsimsel profil)
+
+@register('consumption', raw=['consumption'], future=_seasonal_profile('consumption'))
+def _consumption(ctx):
+    # Eksik verileri doldur (forward fill + backward fill)
+    return ctx.raw('consumption').fillna(method='ffill').fillna(method='bfill')
+
+
+@register('generation_total', raw=['generation_total'], future=_seasonal_profile('generation_total'))
+def _generation_total(ctx):
+    return ctx.raw('generation_total').fillna(method='ffill').fillna(method='bfill')
+
+
+@register('supply_demand_gap', inputs=['generation_total', 'consumption'])
+def _supply_demand_gap(ctx):
     # Arz-talep farkı (pozitif = fazla üretim, negatif = fazla talep)
-    df['supply_demand_gap'] = df['generation_total'] - df['consumption']
-    
-    # ========================================
-    # 3. YENİLENEBİLİR ENERJİ FEATURE'LARI
-    # ========================================
-    
-    # Eksik değerleri doldur
-    for col in ['solar', 'wind', 'hydro', 'natural_gas', 'lignite']:
-        df[col] = df[col].fillna(0)
-    
+    return ctx['generation_total'] - ctx['consumption']
+
+
+# 3. YENİLENEBİLİR ENERJİ FEATURE'LARI
+
+def _register_filled_source(col):
+    """Eksik üretim kaynağı değerlerini 0 ile doldurur"""
+    register(col, raw=[col])(lambda ctx: ctx.raw(col).fillna(0))
+
+
+for _col in ['solar', 'wind', 'hydro', 'natural_gas', 'lignite']:
+    _register_filled_source(_col)
+
+
+@register('renewable', inputs=['solar', 'wind'], future=_seasonal_profile('renewable'))
+def _renewable(ctx):
     # Yenilenebilir üretim (güneş + rüzgar)
-    df['renewable'] = df['solar'] + df['wind']
-    
+    return ctx['solar'] + ctx['wind']
+
+
+@register('renewable_ratio', inputs=['renewable', 'generation_total'],
+          future=_seasonal_profile('renewable_ratio'))
+def _renewable_ratio(ctx):
     # Yenilenebilir oranı (0-1 arası)
-    df['renewable_ratio'] = np.where(
-        df['generation_total'] > 0,
-        df['renewable'] / df['generation_total'],
-        0
-    )
-    
+    return _ratio(ctx['renewable'], ctx['generation_total'])
+
+
+@register('fossil', inputs=['natural_gas', 'lignite'], future=_seasonal_profile('fossil'))
+def _fossil(ctx):
     # Fosil yakıt üretimi (doğalgaz + linyit)
-    df['fossil'] = df['natural_gas'] + df['lignite']
-    
-    # Fosil oranı (0-1 arası)
-    df['fossil_ratio'] = np.where(
-        df['generation_total'] > 0,
-        df['fossil'] / df['generation_total'],
-        0
-    )
-    
-    # Hidroelektrik oranı
-    df['hydro_ratio'] = np.where(
-        df['generation_total'] > 0,
-        df['hydro'] / df['generation_total'],
-        0
+    return ctx['natural_gas'] + ctx['lignite']
+
+
+@register('fossil_ratio', inputs=['fossil', 'generation_total'],
+          future=_seasonal_profile('fossil_ratio'))
+def _fossil_ratio(ctx):
+    return _ratio(ctx['fossil'], ctx['generation_total'])
+
+
+@register('hydro_ratio', inputs=['hydro', 'generation_total'],
+          future=_seasonal_profile('hydro_ratio'))
+def _hydro_ratio(ctx):
+    return _ratio(ctx['hydro'], ctx['generation_total'])
+
+
+# 4. LAG FEATURE'LAR (gelecekte son bilinen değerler)
+
+@register('price_lag_1h', raw=['y'], lookback=1,
+          future=lambda ctx, history: history['y'].iloc[-1])
+def _price_lag_1h(ctx):
+    # 1 saat önceki fiyat
+    return ctx['y'].shift(1)
+
+
+@register('price_lag_24h', raw=['y'], lookback=24,
+          future=lambda ctx, history: history['y'].tail(24).mean())
+def _price_lag_24h(ctx):
+    # 24 saat önceki fiyat (dünün aynı saati)
+    return ctx['y'].shift(24)
+
+
+@register('price_lag_168h', raw=['y'], lookback=168,
+          future=lambda ctx, history: history['y'].tail(168).mean())
+def _price_lag_168h(ctx):
+    # 168 saat önceki fiyat (geçen haftanın aynı saati)
+    return ctx['y'].shift(168)
+
+
+@register('_price_rolling_24h', raw=['y'], lookback=ROLLING_WINDOW - 1)
+def _price_rolling_stats(ctx):
+    # Ortalama ve std tek geçişte hesaplanır, iki feature paylaşır.
+    # Kümülatif toplamlar ctx.state'ten devam eder; artımlı modda durumun
+    # zaten kapsadığı bağlam satırları (state_rows) yeniden toplanmaz
+    skip = ctx.state_rows if '_price_rolling_24h' in ctx.state else 0
+    mean, std, ctx.state['_price_rolling_24h'] = rolling_mean_std(
+        ctx['y'].values[skip:], ROLLING_WINDOW, ctx.state.get('_price_rolling_24h')
     )
+    lead = np.full(skip, np.nan)
+    return np.concatenate([lead, mean]), np.concatenate([lead, std])
+
+
+@register('price_rolling_24h', inputs=['_price_rolling_24h'],
+          future=lambda ctx, history: history['y'].tail(24).mean())
+def _price_rolling_24h(ctx):
+    # 24 saatlik hareketli ortalama
+    return ctx['_price_rolling_24h'][0]
+
+
+@register('price_std_24h', inputs=['_price_rolling_24h'],
+          future=lambda ctx, history: history['y'].tail(24).std())
+def _price_std_24h(ctx):
+    # 24 saatlik standart sapma (volatilite)
+    return ctx['_price_rolling_24h'][1]
+
+
+@register('consumption_lag_24h', inputs=['consumption'], lookback=24,
+          future=lambda ctx, history: history['consumption'].tail(24).mean())
+def _consumption_lag_24h(ctx):
+    return ctx['consumption'].shift(24)
+
+
+# engineer_features() varsayılan çıktısı (kolon sırası bu sıradır)
+FEATURE_COLUMNS = [
+    'hour', 'day_of_week', 'is_weekend', 'is_peak_hour', 'is_daytime',
+    'day_of_month', 'month',
+    'consumption', 'generation_total', 'supply_demand_gap',
+    'solar', 'wind', 'hydro', 'natural_gas', 'lignite',
+    'renewable', 'renewable_ratio', 'fossil', 'fossil_ratio', 'hydro_ratio',
+    'price_lag_1h', 'price_lag_24h', 'price_lag_168h',
+    'price_rolling_24h', 'price_std_24h', 'consumption_lag_24h',
+]
+
+# prepare_future_features() çıktısı
+FUTURE_COLUMNS = [
+    'hour', 'day_of_week', 'is_weekend', 'is_peak_hour', 'is_daytime',
+    'day_of_month', 'month',
+    'consumption', 'generation_total', 'supply_demand_gap',
+    'renewable_ratio', 'fossil_ratio', 'hydro_ratio', 'renewable', 'fossil',
+    'price_lag_1h', 'price_lag_24h', 'price_lag_168h',
+    'price_rolling_24h', 'price_std_24h', 'consumption_lag_24h',
+]
+
+# Lag feature'lar için gereken en uzun geçmiş (price_lag_168h -> 168)
+MAX_LAG_HOURS = required_lookback(FEATURE_COLUMNS)
+
+
+def _build_features(df, state=None, state_rows=0):
+    """
+    FEATURE_COLUMNS kolonlarını df üzerinde (yerinde) hesaplar.
     
-    # ========================================
-    # 4. LAG FEATURE'LAR (GEÇMİŞ DEĞERLER)
-    # ========================================
-    
-    # 1 saat önceki fiyat
-    df['price_lag_1h'] = df['y'].shift(1)
+    engineer_features() ve engineer_features_incremental() ortak çekirdeği.
+    Satır silme (lag NaN temizliği) burada yapılmaz.
+    """
+    return FeatureFrame(df, state=state, state_rows=state_rows).materialize(FEATURE_COLUMNS)
+
+
+def add_features(df, columns, history=None):
+    """
+    df'nin kopyasına sadece istenen feature'ları (ve bağımlılıklarını) ekler.
     
-    # 24 saat önceki fiyat (dünün aynı saati)
-    df['price_lag_24h'] = df['y'].shift(24)
+    Args:
+        df: ds kolonlu DataFrame (geçmiş ham veri veya gelecek tarihler)
+        columns (list): Feature isimleri (örn. list(model.extra_regressors))
+        history (pd.DataFrame, optional): Verilirse gelecek modu; lag ve
+                                          arz/talep feature'ları bu engineer
+                                          edilmiş geçmişten türetilir
     
-    # 168 saat önceki fiyat (geçen haftanın aynı saati)
-    df['price_lag_168h'] = df['y'].shift(168)
+    Returns:
+        pd.DataFrame: Feature'lar eklenmiş kopya
+    """
+    history = FeatureFrame(history, precomputed=True) if history is not None else None
+    return FeatureFrame(df.copy(), history=history).materialize(list(columns))
+
+
+def engineer_features(df, compact=False, columns=None, state=None):
+    """
+    Ham veriden feature'lar oluşturur.
     
-    # 24 saatlik hareketli ortalama
-    df['price_rolling_24h'] = df['y'].rolling(window=24, min_periods=1).mean()
+    Prophet ve XGBoost için ortak feature engineering.
     
-    # 24 saatlik standart sapma (volatilite)
-    df['price_std_24h'] = df['y'].rolling(window=24, min_periods=1).std()
+    Args:
+        df: load_combined_data() çıktısı
+        compact (bool): Düşük bellek modu (load_combined_data_compact ile birlikte).
+                        df kopyalanmadan yerinde işlenir, zaman/bayrak kolonları
+                        int8, y dışındaki float kolonlar float32 döner.
+        columns (list, optional): Sadece bu feature'ları hesapla (bağımlılıklarıyla).
+                                  Verilirse çıktı ds, y + bu kolonlardan oluşur.
+                                  None ise FEATURE_COLUMNS (ham kolonlarla birlikte).
+        state (dict, optional): Verilirse durumlu feature'ların (rolling
+                                kümülatif toplamları) son durumu buraya
+                                yazılır; engineer_features_incremental'a
+                                verilerek devam edilir.
+        
+    Returns:
+        pd.DataFrame: Feature'lar eklenmiş veri seti
+    """
+    print("\n[*] Feature engineering yapılıyor...")
     
-    # Consumption lag
-    df['consumption_lag_24h'] = df['consumption'].shift(24)
+    if columns is None:
+        df = _build_features(df if compact else df.copy(), state=state)
+        warmup = df['price_lag_168h']
+    else:
+        ctx = FeatureFrame(df, state=state)
+        df = ctx.materialize(list(columns), out=df[['ds', 'y']].copy())
+        warmup = ctx['price_lag_168h']
     
     # ========================================
-    # 5. İLK SATIRLARI TEMİZLE (LAG'DAN DOLAYI NaN)
+    # İLK SATIRLARI TEMİZLE (LAG'DAN DOLAYI NaN)
     # ========================================
     
     # İlk 168 satırı (1 hafta) at çünkü lag feature'lar NaN olacak
+    # (seçili kolonlarda da aynı satırlar atılır, modeller aynı aralıkta eğitilir)
     initial_rows = len(df)
-    df = df.dropna(subset=['price_lag_168h'])
+    valid = warmup.notna().to_numpy()
+    if compact:
+        _downcast_features(df)
+        first = int(valid.argmax()) if valid.any() else len(df)
+        # NaN'lar sadece baştaysa kopya yerine dilim al
+        df = df.iloc[first:] if valid[first:].all() else df[valid]
+    else:
+        df = df[valid]
     dropped_rows = initial_rows - len(df)
     
     print(f"\n[+] Feature'lar oluşturuldu:")
-    print(f"   - Zaman bazlı: hour, day_of_week, is_weekend, is_peak_hour, is_daytime")
-    print(f"   - Arz/Talep: consumption, generation_total, supply_demand_gap")
-    print(f"   - Yenilenebilir: renewable, renewable_ratio, fossil, fossil_ratio")
-    print(f"   - Lag: price_lag_1h, price_lag_24h, price_lag_168h, price_rolling_24h")
+    if columns is None:
+        print(f"   - Zaman bazlı: hour, day_of_week, is_weekend, is_peak_hour, is_daytime")
+        print(f"   - Arz/Talep: consumption, generation_total, supply_demand_gap")
+        print(f"   - Yenilenebilir: renewable, renewable_ratio, fossil, fossil_ratio")
+        print(f"   - Lag: price_lag_1h, price_lag_24h, price_lag_168h, price_rolling_24h")
+    else:
+        print(f"   - Seçili: {', '.join(columns)}")
     print(f"   - {dropped_rows} satır lag nedeniyle silindi (ilk 1 hafta)")
     print(f"   - Final veri seti: {len(df)} satır")
     
     return df
 
 
+def engineer_features_incremental(history, new_raw, state=None):
+    """
+    Sadece yeni satırlar için feature hesaplar (artımlı mod).
+    
+    Tüm geçmişi yeniden işlemek yerine önceki engineer edilmiş verinin
+    son MAX_LAG_HOURS (168) satırı durum olarak kullanılır:
+    - Lag'lar (1h, 24h, 168h) bu durumdan okunur
+    - Rolling 24h ortalama/std kümülatif toplamları state'ten devam eder
+      (state yoksa pencereler bağlamdaki son 23 saatle tamamlanır)
+    - consumption/generation_total forward-fill son bilinen değerden devam eder
+    
+    Sonuç, engineer_features(tüm ham veri) çıktısının yeni satırlarıyla aynıdır
+    (state verilmezse rolling kolonları kayan nokta yuvarlaması kadar farklı
+    olabilir). Maliyet O(yeni satır).
+    
+    Args:
+        history: Önceki engineer_features() çıktısı (veya son 168 satırı)
+        new_raw: Yeni ham satırlar (load_combined_data() formatında, history'den sonra)
+        state (dict, optional): history sonundaki durum (engineer_features veya
+                                önceki çağrıdan); yerinde güncellenir
+        
+    Returns:
+        pd.DataFrame: Sadece yeni satırlar için feature'lar
+    """
+    context = history[RAW_COLUMNS].tail(MAX_LAG_HOURS)
+    
+    if len(context) < MAX_LAG_HOURS:
+        # Yeterli geçmiş yok -> toplu moda düş (durum history başından yeniden kurulur)
+        if state is not None:
+            state.clear()
+        combined = pd.concat([history[RAW_COLUMNS], new_raw[RAW_COLUMNS]], ignore_index=True)
+        df = engineer_features(combined, state=state)
+        return df[df['ds'] > history['ds'].max()] if len(history) > 0 else df
+    
+    # Durum bağlamın sonundadır: bağlam satırları durumlu feature'larda atlanır
+    combined = pd.concat([context, new_raw[RAW_COLUMNS]], ignore_index=True)
+    df = _build_features(combined, state=state, state_rows=len(context))
+    
+    return df.iloc[len(context):].reset_index(drop=True)
+
+
 def get_prophet_features():
     """Prophet modeli için kullanılacak regressor listesi"""
     return [
@@ -282,6 +681,11 @@ def prepare_future_features(df, future_dates):
     Prophet predict() için future dataframe'e feature ekleme.
     XGBoost için de tüm gerekli feature'ları oluşturur.
     
+    Zaman feature'ları geçmişle aynı tanımdan; arz/talep feature'ları
+    geçmişin ay x haftanın saati profilinden (seasonal_profile, önbellekli);
+    lag feature'lar son bilinen değerlerden türetilir (feature_registry
+    future tanımları).
+    
     Args:
         df: Mevcut veri seti (son değerleri almak için)
         future_dates: Prophet'in oluşturduğu future dataframe
@@ -289,54 +693,7 @@ def prepare_future_features(df, future_dates):
     Returns:
         pd.DataFrame: Feature'lar eklenmiş future dataframe
     """
-    future = future_dates.copy()
-    
-    # ========================================
-    # 1. ZAMAN BAZLI FEATURE'LAR
-    # ========================================
-    future['hour'] = future['ds'].dt.hour
-    future['day_of_week'] = future['ds'].dt.dayofweek
-    future['is_weekend'] = (future['ds'].dt.dayofweek >= 5).astype(int)
-    future['is_peak_hour'] = future['hour'].isin([8, 9, 10, 18, 19, 20, 21]).astype(int)
-    future['is_daytime'] = future['hour'].isin(range(10, 16)).astype(int)
-    future['day_of_month'] = future['ds'].dt.day
-    future['month'] = future['ds'].dt.month
-    
-    # ========================================
-    # 2. ARZ/TALEP FEATURE'LAR (saatlik ortalama kullan)
-    # ========================================
-    hourly_avg_consumption = df.groupby('hour')['consumption'].mean()
-    hourly_avg_generation = df.groupby('hour')['generation_total'].mean()
-    hourly_avg_renewable_ratio = df.groupby('hour')['renewable_ratio'].mean()
-    hourly_avg_fossil_ratio = df.groupby('hour')['fossil_ratio'].mean()
-    hourly_avg_hydro_ratio = df.groupby('hour')['hydro_ratio'].mean()
-    hourly_avg_renewable = df.groupby('hour')['renewable'].mean()
-    hourly_avg_fossil = df.groupby('hour')['fossil'].mean()
-    
-    future['consumption'] = future['hour'].map(hourly_avg_consumption)
-    future['generation_total'] = future['hour'].map(hourly_avg_generation)
-    future['supply_demand_gap'] = future['generation_total'] - future['consumption']
-    future['renewable_ratio'] = future['hour'].map(hourly_avg_renewable_ratio)
-    future['fossil_ratio'] = future['hour'].map(hourly_avg_fossil_ratio)
-    future['hydro_ratio'] = future['hour'].map(hourly_avg_hydro_ratio)
-    future['renewable'] = future['hour'].map(hourly_avg_renewable)
-    future['fossil'] = future['hour'].map(hourly_avg_fossil)
-    
-    # ========================================
-    # 3. LAG FEATURE'LAR (son bilinen değerler)
-    # ========================================
-    last_price = df['y'].iloc[-1]
-    last_24h_prices = df['y'].tail(24)
-    last_168h_prices = df['y'].tail(168)
-    
-    future['price_lag_1h'] = last_price
-    future['price_lag_24h'] = last_24h_prices.mean()
-    future['price_lag_168h'] = last_168h_prices.mean()
-    future['price_rolling_24h'] = last_24h_prices.mean()
-    future['price_std_24h'] = last_24h_prices.std()
-    future['consumption_lag_24h'] = df['consumption'].tail(24).mean()
-    
-    return future
+    return add_features(future_dates, FUTURE_COLUMNS, history=df)
 
 
 def train_test_split_timeseries(df, test_days=30):
@@ -4,7 +4,6 @@
 Eksik Veri Toplama - 17-22 Ekim 2025 arası
 """
 
-import sqlite3
 import os
 import sys
 import requests
@@ -12,10 +11,10 @@ from datetime import datetime, timedelta
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection, run_write
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection, run_write
 API_BASE = "https://seffaflik.epias.com.tr/electricity-service/v1"
 
 def get_tgt():
@@ -80,44 +79,45 @@ def insert_mcp_data(records):
         print("[!] Eklenecek veri yok")
         return 0
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    def insert_records(conn):
+        cursor = conn.cursor()
 
-    inserted = 0
-    skipped = 0
+        inserted = 0
+        skipped = 0
 
-    for record in records:
-        date = record.get('date')
-        price = record.get('price')
+        for record in records:
+            date = record.get('date')
+            price = record.get('price')
 
-        if not date or price is None:
-            continue
+            if not date or price is None:
+                continue
 
-        # Tarih formatini duzenle (ISO 8601 -> SQLite format)
-        try:
-            dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-            date_str = dt.strftime('%Y-%m-%d %H:%M:%S')
-        except:
-            print(f"[!] Gecersiz tarih: {date}")
-            continue
+            # Tarih formatini duzenle (ISO 8601 -> SQLite format)
+            try:
+                dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
+                date_str = dt.strftime('%Y-%m-%d %H:%M:%S')
+            except:
+                print(f"[!] Gecersiz tarih: {date}")
+                continue
 
-        # Kontrol et: Bu kayit zaten var mi?
-        cursor.execute("SELECT COUNT(*) FROM mcp_data WHERE date = ?", (date_str,))
-        exists = cursor.fetchone()[0]
+            # Kontrol et: Bu kayit zaten var mi?
+            cursor.execute("SELECT COUNT(*) FROM mcp_data WHERE date = ?", (date_str,))
+            exists = cursor.fetchone()[0]
 
-        if exists > 0:
-            skipped += 1
-            continue
+            if exists > 0:
+                skipped += 1
+                continue
 
-        # Ekle
-        cursor.execute("""
-            INSERT INTO mcp_data (date, price)
-            VALUES (?, ?)
-        """, (date_str, price))
-        inserted += 1
+            # Ekle
+            cursor.execute("""
+                INSERT INTO mcp_data (date, price)
+                VALUES (?, ?)
+            """, (date_str, price))
+            inserted += 1
 
-    conn.commit()
-    conn.close()
+        return inserted, skipped
+
+    inserted, skipped = run_write(insert_records)
 
     print(f"[+] {inserted} yeni kayit eklendi")
     print(f"[*] {skipped} kayit zaten mevcut")
@@ -159,16 +159,13 @@ def main():
     print(f"Mevcut     : {len(records) - inserted}")
 
     # Veritabani durumu
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    cursor = get_read_connection().cursor()
     cursor.execute("SELECT COUNT(*) FROM mcp_data")
     total = cursor.fetchone()[0]
 
     cursor.execute("SELECT MIN(date), MAX(date) FROM mcp_data")
     min_date, max_date = cursor.fetchone()
 
-    conn.close()
-
     print(f"\nVeritabani Durumu:")
     print(f"  Toplam kayit: {total}")
     print(f"  Tarih araligi: {min_date} - {max_date}")
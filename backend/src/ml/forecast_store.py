@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Forecast Store - forecast_history / weekly_performance Toplu Yazma
+===================================================================
+
+Tahmin, gerçek değer ve performans kayıtlarını satır satır (iterrows)
+yazmak yerine toplu yazar:
+- Tarih kolonları tek vektör işlemle string'e çevrilir
+- Tahminler executemany ile eklenir (INSERT ... ON CONFLICT)
+- Gerçek değer / bileşen güncellemeleri geçici staging tablosuna
+  executemany ile yazılır, tek UPDATE ... FROM ile uygulanır
+- Her işlem tek transaction'dır (db_config.run_write, SQLITE_BUSY retry)
+
+predict.save_forecast_to_db, simple_weekly_forecast, compare_forecasts ve
+scripts/backfill_components bu modülü kullanır.
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Database path configuration
+try:
+    from db_config import run_write
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import run_write
+
+
+# Tahmin DataFrame'inde opsiyonel olan model bileşen kolonları
+COMPONENT_COLUMNS = ['prophet_component', 'xgboost_component', 'lstm_component']
+
+INSERT_FORECAST_SQL = """
+    INSERT INTO forecast_history (
+        week_start, week_end, forecast_datetime, predicted_price,
+        prophet_component, xgboost_component, lstm_component
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(week_start, forecast_datetime) DO UPDATE SET
+        week_end = excluded.week_end,
+        predicted_price = excluded.predicted_price,
+        prophet_component = excluded.prophet_component,
+        xgboost_component = excluded.xgboost_component,
+        lstm_component = excluded.lstm_component,
+        actual_price = NULL,
+        absolute_error = NULL,
+        percentage_error = NULL
+"""
+
+UPSERT_PERFORMANCE_SQL = """
+    INSERT INTO weekly_performance (week_start, week_end, mape, mae, rmse, total_predictions)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(week_start) DO UPDATE SET
+        week_end = excluded.week_end,
+        mape = excluded.mape,
+        mae = excluded.mae,
+        rmse = excluded.rmse,
+        total_predictions = excluded.total_predictions
+"""
+
+
+def format_datetimes(values):
+    """
+    datetime dizisini 'YYYY-MM-DD HH:MM:SS' string listesine çevirir (vektörel).
+
+    Timezone varsa yerel saat korunarak atılır (Timestamp.strftime ile aynı sonuç).
+    """
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    strings = np.datetime_as_string(index.values, unit='s')
+    return np.char.replace(strings, 'T', ' ').tolist()
+
+
+def _float_list(values):
+    """Sayısal diziyi Python float listesine çevirir (NaN -> NULL)"""
+    values = np.asarray(values, dtype=np.float64)
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def save_week_forecasts(forecast, week_start, week_end, replace_week=True):
+    """
+    Bir haftanın tahminlerini forecast_history tablosuna toplu yazar.
+
+    Args:
+        forecast: ds + yhat (veya predicted_price) kolonlu DataFrame;
+                  prophet/xgboost/lstm_component kolonları opsiyonel
+        week_start (str): Haftanın başlangıcı (Pazartesi) - 'YYYY-MM-DD'
+        week_end (str): Haftanın bitişi (Pazar) - 'YYYY-MM-DD'
+        replace_week (bool): True ise haftanın eski kayıtları önce silinir;
+                             False ise sadece aynı saatler üzerine yazılır
+
+    Returns:
+        int: Yazılan kayıt sayısı
+    """
+    n_rows = len(forecast)
+
+    if 'yhat' in forecast:
+        predicted = _float_list(forecast['yhat'])
+    elif 'predicted_price' in forecast:
+        predicted = _float_list(forecast['predicted_price'])
+    else:
+        predicted = [0.0] * n_rows
+
+    components = [
+        _float_list(forecast[col]) if col in forecast else [None] * n_rows
+        for col in COMPONENT_COLUMNS
+    ]
+
+    rows = list(zip(
+        [week_start] * n_rows,
+        [week_end] * n_rows,
+        format_datetimes(forecast['ds']),
+        predicted,
+        *components
+    ))
+
+    def write(conn):
+        if replace_week:
+            conn.execute("DELETE FROM forecast_history WHERE week_start = ?", (week_start,))
+        conn.executemany(INSERT_FORECAST_SQL, rows)
+
+    # Silme + ekleme tek transaction'da (okuyucular yarım hafta görmez)
+    run_write(write)
+    return len(rows)
+
+
+def save_week_actuals(week_start, forecast_datetimes, actual_prices,
+                      absolute_errors, percentage_errors, performance=None):
+    """
+    Bir haftanın gerçek değer/hata kolonlarını günceller, istenirse
+    weekly_performance kaydını da aynı transaction'da yazar.
+
+    Güncellemeler TEMP staging tablosuna executemany ile yazılır ve
+    tek bir UPDATE ... FROM ile forecast_history'ye uygulanır.
+
+    Args:
+        week_start (str): Haftanın başlangıcı (Pazartesi)
+        forecast_datetimes: forecast_history.forecast_datetime değerleri (DB'deki string)
+        actual_prices, absolute_errors, percentage_errors: Aynı uzunlukta diziler
+        performance (dict, optional): week_end, mape, mae, rmse, total_predictions
+
+    Returns:
+        int: Güncellenen satır sayısı
+    """
+    rows = list(zip(
+        [str(dt) for dt in forecast_datetimes],
+        _float_list(actual_prices),
+        _float_list(absolute_errors),
+        _float_list(percentage_errors)
+    ))
+
+    def write(conn):
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS staging_actuals (
+                forecast_datetime TEXT PRIMARY KEY,
+                actual_price REAL,
+                absolute_error REAL,
+                percentage_error REAL
+            )
+        """)
+        conn.execute("DELETE FROM staging_actuals")
+        conn.executemany("INSERT OR REPLACE INTO staging_actuals VALUES (?, ?, ?, ?)", rows)
+
+        updated = conn.execute("""
+            UPDATE forecast_history
+            SET actual_price = s.actual_price,
+                absolute_error = s.absolute_error,
+                percentage_error = s.percentage_error
+            FROM staging_actuals AS s
+            WHERE forecast_history.week_start = ?
+              AND forecast_history.forecast_datetime = s.forecast_datetime
+        """, (week_start,)).rowcount
+        conn.execute("DELETE FROM staging_actuals")
+
+        if performance is not None:
+            conn.execute(UPSERT_PERFORMANCE_SQL, (
+                week_start,
+                performance['week_end'],
+                float(performance['mape']),
+                float(performance['mae']),
+                float(performance['rmse']),
+                int(performance['total_predictions'])
+            ))
+        return updated
+
+    return run_write(write)
+
+
+def update_forecast_components(forecast_ids, prophet, xgboost, lstm):
+    """
+    Mevcut forecast_history kayıtlarının model bileşenlerini id bazında günceller.
+
+    Args:
+        forecast_ids: forecast_history.id değerleri
+        prophet, xgboost, lstm: Aynı uzunlukta bileşen dizileri
+
+    Returns:
+        int: Güncellenen satır sayısı
+    """
+    rows = list(zip(
+        [int(i) for i in forecast_ids],
+        _float_list(prophet),
+        _float_list(xgboost),
+        _float_list(lstm)
+    ))
+
+    def write(conn):
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS staging_components (
+                id INTEGER PRIMARY KEY,
+                prophet_component REAL,
+                xgboost_component REAL,
+                lstm_component REAL
+            )
+        """)
+        conn.execute("DELETE FROM staging_components")
+        conn.executemany("INSERT OR REPLACE INTO staging_components VALUES (?, ?, ?, ?)", rows)
+
+        updated = conn.execute("""
+            UPDATE forecast_history
+            SET prophet_component = s.prophet_component,
+                xgboost_component = s.xgboost_component,
+                lstm_component = s.lstm_component
+            FROM staging_components AS s
+            WHERE forecast_history.id = s.id
+        """).rowcount
+        conn.execute("DELETE FROM staging_components")
+        return updated
+
+    return run_write(write)
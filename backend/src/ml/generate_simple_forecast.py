@@ -5,7 +5,6 @@ Basit Forecast JSON - Ham verilerden tahmin oluştur
 """
 
 import pandas as pd
-import sqlite3
 import json
 import os
 import sys
@@ -13,10 +12,13 @@ from datetime import datetime, timedelta
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
+
+from forecast_store import format_datetimes
+
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '../../public/forecasts.json')
 
 def main():
@@ -38,38 +40,34 @@ def main():
 
     print(f"\n[*] Bu hafta: {week_start} - {week_end}")
 
-    # Tahminleri listeye çevir
-    forecasts = []
-    for _, row in forecast_df.iterrows():
-        forecasts.append({
-            'datetime': row['ds'].strftime('%Y-%m-%d %H:%M:%S'),
-            'predicted': round(row['yhat'], 2),
-            'lower_bound': round(row['yhat_lower'], 2),
-            'upper_bound': round(row['yhat_upper'], 2),
-            'actual': None
-        })
+    # Tahminleri listeye çevir (tarih formatlama ve yuvarlama vektörel)
+    forecasts = pd.DataFrame({
+        'datetime': format_datetimes(forecast_df['ds']),
+        'predicted': forecast_df['yhat'].round(2).values,
+        'lower_bound': forecast_df['yhat_lower'].round(2).values,
+        'upper_bound': forecast_df['yhat_upper'].round(2).values,
+        'actual': None
+    }).to_dict('records')
 
     # Gerçek verileri ekle (varsa)
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
     actual_query = """
         SELECT date, price
         FROM mcp_data
         ORDER BY date DESC
     """
     actual_df = pd.read_sql_query(actual_query, conn)
-    conn.close()
 
     if len(actual_df) > 0:
         print(f"[+] {len(actual_df)} gerçek veri bulundu")
 
         # Son 7 günlük gerçek veriyi ekle
-        recent_actuals = []
-        for _, row in actual_df.head(168).iterrows():  # 7 gün * 24 saat
-            recent_actuals.append({
-                'datetime': row['date'],
-                'predicted': None,
-                'actual': round(row['price'], 2)
-            })
+        recent = actual_df.head(168)  # 7 gün * 24 saat
+        recent_actuals = pd.DataFrame({
+            'datetime': recent['date'].values,
+            'predicted': None,
+            'actual': recent['price'].round(2).values
+        }).to_dict('records')
 
         # Gerçek verileri forecasts'ın başına ekle
         forecasts = recent_actuals + forecasts
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Hourly Panel - Saatlik Birleşik Veri Tablosu
+=============================================
+
+mcp_data, consumption_data ve generation_data tablolarını tek satırda
+birleştiren `hourly_panel` tablosunu yönetir.
+
+- Anahtar: ts (INTEGER) = yerel saat (TRT) bazlı epoch-saat
+  (tarih + saat kolonundan hesaplanır, pd.to_datetime(ts * 3600, unit='s')
+  ile features.py'deki timezone'suz ds değerine birebir döner)
+- Insert sırasında backend/src/services/database.ts tarafından artımlı
+  güncellenir; bu modül eski/eksik panelleri Python tarafında tamamlar.
+- features.load_combined_data ve validate_extreme_prices bu tablodan
+  DATE() JOIN'i olmadan düz range scan ile okur. Okuma yolları paneli
+  sync_hourly_panel() ile süreç başına bir kez, run_write'ın meşgul
+  yeniden denemesi içinde tamamlar.
+"""
+
+import os
+import sys
+import pandas as pd
+
+# Database path configuration
+try:
+    from db_config import get_write_connection, run_write
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import get_write_connection, run_write
+
+
+# Generation tablosundaki tüm kaynak kolonları
+GENERATION_SOURCES = [
+    'biomass', 'fueloil', 'geothermal', 'hydro', 'import_export', 'lignite',
+    'lng', 'natural_gas', 'naphtha', 'river', 'solar', 'wind', 'wasteheat',
+    'asphaltite_coal', 'black_coal', 'import_coal',
+]
+
+CREATE_PANEL_SQL = f"""
+    CREATE TABLE IF NOT EXISTS hourly_panel (
+        ts INTEGER PRIMARY KEY,
+        date TEXT NOT NULL,
+        price REAL NOT NULL,
+        price_usd REAL,
+        price_eur REAL,
+        consumption REAL,
+        generation_total REAL,
+        {', '.join(f'{col} REAL' for col in GENERATION_SOURCES)}
+    )
+"""
+
+REFRESH_PANEL_SQL = f"""
+    INSERT OR REPLACE INTO hourly_panel (
+        ts, date, price, price_usd, price_eur, consumption, generation_total,
+        {', '.join(GENERATION_SOURCES)}
+    )
+    SELECT
+        CAST(strftime('%s', substr(m.date, 1, 10)) AS INTEGER) / 3600
+            + CAST(substr(m.hour, 1, 2) AS INTEGER),
+        m.date, m.price, m.price_usd, m.price_eur, c.consumption, g.total,
+        {', '.join(f'g.{col}' for col in GENERATION_SOURCES)}
+    FROM mcp_data m
+    LEFT JOIN consumption_data c ON c.date = m.date AND c.hour = m.hour
+    LEFT JOIN generation_data g ON g.date = m.date AND g.hour = m.hour
+    WHERE m.date >= ?
+"""
+
+
+def date_to_ts(value):
+    """
+    Tarih string'ini/Timestamp'i panel anahtarına (epoch-saat) çevirir.
+
+    Args:
+        value: 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS' veya pd.Timestamp
+               (timezone varsa yerel saat korunarak atılır)
+
+    Returns:
+        int: Epoch-saat
+    """
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return int(ts.value // 3_600_000_000_000)
+
+
+def ts_to_datetime(ts):
+    """Epoch-saat (int veya array) -> timezone'suz datetime"""
+    return pd.to_datetime(ts * 3600, unit='s')
+
+
+def refresh_hourly_panel(conn, from_date=None):
+    """
+    hourly_panel'i from_date gününden itibaren yeniden hesaplar.
+
+    Commit etmez: çağıranın transaction'ı içinde çalışır (run_write'ın
+    BEGIN IMMEDIATE'i yarıda bitmesin diye commit'i çağıran yapar).
+
+    Args:
+        conn: sqlite3 bağlantısı
+        from_date (str, optional): Başlangıç günü (YYYY-MM-DD). None ise tamamı.
+
+    Returns:
+        int: Yazılan satır sayısı
+    """
+    start = from_date[:10] if from_date else '0000-00-00'
+    cursor = conn.execute(REFRESH_PANEL_SQL, (start,))
+    return cursor.rowcount
+
+
+def ensure_hourly_panel(conn):
+    """
+    Panelin var ve güncel olduğundan emin olur.
+
+    - Tablo yoksa oluşturur ve tüm veriden doldurur
+    - Varsa son günden itibaren artımlı günceller (geç gelen tüketim/üretim dahil)
+    - Satır sayısı mcp_data ile hâlâ uyuşmuyorsa (geçmiş revizyon) tamamen yeniler
+    """
+    conn.execute(CREATE_PANEL_SQL)
+
+    last_date = conn.execute("SELECT MAX(date) FROM hourly_panel").fetchone()[0]
+    if last_date is None:
+        print("[*] hourly_panel oluşturuluyor (ilk kez)...")
+        written = refresh_hourly_panel(conn)
+        print(f"[+] hourly_panel: {written} satır yazıldı")
+        return
+
+    refresh_hourly_panel(conn, from_date=last_date)
+
+    mcp_count = conn.execute("SELECT COUNT(*) FROM mcp_data").fetchone()[0]
+    panel_count = conn.execute("SELECT COUNT(*) FROM hourly_panel").fetchone()[0]
+    if mcp_count != panel_count:
+        print(f"[!] hourly_panel senkron değil ({panel_count} / {mcp_count}), yeniden oluşturuluyor...")
+        conn.execute("DELETE FROM hourly_panel")
+        refresh_hourly_panel(conn)
+
+
+# Bu süreçte panel senkronlandı mı? (okuma yolları için)
+_panel_synced = False
+
+
+def sync_hourly_panel():
+    """
+    Okuma yolları için: ensure_hourly_panel'i süreç başına bir kez
+    run_write içinde çalıştırır (yazma kilidi BEGIN IMMEDIATE ile alınır,
+    SQLITE_BUSY'de yeniden denenir, sonunda commit edilir).
+
+    Sonraki insert'leri database.ts panele kendisi yazar; her okumada
+    yeniden senkronlamaya gerek yoktur.
+    """
+    global _panel_synced
+    if _panel_synced:
+        return
+    run_write(ensure_hourly_panel)
+    _panel_synced = True
+
+
+if __name__ == "__main__":
+    # Kullanım: python hourly_panel.py --rebuild
+    conn = get_write_connection()
+    if '--rebuild' in sys.argv:
+        conn.execute(CREATE_PANEL_SQL)
+        conn.execute("DELETE FROM hourly_panel")
+        refresh_hourly_panel(conn)
+    else:
+        ensure_hourly_panel(conn)
+    conn.commit()
+
+    count, first, last = conn.execute(
+        "SELECT COUNT(*), MIN(date), MAX(date) FROM hourly_panel"
+    ).fetchone()
+
+    print(f"[+] hourly_panel: {count} satır ({first} -> {last})")
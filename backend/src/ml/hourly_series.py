@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+HourlySeries - Epoch-Saat İndeksli Kolon Bazlı Zaman Serisi
+============================================================
+
+Saatlik veriyi düzenli bir ızgarada tutar:
+- start (epoch-saat) + stride (saat) ile tanımlı indeks: i. satırın
+  zamanı start + i * stride, ek bir ds kolonu aranmaz
+- Her kolon bitişik bir NumPy dizisi
+- present: eksik saatler için boolean bitmap (gap'lerde float kolonlar NaN)
+
+Böylece:
+- Timestamp -> satır pozisyonu O(1) (boolean mask / merge yerine aritmetik)
+- Zaman aralığına göre dilimleme kopyasız (NumPy view)
+- DataFrame'e ve DataFrame'den dönüşüm tek vektör işlem
+
+Epoch-saat, hourly_panel.ts ile aynıdır (yerel saat, timezone'suz).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def to_epoch_hours(values):
+    """
+    datetime dizisi/Series -> epoch-saat int64 dizisi (vektörel).
+
+    Timezone varsa yerel saat korunarak atılır (hourly_panel.date_to_ts ile aynı).
+    """
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[h]').astype(np.int64)
+
+
+class HourlySeries:
+    """Epoch-saat indeksli, sabit adımlı, kolon bazlı zaman serisi"""
+
+    def __init__(self, start, columns, present=None, stride=1):
+        """
+        Args:
+            start (int): İlk satırın epoch-saati
+            columns (dict): kolon adı -> eşit uzunlukta NumPy dizisi
+            present (np.ndarray, optional): Satır dolu mu (bool). None ise hepsi dolu.
+            stride (int): Satırlar arası saat
+        """
+        self.start = int(start)
+        self.stride = int(stride)
+        self.columns = {name: np.asarray(values) for name, values in columns.items()}
+
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Kolon uzunlukları farklı: {lengths}")
+        self.length = lengths.pop() if lengths else (len(present) if present is not None else 0)
+
+        if present is None:
+            present = np.ones(self.length, dtype=bool)
+        self.present = np.asarray(present, dtype=bool)
+
+    # ========================================
+    # OLUŞTURMA
+    # ========================================
+
+    @classmethod
+    def from_frame(cls, df, ds_column='ds', columns=None, stride=1):
+        """
+        DataFrame'den seri oluşturur (sıralı olması gerekmez).
+
+        Eksik saatler NaN ile doldurulur (int kolonlar bu durumda float64 olur).
+        Aynı saat birden fazla ise sonuncusu kalır.
+        """
+        columns = columns or [col for col in df.columns if col != ds_column]
+        if len(df) == 0:
+            return cls(0, {col: df[col].to_numpy()[:0] for col in columns}, stride=stride)
+
+        ts = to_epoch_hours(df[ds_column])
+        return cls.from_epoch_hours(ts, {col: df[col].to_numpy() for col in columns}, stride=stride)
+
+    @classmethod
+    def from_epoch_hours(cls, ts, columns, stride=1):
+        """
+        Epoch-saat dizisi + kolon dizilerinden seri oluşturur.
+
+        Zaten düzenli ve boşluksuz ise diziler kopyalanmadan kullanılır.
+        """
+        ts = np.asarray(ts, dtype=np.int64)
+        if len(ts) == 0:
+            return cls(0, columns, stride=stride)
+
+        start = int(ts.min())
+        offsets = ts - start
+        if np.any(offsets % stride):
+            raise ValueError(f"Timestamp'ler {stride} saatlik ızgaraya oturmuyor")
+        positions = offsets // stride
+        length = int(positions.max()) + 1
+
+        # Hızlı yol: sıralı ve boşluksuz -> kopyasız
+        if length == len(ts) and np.array_equal(positions, np.arange(length)):
+            return cls(start, columns, stride=stride)
+
+        present = np.zeros(length, dtype=bool)
+        present[positions] = True
+
+        dense = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if not present.all() and values.dtype.kind in 'biu':
+                values = values.astype(np.float64)
+            if values.dtype.kind == 'f':
+                out = np.full(length, np.nan, dtype=values.dtype)
+            elif values.dtype.kind == 'M':
+                out = np.full(length, np.datetime64('NaT'), dtype=values.dtype)
+            else:
+                out = np.empty(length, dtype=values.dtype)
+            out[positions] = values
+            dense[name] = out
+
+        return cls(start, dense, present=present, stride=stride)
+
+    def to_frame(self, drop_gaps=True, ds_column='ds'):
+        """
+        DataFrame'e çevirir (ds kolonu indeksten üretilir).
+
+        Args:
+            drop_gaps (bool): Eksik saatleri at (gap yoksa kolonlar kopyalanmaz)
+        """
+        keep = self.present if drop_gaps and not self.present.all() else slice(None)
+
+        data = {ds_column: pd.to_datetime(self.index[keep] * 3600, unit='s')}
+        for name, values in self.columns.items():
+            data[name] = values[keep]
+        return pd.DataFrame(data, copy=False)
+
+    # ========================================
+    # İNDEKS / ARAMA
+    # ========================================
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        """Kolon dizisi (kopyasız)"""
+        return self.columns[name]
+
+    @property
+    def end(self):
+        """Son satırdan bir sonraki epoch-saat (hariç)"""
+        return self.start + self.length * self.stride
+
+    @property
+    def index(self):
+        """Satırların epoch-saatleri"""
+        return self.start + np.arange(self.length, dtype=np.int64) * self.stride
+
+    @property
+    def gaps(self):
+        """Eksik saatlerin epoch-saatleri"""
+        return self.index[~self.present]
+
+    def position(self, timestamp):
+        """
+        Tek timestamp'in satır pozisyonu (O(1)).
+
+        Returns:
+            int: Pozisyon, seride yoksa (aralık dışı veya gap) -1
+        """
+        return int(self.positions([timestamp])[0])
+
+    def positions(self, timestamps):
+        """
+        Timestamp dizisinin satır pozisyonları (vektörel, eleman başına O(1)).
+
+        Args:
+            timestamps: datetime dizisi/Series veya epoch-saat int dizisi
+
+        Returns:
+            np.ndarray: Pozisyonlar, seride olmayanlar için -1
+        """
+        values = np.asarray(timestamps)
+        if values.dtype.kind in 'iu':
+            ts = values.astype(np.int64)
+        else:
+            ts = to_epoch_hours(timestamps)
+
+        offsets = ts - self.start
+        positions = offsets // self.stride
+        valid = (offsets % self.stride == 0) & (positions >= 0) & (positions < self.length)
+        valid[valid] = self.present[positions[valid]]
+        return np.where(valid, positions, -1)
+
+    def lookup(self, name, timestamps):
+        """
+        Timestamp'lerdeki kolon değerleri.
+
+        Returns:
+            tuple: (değerler, bulundu_mu maskesi) - bulunamayanlar değerlerden çıkarılır
+        """
+        pos = self.positions(timestamps)
+        found = pos >= 0
+        return self.columns[name][pos[found]], found
+
+    def slice(self, start_date=None, end_date=None):
+        """
+        [start_date, end_date) aralığını kopyasız (view) döndürür.
+
+        Args:
+            start_date: Başlangıç (dahil) - str/Timestamp, None ise baştan
+            end_date: Bitiş (dahil değil) - str/Timestamp, None ise sona kadar
+        """
+        lo = 0
+        hi = self.length
+        if start_date is not None:
+            start_ts = int(to_epoch_hours([pd.Timestamp(start_date)])[0])
+            lo = min(max(-(-(start_ts - self.start) // self.stride), 0), self.length)
+        if end_date is not None:
+            end_ts = int(to_epoch_hours([pd.Timestamp(end_date)])[0])
+            hi = min(max(-(-(end_ts - self.start) // self.stride), lo), self.length)
+
+        return HourlySeries(
+            self.start + lo * self.stride,
+            {name: values[lo:hi] for name, values in self.columns.items()},
+            present=self.present[lo:hi],
+            stride=self.stride
+        )
@@ -0,0 +1,779 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Hiperparametre Araması - Prophet / XGBoost / LSTM
+==================================================
+
+Modellerin hiperparametreleri elle seçilmiş sabitlerdir (train_prophet.
+PROPHET_PARAMS, train_xgboost.XGBOOST_PARAMS, train_lstm.LSTM_PARAMS).
+Bu modül onları zaman serisi çapraz doğrulamasıyla ayarlar:
+
+- Fold'lar bir kez tanımlanır: verideki son N tam hafta (Pazartesi
+  cutoff'ları, en yenisi ilk); her fold'da cutoff öncesi eğitim, sonraki
+  168 saat doğrulama
+- Her fold'un feature matrisleri .npy olarak önbelleğe yazılır
+  (models/search_cache/); veri değişmedikçe sonraki aramalar yeniden
+  kullanır, işçiler memory-map ile okur (pickle yok)
+- Adaylar: mevcut ayar (baseline) + arama uzayından rastgele örnekler
+- Successive halving: tüm adaylar önce en yeni fold'da denenir, her
+  turda en iyi 1/ETA'sı daha fazla fold'a geçer (baseline her zaman
+  sona kadar kalır, kazanan ondan kötü olamaz)
+- XGBoost fold'larında 'prophet' kolonu o fold'un cutoff'undan önceki
+  veriyle eğitilen Prophet'ten gelir (eğitim satırları in-sample, doğrulama
+  haftası tahmin yolu ile); üretim modelinin tam geçmiş fit'i kullanılmaz
+- Fold içinde erken durdurma: XGBoost early_stopping_rounds, LSTM
+  EarlyStopping; ikisi de eğitim diliminin sonundan ayrılan
+  EARLY_STOPPING_HOURS'luk iç holdout'u izler, skorlanan doğrulama
+  haftası eğitimde hiç görülmez. En iyi iterasyon sayısı kazanan ayara
+  yazılır (XGBoost bu sayıyla tüm eğitim diliminde yeniden eğitilir)
+- Denemeler süreç havuzunda (spawn) paralel; her deneme bittikçe
+  hyperparameter_trials tablosuna, kazanan hyperparameter_results
+  tablosuna yazılır
+
+Kazanan ayarla eğitim:
+    python train_xgboost.py --tuned    (best_params('xgboost'))
+
+Kullanım:
+    python hyperparameter_search.py <prophet|xgboost|lstm> [--configs 12] [--folds 4] [--workers N]
+"""
+
+import numpy as np
+import pandas as pd
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Database path configuration
+try:
+    from db_config import get_read_connection, run_write
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import get_read_connection, run_write
+
+from walk_forward import (
+    HORIZON_HOURS, _init_worker, _prepare_cutoff, mondays, quiet_stan_logging, score_week
+)
+
+# Fold önbelleği (DB'den türetilir)
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '../../models/search_cache')
+
+# Önbellek formatı değişirse fold'lar yeniden oluşturulur
+CACHE_VERSION = 2
+
+# Successive halving: her turda adayların 1/ETA'sı kalır
+ETA = 3
+
+# Fold içi erken durdurma
+XGBOOST_MAX_TREES = 2000
+XGBOOST_EARLY_STOPPING = 50
+LSTM_MAX_EPOCHS = 30
+LSTM_PATIENCE = 5
+
+# Erken durdurmanın izlediği iç holdout: eğitim diliminin son saatleri
+EARLY_STOPPING_HOURS = HORIZON_HOURS
+
+# Arama uzayları (baseline değeri listede yoksa eklenir)
+SEARCH_SPACES = {
+    'prophet': {
+        'changepoint_prior_scale': [0.01, 0.03, 0.1, 0.3, 1.0],
+        'seasonality_prior_scale': [1.0, 3.0, 10.0, 30.0],
+        'holidays_prior_scale': [1.0, 10.0, 30.0],
+        'regressor_prior_factor': [0.3, 1.0, 3.0],
+    },
+    'xgboost': {
+        'max_depth': [4, 5, 6, 7, 8],
+        'learning_rate': [0.01, 0.03, 0.05, 0.1],
+        'min_child_weight': [1, 3, 5, 10],
+        'subsample': [0.6, 0.8, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0],
+        'reg_alpha': [0.0, 0.1, 1.0],
+        'reg_lambda': [0.5, 1.0, 5.0],
+    },
+    'lstm': {
+        'units': [32, 64, 128],
+        'learning_rate': [0.0003, 0.001, 0.003],
+        'dropout': [0.1, 0.2, 0.3],
+        'batch_size': [32, 64, 128],
+    },
+}
+
+CREATE_TRIALS_SQL = """
+    CREATE TABLE IF NOT EXISTS hyperparameter_trials (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        search_id TEXT NOT NULL,
+        model TEXT NOT NULL,
+        config_id INTEGER NOT NULL,
+        params TEXT NOT NULL,
+        rung INTEGER NOT NULL,
+        fold INTEGER NOT NULL,
+        cutoff DATE NOT NULL,
+        status TEXT NOT NULL,
+        mae REAL,
+        mape REAL,
+        rmse REAL,
+        best_iteration INTEGER,
+        seconds REAL,
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+CREATE_RESULTS_SQL = """
+    CREATE TABLE IF NOT EXISTS hyperparameter_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        search_id TEXT NOT NULL UNIQUE,
+        model TEXT NOT NULL,
+        params TEXT NOT NULL,
+        mae REAL NOT NULL,
+        mape REAL,
+        baseline_mae REAL,
+        cutoffs TEXT NOT NULL,
+        n_configs INTEGER NOT NULL,
+        n_trials INTEGER NOT NULL,
+        seconds REAL NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+# ========================================
+# MODEL TANIMLARI
+# ========================================
+
+def _baseline_prophet():
+    from train_prophet import PROPHET_PARAMS
+    return PROPHET_PARAMS
+
+
+def _baseline_xgboost():
+    from train_xgboost import XGBOOST_PARAMS
+    return XGBOOST_PARAMS
+
+
+def _baseline_lstm():
+    from train_lstm import LSTM_PARAMS
+    return LSTM_PARAMS
+
+
+def _load_prophet():
+    """
+    Multivariate Prophet verisi (walk_forward ile aynı).
+
+    Returns:
+        tuple: (data, kolonlar)
+    """
+    from feature_store import load_features
+    from features import get_prophet_features
+    return load_features(), get_prophet_features()
+
+
+def _load_xgboost():
+    """
+    Residual verisi. 'prophet' kolonu veride yoktur; her fold için
+    _folds_xgboost o cutoff'a kadar eğitilen Prophet'ten üretir
+    (hedef = y - prophet, train_xgboost ile aynı).
+    """
+    from feature_store import load_features
+    from features import get_xgboost_features
+
+    df = load_features()
+    columns = [f for f in get_xgboost_features() if f in df.columns]
+    return df, columns + ['prophet']
+
+
+def _settings_xgboost():
+    """Fold'ların Prophet baseline'ını belirleyen ayarlar (önbellek anahtarına girer)"""
+    from train_prophet import PROPHET_PARAMS
+    from training_window import MAX_YEARS, OLDER_EVERY_DAYS, WINDOW_MONTHS
+    return {'prophet': PROPHET_PARAMS, 'window': [WINDOW_MONTHS, OLDER_EVERY_DAYS, MAX_YEARS]}
+
+
+def _load_lstm():
+    from feature_store import load_features
+    from features import get_xgboost_features
+    df = load_features()
+    return df, [f for f in get_xgboost_features() if f in df.columns]
+
+
+def _folds_prophet(data, columns, cutoffs):
+    """Her cutoff için eğitim dilimi + gelecek regressor'ları (tahmin yolu ile aynı)"""
+    for cutoff in cutoffs:
+        train, future, actual = _prepare_cutoff(data, columns, cutoff)
+        val_y = future[['ds']].merge(actual, on='ds', how='left')['y']
+        yield {
+            'train_ds': train['ds'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+            'train_y': train['y'].to_numpy(dtype=np.float64),
+            'train_X': train[columns].to_numpy(dtype=np.float64),
+            'val_ds': future['ds'].to_numpy(dtype='datetime64[ns]').view(np.int64),
+            'val_X': future[columns].to_numpy(dtype=np.float64),
+            'val_y': val_y.to_numpy(dtype=np.float64),
+        }
+
+
+def _folds_tabular(data, columns, cutoffs):
+    """Satır dilimleri: cutoff öncesi eğitim, sonraki HORIZON_HOURS doğrulama"""
+    ds = data['ds'].to_numpy(dtype='datetime64[ns]')
+    X = data[columns].to_numpy(dtype=np.float64)
+    y = data['y'].to_numpy(dtype=np.float64)
+    for cutoff in cutoffs:
+        start = pd.Timestamp(cutoff)
+        lo = int(np.searchsorted(ds, start.to_datetime64()))
+        hi = int(np.searchsorted(ds, (start + pd.Timedelta(hours=HORIZON_HOURS)).to_datetime64()))
+        yield {'train_X': X[:lo], 'train_y': y[:lo], 'val_X': X[lo:hi], 'val_y': y[lo:hi]}
+
+
+def _folds_xgboost(data, columns, cutoffs):
+    """
+    Tabular fold'lar + fold'a özel Prophet baseline'ı.
+
+    Her cutoff için Prophet sadece cutoff öncesi veriyle (üretimdeki eğitim
+    penceresiyle) eğitilir; eğitim satırlarının 'prophet' değeri bu modelin
+    in-sample tahmini, doğrulama haftasınınki geçmişten türetilen gelecek
+    regressor'larıyla yapılan tahmindir (walk_forward ile aynı yol).
+    """
+    from train_prophet import build_prophet_model
+    from calendar_table import bayram_holidays
+    from features import get_prophet_features
+
+    regressors = get_prophet_features()
+    features = [col for col in columns if col != 'prophet']
+    folds = _folds_tabular(data, features, cutoffs)
+    quiet_stan_logging()
+
+    for cutoff, arrays in zip(cutoffs, folds):
+        print(f"   [*] {cutoff}: fold Prophet'i eğitiliyor...")
+        train, future, _ = _prepare_cutoff(data, regressors, cutoff)
+        model = build_prophet_model(bayram_holidays(), verbose=False)
+        model.fit(train)
+
+        lo = len(arrays['train_y'])
+        history = data.iloc[:lo][['ds'] + regressors]
+        train_prophet = model.predict(history)['yhat'].to_numpy()
+
+        val_ds = data.iloc[lo:lo + len(arrays['val_y'])][['ds']]
+        forecast = model.predict(future)[['ds', 'yhat']]
+        val_prophet = val_ds.merge(forecast, on='ds', how='left')['yhat'].to_numpy()
+
+        yield {
+            'train_X': np.column_stack([arrays['train_X'], train_prophet]),
+            'train_y': arrays['train_y'],
+            'val_X': np.column_stack([arrays['val_X'], val_prophet]),
+            'val_y': arrays['val_y'],
+        }
+
+
+def _split_early_stopping(n_rows, holdout=EARLY_STOPPING_HOURS, min_rows=1):
+    """
+    Eğitim diliminin sonundan erken durdurma holdout'u ayırır.
+
+    Returns:
+        int: Holdout'un başladığı satır (öncesi fit, sonrası erken durdurma)
+    """
+    split = n_rows - holdout
+    if split < min_rows:
+        raise ValueError(f"Erken durdurma holdout'u için eğitim verisi yetersiz ({n_rows} satır)")
+    return split
+
+
+def _trial_prophet(params, arrays, columns, n_jobs):
+    """Prophet'i fold'da eğitir, doğrulama haftasını tahmin eder"""
+    from train_prophet import build_prophet_model
+    from calendar_table import bayram_holidays
+
+    model = build_prophet_model(bayram_holidays(), verbose=False, params=params)
+
+    train = pd.DataFrame(np.asarray(arrays['train_X']), columns=columns)
+    train.insert(0, 'ds', pd.to_datetime(np.asarray(arrays['train_ds'])))
+    train.insert(1, 'y', np.asarray(arrays['train_y']))
+    future = pd.DataFrame(np.asarray(arrays['val_X']), columns=columns)
+    future.insert(0, 'ds', pd.to_datetime(np.asarray(arrays['val_ds'])))
+
+    model.fit(train)
+    return model.predict(future)['yhat'].to_numpy(), None
+
+
+def _trial_xgboost(params, arrays, columns, n_jobs):
+    """
+    Residual modelini eğitir; skor fiyat üzerinden (prophet + residual)
+    hesaplansın diye tahmine Prophet eklenir.
+
+    Ağaç sayısı eğitim diliminin son EARLY_STOPPING_HOURS saatinde erken
+    durdurmayla bulunur, model o sayıyla tüm eğitim diliminde yeniden
+    eğitilir (train_xgboost'un sabit n_estimators ile eğitimi gibi).
+    """
+    import xgboost as xgb
+    from train_xgboost import XGBOOST_PARAMS
+
+    prophet_col = columns.index('prophet')
+    features = [i for i in range(len(columns)) if i != prophet_col]
+    train_X, val_X = np.asarray(arrays['train_X']), np.asarray(arrays['val_X'])
+    X = train_X[:, features]
+    residual = np.asarray(arrays['train_y']) - train_X[:, prophet_col]
+    split = _split_early_stopping(len(X))
+
+    def regressor(n_estimators, **kwargs):
+        return xgb.XGBRegressor(
+            **{**XGBOOST_PARAMS, **params, 'n_estimators': n_estimators},
+            objective='reg:squarederror',
+            random_state=42,
+            n_jobs=n_jobs,
+            verbosity=0,
+            **kwargs
+        )
+
+    model = regressor(XGBOOST_MAX_TREES, early_stopping_rounds=XGBOOST_EARLY_STOPPING,
+                      eval_metric='mae')
+    model.fit(X[:split], residual[:split], eval_set=[(X[split:], residual[split:])], verbose=False)
+    n_trees = model.best_iteration + 1
+
+    model = regressor(n_trees)
+    model.fit(X, residual, verbose=False)
+    return val_X[:, prophet_col] + model.predict(val_X[:, features]), n_trees
+
+
+def _trial_lstm(params, arrays, columns, n_jobs):
+    """
+    LSTM'i fold'da eğitir; doğrulama pencereleri eğitimin son
+    SEQUENCE_LENGTH satırından başlar (her doğrulama saati tahmin edilir).
+
+    EarlyStopping eğitim diliminin son EARLY_STOPPING_HOURS saatini izler
+    (pencereleri SEQUENCE_LENGTH satır önceden başlar); en iyi ağırlıklarla
+    doğrulama haftası tahmin edilir. Yeniden eğitim tam bir eğitim kadar
+    sürdüğünden yapılmaz.
+    """
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    import tensorflow as tf
+    from tensorflow.keras.callbacks import EarlyStopping
+    from sklearn.preprocessing import MinMaxScaler
+    from train_lstm import LSTM_PARAMS, SEQUENCE_LENGTH, build_lstm_model, window_dataset
+    from lstm_inference import predict_sequences
+
+    tf.config.threading.set_intra_op_parallelism_threads(n_jobs)
+    params = {**LSTM_PARAMS, **params}
+    seq = SEQUENCE_LENGTH
+
+    train_X, train_y = np.asarray(arrays['train_X']), np.asarray(arrays['train_y'])
+    split = _split_early_stopping(len(train_X), min_rows=seq + 1)
+    val_X = np.vstack([train_X[-seq:], arrays['val_X']])
+
+    scaler_X = MinMaxScaler().fit(train_X)
+    scaler_y = MinMaxScaler().fit(train_y.reshape(-1, 1))
+    train_X_scaled = scaler_X.transform(train_X)
+    train_y_scaled = scaler_y.transform(train_y.reshape(-1, 1)).ravel()
+    fit_data = window_dataset(
+        train_X_scaled[:split], train_y_scaled[:split], seq, params['batch_size']
+    )
+    holdout_data = window_dataset(
+        train_X_scaled[split - seq:], train_y_scaled[split - seq:],
+        seq, params['batch_size'], shuffle=False
+    )
+
+    model = build_lstm_model(
+        (seq, train_X.shape[1]), units=params['units'],
+        learning_rate=params['learning_rate'], dropout=params['dropout'], verbose=False
+    )
+    history = model.fit(
+        fit_data,
+        validation_data=holdout_data,
+        epochs=min(params['epochs'], LSTM_MAX_EPOCHS),
+        callbacks=[EarlyStopping(monitor='val_loss', patience=LSTM_PATIENCE,
+                                 restore_best_weights=True)],
+        verbose=0
+    )
+    pred = predict_sequences(model, scaler_X.transform(val_X), scaler_y, seq)
+    return pred, int(np.argmin(history.history['val_loss'])) + 1
+
+
+# model adı -> baseline, veri, (fold ayarları), fold hazırlayıcı, deneme, iterasyon parametresi
+SEARCH_MODELS = {
+    'prophet': {
+        'baseline': _baseline_prophet,
+        'load': _load_prophet,
+        'folds': _folds_prophet,
+        'trial': _trial_prophet,
+        'iteration_param': None,
+    },
+    'xgboost': {
+        'baseline': _baseline_xgboost,
+        'load': _load_xgboost,
+        'settings': _settings_xgboost,
+        'folds': _folds_xgboost,
+        'trial': _trial_xgboost,
+        'iteration_param': 'n_estimators',
+    },
+    'lstm': {
+        'baseline': _baseline_lstm,
+        'load': _load_lstm,
+        'folds': _folds_tabular,
+        'trial': _trial_lstm,
+        'iteration_param': 'epochs',
+    },
+}
+
+
+# ========================================
+# FOLD'LAR VE ÖNBELLEK
+# ========================================
+
+def fold_cutoffs(ds, n_folds):
+    """
+    Verideki son n_folds tam haftanın Pazartesileri (en yenisi ilk).
+
+    Returns:
+        list: 'YYYY-MM-DD' listesi
+    """
+    last = pd.Timestamp(ds.max())
+    complete = [
+        cutoff for cutoff in mondays(ds.min() + pd.Timedelta(days=7), last)
+        if pd.Timestamp(cutoff) + pd.Timedelta(hours=HORIZON_HOURS - 1) <= last
+    ]
+    return complete[::-1][:n_folds]
+
+
+def _cache_key(model_name, data, columns, cutoffs):
+    """
+    Veri + kolonlar + fold'lar (+ modelin fold ayarları) değişince değişen
+    önbellek anahtarı. Fold'da üretilen kolonlar (örn. 'prophet') veride
+    olmadığından sadece mevcut kolonlar hash'lenir.
+    """
+    settings = SEARCH_MODELS[model_name].get('settings')
+    h = hashlib.sha256(json.dumps({
+        'version': CACHE_VERSION, 'model': model_name,
+        'columns': columns, 'cutoffs': cutoffs,
+        'settings': settings() if settings else None,
+    }, sort_keys=True).encode('utf-8'))
+    h.update(data['ds'].to_numpy(dtype='datetime64[ns]').view(np.int64).tobytes())
+    present = [col for col in columns if col in data.columns]
+    h.update(np.ascontiguousarray(data[['y'] + present].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()[:16]
+
+
+def prepare_fold_cache(model_name, data, columns, cutoffs):
+    """
+    Fold matrislerini önbelleğe yazar (aynı anahtar varsa yeniden kullanır).
+
+    Returns:
+        list: Fold dizinleri (cutoffs sırasıyla)
+    """
+    key = _cache_key(model_name, data, columns, cutoffs)
+    root = os.path.join(CACHE_DIR, f"{model_name}_{key}")
+    fold_dirs = [os.path.join(root, f"fold{i}") for i in range(len(cutoffs))]
+
+    if os.path.exists(os.path.join(root, 'meta.json')):
+        print(f"[+] Fold önbelleği kullanılıyor: {root}")
+        return fold_dirs
+
+    # Aynı modelin eski önbellekleri silinir
+    if os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(f"{model_name}_"):
+                shutil.rmtree(os.path.join(CACHE_DIR, name), ignore_errors=True)
+
+    print(f"[*] Fold matrisleri hazırlanıyor ({len(cutoffs)} fold)...")
+    tmp_root = root + '.tmp'
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    folds = SEARCH_MODELS[model_name]['folds'](data, columns, cutoffs)
+    for i, arrays in enumerate(folds):
+        fold_dir = os.path.join(tmp_root, f"fold{i}")
+        os.makedirs(fold_dir)
+        for name, values in arrays.items():
+            np.save(os.path.join(fold_dir, f"{name}.npy"), np.ascontiguousarray(values))
+
+    with open(os.path.join(tmp_root, 'meta.json'), 'w') as f:
+        json.dump({'model': model_name, 'key': key, 'columns': columns, 'cutoffs': cutoffs}, f)
+    os.replace(tmp_root, root)
+    print(f"[+] Fold önbelleği yazıldı: {root}")
+    return fold_dirs
+
+
+def _load_fold(fold_dir):
+    """Fold dizinindeki dizileri memory-map ile açar"""
+    return {
+        os.path.splitext(name)[0]: np.load(os.path.join(fold_dir, name), mmap_mode='r')
+        for name in os.listdir(fold_dir) if name.endswith('.npy')
+    }
+
+
+# ========================================
+# ADAYLAR VE DENEMELER
+# ========================================
+
+def candidate_configs(model_name, n_configs, seed=42):
+    """
+    Baseline + arama uzayından tekrarsız rastgele adaylar.
+
+    Returns:
+        list: params dict'leri (ilk eleman baseline)
+    """
+    space = {name: list(values) for name, values in SEARCH_SPACES[model_name].items()}
+    baseline_all = SEARCH_MODELS[model_name]['baseline']()
+    baseline = {name: baseline_all[name] for name in space}
+    for name, value in baseline.items():
+        if value not in space[name]:
+            space[name].append(value)
+
+    names = list(space)
+    grid = list(itertools.product(*(space[name] for name in names)))
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(grid))
+
+    configs = [baseline]
+    for i in order:
+        if len(configs) >= n_configs:
+            break
+        params = dict(zip(names, grid[i]))
+        if params != baseline:
+            configs.append(params)
+    return configs
+
+
+def _run_trial(model_name, params, fold_dir, columns, n_jobs):
+    """
+    Bir adayı bir fold'da dener (işçide çalışır).
+
+    Returns:
+        dict: mae, mape, rmse, best_iteration, seconds
+    """
+    arrays = _load_fold(fold_dir)
+    start = time.perf_counter()
+    y_pred, best_iteration = SEARCH_MODELS[model_name]['trial'](params, arrays, columns, n_jobs)
+    seconds = time.perf_counter() - start
+
+    y_true = np.asarray(arrays['val_y'])
+    known = ~np.isnan(y_true)
+    metrics = score_week(y_true[known], np.asarray(y_pred)[known])
+    return {
+        'mae': metrics['mae'],
+        'mape': metrics['mape'],
+        'rmse': metrics['rmse'],
+        'best_iteration': best_iteration,
+        'seconds': seconds,
+    }
+
+
+def ensure_search_tables(conn):
+    """hyperparameter_trials / hyperparameter_results tablolarını oluşturur"""
+    conn.execute(CREATE_TRIALS_SQL)
+    conn.execute(CREATE_RESULTS_SQL)
+
+
+def _save_trial(search_id, model_name, config_id, params, rung, fold, cutoff, result, error=None):
+    """Bir denemeyi hyperparameter_trials tablosuna yazar"""
+    result = result or {}
+
+    def write(conn):
+        ensure_search_tables(conn)
+        conn.execute("""
+            INSERT INTO hyperparameter_trials (
+                search_id, model, config_id, params, rung, fold, cutoff, status,
+                mae, mape, rmse, best_iteration, seconds, error
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            search_id, model_name, config_id, json.dumps(params, sort_keys=True),
+            rung, fold, cutoff, 'error' if error else 'ok',
+            result.get('mae'), result.get('mape'), result.get('rmse'),
+            result.get('best_iteration'), result.get('seconds'), error,
+        ))
+
+    run_write(write)
+
+
+def _rung_budgets(n_folds):
+    """Tur başına fold sayısı: 1, ETA, ETA^2, ... n_folds"""
+    budgets = [1]
+    while budgets[-1] < n_folds:
+        budgets.append(min(n_folds, budgets[-1] * ETA))
+    return budgets
+
+
+def best_params(model_name):
+    """
+    Son aramanın kazanan hiperparametreleri.
+
+    Returns:
+        dict: params (arama yapılmamışsa None)
+    """
+    conn = get_read_connection()
+    try:
+        row = conn.execute("""
+            SELECT params FROM hyperparameter_results
+            WHERE model = ?
+            ORDER BY id DESC LIMIT 1
+        """, (model_name,)).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    if row is None:
+        print(f"[!] {model_name} için arama sonucu yok, varsayılan ayarlar kullanılacak")
+        return None
+    return json.loads(row[0])
+
+
+def run_search(model_name, n_configs=12, n_folds=4, workers=None, seed=42):
+    """
+    Successive halving ile hiperparametre araması.
+
+    Args:
+        model_name (str): SEARCH_MODELS anahtarı
+        n_configs (int): Aday sayısı (baseline dahil)
+        n_folds (int): Fold (doğrulama haftası) sayısı
+        workers (int, optional): Süreç sayısı (None ise CPU sayısı)
+        seed (int): Aday örnekleme tohumu
+
+    Returns:
+        dict: search_id, params, mae, mape, baseline_mae
+    """
+    spec = SEARCH_MODELS[model_name]
+    workers = workers or os.cpu_count() or 1
+    n_jobs = max(1, (os.cpu_count() or 1) // workers)
+    search_id = f"{model_name}_{pd.Timestamp.now().strftime('%Y%m%d%H%M%S')}"
+
+    print("=" * 70)
+    print(f"HİPERPARAMETRE ARAMASI: {model_name}, {workers} süreç x {n_jobs} thread")
+    print("=" * 70)
+
+    print("[*] Veri yükleniyor...")
+    data, columns = spec['load']()
+    data = data.sort_values('ds').reset_index(drop=True)
+    cutoffs = fold_cutoffs(data['ds'], n_folds)
+    if not cutoffs:
+        print("[!] Fold oluşturacak kadar veri yok")
+        return None
+    print(f"[+] {len(data)} satır, fold'lar: {', '.join(cutoffs)}")
+
+    fold_dirs = prepare_fold_cache(model_name, data, columns, cutoffs)
+    del data
+
+    configs = candidate_configs(model_name, n_configs, seed)
+    scores = {cid: {} for cid in range(len(configs))}
+    iterations = {cid: [] for cid in range(len(configs))}
+    alive = list(range(len(configs)))
+    budgets = _rung_budgets(len(cutoffs))
+    n_trials = 0
+    started = time.perf_counter()
+
+    def mean_mae(cid, n):
+        return float(np.mean([scores[cid][fold]['mae'] for fold in range(n)]))
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker) as pool:
+        for rung, budget in enumerate(budgets):
+            print(f"\n[*] Tur {rung + 1}/{len(budgets)}: {len(alive)} aday x {budget} fold")
+            futures = {}
+            for cid in alive:
+                for fold in range(budget):
+                    if fold not in scores[cid]:
+                        task = pool.submit(_run_trial, model_name, configs[cid],
+                                           fold_dirs[fold], columns, n_jobs)
+                        futures[task] = (cid, fold)
+
+            failed = set()
+            for task in as_completed(futures):
+                cid, fold = futures[task]
+                n_trials += 1
+                try:
+                    result = task.result()
+                except Exception as e:
+                    print(f"   [!] Aday {cid}, fold {fold}: HATA - {e}")
+                    _save_trial(search_id, model_name, cid, configs[cid], rung, fold,
+                                cutoffs[fold], None, error=str(e))
+                    failed.add(cid)
+                    continue
+
+                scores[cid][fold] = result
+                if result['best_iteration'] is not None:
+                    iterations[cid].append(result['best_iteration'])
+                _save_trial(search_id, model_name, cid, configs[cid], rung, fold,
+                            cutoffs[fold], result)
+
+            alive = [cid for cid in alive if cid not in failed]
+            if not alive:
+                print("[!] Tüm adaylar başarısız oldu")
+                return None
+
+            ranked = sorted(alive, key=lambda cid: mean_mae(cid, budget))
+            for cid in ranked:
+                tag = " (baseline)" if cid == 0 else ""
+                print(f"   Aday {cid:>2}: MAE {mean_mae(cid, budget):8.2f}  {configs[cid]}{tag}")
+
+            # Son tur değilse en iyi 1/ETA kalır; baseline karşılaştırma için hep kalır
+            if rung < len(budgets) - 1:
+                keep = ranked[:max(1, math.ceil(len(ranked) / ETA))]
+                if 0 in alive and 0 not in keep:
+                    keep.append(0)
+                alive = keep
+
+    winner = min(alive, key=lambda cid: mean_mae(cid, len(cutoffs)))
+    params = dict(configs[winner])
+    if spec['iteration_param'] and iterations[winner]:
+        params[spec['iteration_param']] = int(round(np.mean(iterations[winner])))
+
+    mae = mean_mae(winner, len(cutoffs))
+    mapes = [scores[winner][fold]['mape'] for fold in range(len(cutoffs))]
+    mape = float(np.mean(mapes)) if all(m is not None for m in mapes) else None
+    baseline_mae = mean_mae(0, len(cutoffs)) if 0 in alive else None
+    seconds = time.perf_counter() - started
+
+    def write(conn):
+        ensure_search_tables(conn)
+        conn.execute("""
+            INSERT INTO hyperparameter_results (
+                search_id, model, params, mae, mape, baseline_mae,
+                cutoffs, n_configs, n_trials, seconds
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            search_id, model_name, json.dumps(params, sort_keys=True), mae, mape,
+            baseline_mae, json.dumps(cutoffs), len(configs), n_trials, seconds,
+        ))
+
+    run_write(write)
+
+    full_trials = len(configs) * len(cutoffs)
+    print("\n" + "=" * 70)
+    print(f"[+] Kazanan (aday {winner}): {params}")
+    print(f"[*] CV MAE: {mae:.2f} TRY" + (f", MAPE: {mape:.2f}%" if mape is not None else ""))
+    if baseline_mae is not None:
+        print(f"[*] Baseline MAE: {baseline_mae:.2f} TRY ({(baseline_mae - mae) / baseline_mae * 100:+.1f}%)")
+    print(f"[*] {n_trials} deneme (tam grid: {full_trials}), {seconds:.1f} sn")
+    print(f"[*] Kayıt: hyperparameter_results ({search_id})")
+    print("=" * 70)
+
+    return {
+        'search_id': search_id,
+        'params': params,
+        'mae': mae,
+        'mape': mape,
+        'baseline_mae': baseline_mae,
+    }
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    options = {'--configs': 12, '--folds': 4, '--workers': None}
+    for flag in list(options):
+        if flag in argv:
+            i = argv.index(flag)
+            options[flag] = int(argv[i + 1])
+            del argv[i:i + 2]
+
+    if len(argv) != 1 or argv[0] not in SEARCH_MODELS:
+        print(f"Kullanım: python hyperparameter_search.py <{'|'.join(SEARCH_MODELS)}> "
+              f"[--configs N] [--folds N] [--workers N]")
+        sys.exit(1)
+
+    run_search(
+        argv[0],
+        n_configs=options['--configs'],
+        n_folds=options['--folds'],
+        workers=options['--workers'],
+    )
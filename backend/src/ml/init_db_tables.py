@@ -3,23 +3,27 @@
 """
 Database Table Initialization
 ==============================
-Creates forecast_history and weekly_performance tables if they don't exist.
+Creates forecast_history, weekly_performance, hourly_panel, walk-forward, hyperparameter search and retrain decision tables if they don't exist.
 """
 
-import sqlite3
 import os
 import sys
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import DB_PATH, get_write_connection
 except ImportError:
     # If running from ml/ directory directly
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import DB_PATH, get_write_connection
+
+from hourly_panel import ensure_hourly_panel
+from walk_forward import ensure_walk_forward_tables
+from hyperparameter_search import ensure_search_tables
+from drift_monitor import ensure_decisions_table
 
 def init_forecast_tables():
-    """Create forecast_history and weekly_performance tables"""
+    """Create forecast_history, weekly_performance, hourly_panel, walk-forward, hyperparameter search and retrain decision tables"""
 
     print("="*70)
     print("DATABASE TABLE INITIALIZATION")
@@ -27,10 +31,10 @@ def init_forecast_tables():
     print(f"Database: {DB_PATH}")
     print()
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_write_connection()
 
     # Create forecast_history table
-    print("[1/2] Creating forecast_history table...")
+    print("[1/6] Creating forecast_history table...")
     conn.execute('''
         CREATE TABLE IF NOT EXISTS forecast_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -48,7 +52,7 @@ def init_forecast_tables():
     print("[OK] forecast_history table created")
 
     # Create weekly_performance table
-    print("[2/2] Creating weekly_performance table...")
+    print("[2/6] Creating weekly_performance table...")
     conn.execute('''
         CREATE TABLE IF NOT EXISTS weekly_performance (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -64,8 +68,27 @@ def init_forecast_tables():
     ''')
     print("[OK] weekly_performance table created")
 
+    # Create / sync hourly_panel table (MCP + consumption + generation in one row)
+    print("[3/6] Creating hourly_panel table...")
+    ensure_hourly_panel(conn)
+    print("[OK] hourly_panel table created")
+
+    # Create walk-forward backtest tables (walk_forward.py results)
+    print("[4/6] Creating walk_forward_results / walk_forward_forecasts tables...")
+    ensure_walk_forward_tables(conn)
+    print("[OK] walk-forward tables created")
+
+    # Create hyperparameter search tables (hyperparameter_search.py trials / winners)
+    print("[5/6] Creating hyperparameter_trials / hyperparameter_results tables...")
+    ensure_search_tables(conn)
+    print("[OK] hyperparameter search tables created")
+
+    # Create retrain decision log (drift_monitor.py)
+    print("[6/6] Creating retrain_decisions table...")
+    ensure_decisions_table(conn)
+    print("[OK] retrain_decisions table created")
+
     conn.commit()
-    conn.close()
 
     print()
     print("="*70)
@@ -24,7 +24,8 @@ sys.path.append(script_dir)
 from train_prophet import main as train_model
 from compare_forecasts import compare_week
 from export_json import export_forecasts
-from prophet.serialize import model_from_json
+from predict import make_forecast
+from prophet_artifact import load_prophet
 import pandas as pd
 
 def setup_week_1():
@@ -56,16 +57,10 @@ def setup_week_1():
     try:
         # Model dosyasını yükle
         model_path = os.path.join(script_dir, '../../models/prophet_model.json')
-        with open(model_path, 'r') as f:
-            model = model_from_json(f.read())
+        model = load_prophet(model_path)
 
-        # 7 günlük tahmin
-        future = model.make_future_dataframe(periods=7*24, freq='H')
-        forecast = model.predict(future)
-
-        # Sadece bu haftanın tahminlerini al
-        last_history_date = model.history['ds'].max()
-        future_forecast = forecast[forecast['ds'] > last_history_date].head(168)
+        # 7 günlük tahmin (sadece bu haftanın saatleri)
+        future_forecast = make_forecast(model, days=7, start=week_start)
 
         print(f"[OK] {len(future_forecast)} saatlik tahmin üretildi")
 
@@ -128,16 +123,10 @@ def setup_week_2():
     try:
         # Model dosyasını yükle
         model_path = os.path.join(script_dir, '../../models/prophet_model.json')
-        with open(model_path, 'r') as f:
-            model = model_from_json(f.read())
-
-        # 7 günlük tahmin
-        future = model.make_future_dataframe(periods=7*24, freq='H')
-        forecast = model.predict(future)
+        model = load_prophet(model_path)
 
-        # Sadece bu haftanın tahminlerini al
-        last_history_date = model.history['ds'].max()
-        future_forecast = forecast[forecast['ds'] > last_history_date].head(168)
+        # 7 günlük tahmin (sadece bu haftanın saatleri)
+        future_forecast = make_forecast(model, days=7, start=week_start)
 
         print(f"[OK] {len(future_forecast)} saatlik tahmin üretildi")
 
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+LSTM Toplu Tahmin - Kayan Pencere Çıkarımı
+===========================================
+
+EnsembleModel._predict_lstm ve train_lstm.predict_with_lstm her satır için
+24 saatlik pencereyi ayrı ayrı model.predict'e veriyordu: geçmiş bir dönem
+skorlanırken binlerce Keras çağrısı (her biri graf dispatch maliyetiyle) ve
+binlerce scaler.inverse_transform.
+
+Bu modül:
+- Tüm pencereleri kopyasız bir strided görünüm (sliding_window_view) olarak
+  kurar
+- Pencereleri PREDICT_BATCH_ROWS'luk bloklar halinde tek çağrıyla modele
+  verir (sadece o blok belleğe kopyalanır)
+- Ters ölçeklemeyi tek vektörel adımda yapar
+
+Satır i'nin tahmini eskisi gibi X[i - seq_length:i] penceresinden gelir;
+model çıkarım modunda (dropout kapalı, BatchNorm hareketli istatistikleri)
+çalıştığından her pencerenin sonucu bloktaki diğer pencerelerden bağımsızdır.
+
+TensorFlow import etmez; model nesnesi dışarıdan verilir.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Tek model çağrısındaki pencere sayısı
+PREDICT_BATCH_ROWS = 1024
+
+
+def sequence_windows(X, seq_length):
+    """
+    X[i - seq_length:i] pencerelerini kopyasız görünüm olarak döndürür.
+
+    Args:
+        X: (n_samples, n_features) dizi
+        seq_length: Pencere uzunluğu
+
+    Returns:
+        np.ndarray: (n_samples - seq_length, seq_length, n_features) salt-okunur
+                    görünüm; k. pencere satır seq_length + k'yı tahmin eder
+    """
+    X = np.asarray(X)
+    if len(X) <= seq_length:
+        return np.empty((0, seq_length, X.shape[1]), dtype=X.dtype)
+
+    # sliding_window_view pencere eksenini sona ekler: (n - L + 1, F, L)
+    windows = sliding_window_view(X, seq_length, axis=0).transpose(0, 2, 1)
+
+    # Son pencere (X[n - L:n]) verinin ötesini tahmin ederdi
+    return windows[:-1]
+
+
+def predict_windows(model, windows, scaler_y, batch_rows=PREDICT_BATCH_ROWS):
+    """
+    Pencereleri bloklar halinde modelden geçirir ve ters ölçekler.
+
+    Args:
+        model: Keras LSTM modeli (predict_on_batch)
+        windows: sequence_windows çıktısı
+        scaler_y: Hedef scaler'ı
+        batch_rows: Tek çağrıdaki pencere sayısı
+
+    Returns:
+        np.ndarray: (len(windows),) tahminler
+    """
+    if len(windows) == 0:
+        return np.empty(0)
+
+    outputs = []
+    for start in range(0, len(windows), batch_rows):
+        block = np.ascontiguousarray(windows[start:start + batch_rows])
+        outputs.append(np.asarray(model.predict_on_batch(block)).reshape(-1, 1))
+
+    # Model çıktısının dtype'ı korunur (satır satır yoldaki inverse_transform ile aynı)
+    return scaler_y.inverse_transform(np.concatenate(outputs)).ravel()
+
+
+def predict_sequences(model, X_scaled, scaler_y, seq_length, batch_rows=PREDICT_BATCH_ROWS):
+    """
+    Ölçeklenmiş feature dizisinin tüm kayan pencerelerini tahmin eder.
+
+    Returns:
+        np.ndarray: (len(X_scaled) - seq_length,) tahminler; k. değer
+                    satır seq_length + k içindir
+    """
+    windows = sequence_windows(X_scaled, seq_length)
+    return predict_windows(model, windows, scaler_y, batch_rows)
@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+NumPy LSTM Runtime - TensorFlow Olmadan LSTM Tahmini
+====================================================
+
+lstm_model.keras'ı yüklemek TensorFlow import eder (saniyeler, yüzlerce MB
+RSS). Tahmin için sadece ağırlıklar gerekir.
+
+- export_keras(): Eğitilmiş Sequential modeli (LSTM, BatchNormalization,
+  Dropout, Dense) kompakt bir .npz ağırlık dosyasına yazar
+    * BatchNormalization çıkarım modunda bir afin dönüşümdür
+      (x * scale + shift); bir sonraki LSTM / Dense katmanının girdi
+      ağırlıklarına katlanır (W' = diag(scale) W, b' = b + shift W)
+    * Dropout çıkarımda birim dönüşümdür, atlanır
+    * Ağırlık hassasiyeti: float32 (varsayılan), float16 veya int8
+      (çıkış kolonu başına simetrik ölçek); bias'lar float32 kalır
+- NumpyLSTM: Pencere batch'lerini saf NumPy ile ileri besler (float32).
+  predict_on_batch arayüzü lstm_inference.predict_windows ile uyumludur
+- load_lstm(): .npz güncelse TensorFlow import etmeden yükler; yoksa,
+  eskiyse (keras dosyasının sha256'sı değişti) veya hassasiyet farklıysa
+  keras modelinden yeniden üretir (TensorFlow gerekir)
+    * Tazelik içerik hash'i ile kontrol edilir: .npz keras dosyasıyla
+      birlikte repoya girer, temiz checkout'ta (mtime farklı) TensorFlow
+      gerekmez
+
+Hassasiyet LSTM_NUMPY_DTYPE ortam değişkeni ile seçilir.
+
+Kullanım:
+    model = load_lstm(LSTM_MODEL_PATH)          # NumpyLSTM
+    python lstm_numpy.py [--dtype float16|int8]  -> keras modelini dışa aktar
+"""
+
+import numpy as np
+import hashlib
+import json
+import os
+import sys
+
+# Format değişirse .npz keras modelinden yeniden üretilir
+EXPORT_VERSION = 2
+
+LSTM_MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/lstm_model.keras')
+
+WEIGHT_DTYPES = ('float32', 'float16', 'int8')
+
+# Ağırlık hassasiyeti (float32 | float16 | int8)
+WEIGHT_DTYPE = os.getenv('LSTM_NUMPY_DTYPE', 'float32').strip().lower()
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    # Taşmasız lojistik fonksiyon
+    'sigmoid': lambda x: 0.5 * (1.0 + np.tanh(0.5 * x)),
+}
+
+
+def numpy_path(keras_path):
+    """Keras modelinin ağırlık dosyası (models/x.keras -> models/x_numpy.npz)"""
+    return os.path.splitext(keras_path)[0] + '_numpy.npz'
+
+
+# ========================================
+# DIŞA AKTARMA
+# ========================================
+
+def fold_layers(layers):
+    """
+    Katman listesini çıkarım katmanlarına indirger (BatchNorm katlanır,
+    Dropout atılır).
+
+    Args:
+        layers (list): (sınıf adı, config dict, ağırlık listesi) üçlüleri;
+                       ağırlıklar keras get_weights() sırasıyla
+
+    Returns:
+        list: {'type', 'kernel', 'bias', ...} sözlükleri (float64)
+    """
+    folded = []
+    scale, shift = None, None   # Bir sonraki katmana katlanacak afin dönüşüm
+
+    for class_name, config, weights in layers:
+        if class_name in ('InputLayer', 'Dropout'):
+            continue
+
+        if class_name == 'BatchNormalization':
+            gamma = weights[0] if config.get('scale', True) else None
+            beta = weights[1 if gamma is not None else 0] if config.get('center', True) else None
+            mean, variance = weights[-2], weights[-1]
+
+            bn_scale = np.ones_like(mean, dtype=np.float64) if gamma is None else gamma.astype(np.float64)
+            bn_scale = bn_scale / np.sqrt(variance.astype(np.float64) + config.get('epsilon', 1e-3))
+            bn_shift = -mean * bn_scale + (0.0 if beta is None else beta)
+
+            # Art arda afin dönüşümler birleşir
+            if scale is None:
+                scale, shift = bn_scale, bn_shift
+            else:
+                scale, shift = scale * bn_scale, shift * bn_scale + bn_shift
+            continue
+
+        if class_name == 'LSTM':
+            if config.get('activation', 'tanh') != 'tanh' or \
+                    config.get('recurrent_activation', 'sigmoid') != 'sigmoid':
+                raise ValueError(f"Desteklenmeyen LSTM aktivasyonu: {config.get('name')}")
+            if config.get('go_backwards') or config.get('stateful'):
+                raise ValueError(f"Desteklenmeyen LSTM ayarı: {config.get('name')}")
+            kernel, recurrent = weights[0], weights[1]
+            bias = weights[2] if config.get('use_bias', True) else np.zeros(kernel.shape[1])
+            layer = {
+                'type': 'lstm',
+                'units': int(config['units']),
+                'return_sequences': bool(config.get('return_sequences', False)),
+                'recurrent_kernel': recurrent.astype(np.float64),
+            }
+        elif class_name == 'Dense':
+            kernel = weights[0]
+            bias = weights[1] if config.get('use_bias', True) else np.zeros(kernel.shape[1])
+            activation = config.get('activation', 'linear')
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Desteklenmeyen Dense aktivasyonu: {activation}")
+            layer = {'type': 'dense', 'activation': activation}
+        else:
+            raise ValueError(f"Desteklenmeyen katman: {class_name}")
+
+        kernel = kernel.astype(np.float64)
+        bias = bias.astype(np.float64)
+        if scale is not None:
+            bias = bias + shift @ kernel
+            kernel = scale[:, None] * kernel
+            scale, shift = None, None
+
+        layer['kernel'] = kernel
+        layer['bias'] = bias
+        folded.append(layer)
+
+    if scale is not None:
+        raise ValueError("Son katman BatchNormalization olamaz (katlanacak katman yok)")
+    return folded
+
+
+def _quantize(values, dtype):
+    """
+    Ağırlık matrisini saklama hassasiyetine çevirir.
+
+    Returns:
+        dict: {'': dizi} veya int8 için {'': int8 dizi, '_scale': kolon ölçekleri}
+    """
+    if dtype == 'float32':
+        return {'': values.astype(np.float32)}
+    if dtype == 'float16':
+        return {'': values.astype(np.float16)}
+
+    # int8: çıkış kolonu başına simetrik ölçek
+    col_scale = np.abs(values).max(axis=0) / 127.0
+    col_scale[col_scale == 0] = 1.0
+    quantized = np.clip(np.round(values / col_scale), -127, 127).astype(np.int8)
+    return {'': quantized, '_scale': col_scale.astype(np.float32)}
+
+
+def save_layers(layers, path, dtype=WEIGHT_DTYPE, source=None):
+    """
+    Katlanmış katmanları .npz dosyasına atomik yazar.
+
+    Args:
+        layers (list): fold_layers çıktısı
+        dtype (str): Ağırlık hassasiyeti (WEIGHT_DTYPES)
+        source (dict, optional): Kaynak keras dosyası bilgisi (sha256)
+    """
+    if dtype not in WEIGHT_DTYPES:
+        raise ValueError(f"Desteklenmeyen hassasiyet: {dtype} ({', '.join(WEIGHT_DTYPES)})")
+
+    arrays = {}
+    spec_layers = []
+    for i, layer in enumerate(layers):
+        spec_layers.append({k: v for k, v in layer.items() if not isinstance(v, np.ndarray)})
+        for name in ('kernel', 'recurrent_kernel'):
+            if name in layer:
+                for suffix, values in _quantize(layer[name], dtype).items():
+                    arrays[f'{i}_{name}{suffix}'] = values
+        arrays[f'{i}_bias'] = layer['bias'].astype(np.float32)
+
+    spec = {'version': EXPORT_VERSION, 'dtype': dtype, 'source': source, 'layers': spec_layers}
+    arrays['spec'] = np.array(json.dumps(spec))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+def _source_info(keras_path):
+    """Keras dosyasının tazelik bilgisi (içerik hash'i; mtime checkout'ta değişir)"""
+    digest = hashlib.sha256()
+    with open(keras_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return {'sha256': digest.hexdigest()}
+
+
+def export_keras(model, path, dtype=WEIGHT_DTYPE, keras_path=None):
+    """
+    Eğitilmiş keras Sequential modelini .npz ağırlık dosyasına aktarır.
+
+    Args:
+        model: keras.Sequential
+        path (str): Hedef .npz
+        dtype (str): Ağırlık hassasiyeti
+        keras_path (str, optional): Kaydedilmiş .keras dosyası (tazelik kontrolü için)
+    """
+    layers = fold_layers([
+        (layer.__class__.__name__, layer.get_config(),
+         [np.asarray(w) for w in layer.get_weights()])
+        for layer in model.layers
+    ])
+    source = _source_info(keras_path) if keras_path and os.path.exists(keras_path) else None
+    save_layers(layers, path, dtype=dtype, source=source)
+
+    size_kb = os.path.getsize(path) / 1024
+    print(f"[+] LSTM NumPy ağırlıkları kaydedildi: {path} ({dtype}, {size_kb:.0f} KB)")
+
+
+# ========================================
+# RUNTIME
+# ========================================
+
+class NumpyLSTM:
+    """Dışa aktarılmış LSTM ağının saf NumPy ileri beslemesi"""
+
+    def __init__(self, spec, arrays):
+        """
+        Args:
+            spec (dict): save_layers spec'i
+            arrays (dict): .npz dizileri
+        """
+        self.spec = spec
+        self.dtype = spec['dtype']
+        self.layers = []
+        for i, layer_spec in enumerate(spec['layers']):
+            layer = dict(layer_spec)
+            for name in ('kernel', 'recurrent_kernel'):
+                key = f'{i}_{name}'
+                if key not in arrays:
+                    continue
+                values = arrays[key].astype(np.float32)
+                if f'{key}_scale' in arrays:
+                    values *= arrays[f'{key}_scale']
+                layer[name] = values
+            layer['bias'] = arrays[f'{i}_bias'].astype(np.float32)
+            self.layers.append(layer)
+
+    @classmethod
+    def load(cls, path):
+        """.npz dosyasından yükler"""
+        with np.load(path) as data:
+            spec = json.loads(str(data['spec']))
+            if spec.get('version') != EXPORT_VERSION:
+                raise ValueError(f"Desteklenmeyen LSTM ağırlık sürümü: {spec.get('version')}")
+            arrays = {name: data[name] for name in data.files if name != 'spec'}
+        return cls(spec, arrays)
+
+    @staticmethod
+    def _lstm(x, layer):
+        """(batch, T, F) -> (batch, T, U) veya (batch, U); kapı sırası i, f, c, o"""
+        units = layer['units']
+        sigmoid = ACTIVATIONS['sigmoid']
+
+        # Girdi katkısı tüm zaman adımları için tek matmul
+        projected = x @ layer['kernel'] + layer['bias']
+        recurrent = layer['recurrent_kernel']
+
+        h = np.zeros((len(x), units), dtype=np.float32)
+        c = np.zeros((len(x), units), dtype=np.float32)
+        outputs = []
+        for t in range(x.shape[1]):
+            z = projected[:, t] + h @ recurrent
+            i = sigmoid(z[:, :units])
+            f = sigmoid(z[:, units:2 * units])
+            g = np.tanh(z[:, 2 * units:3 * units])
+            o = sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if layer['return_sequences']:
+                outputs.append(h)
+
+        return np.stack(outputs, axis=1) if layer['return_sequences'] else h
+
+    def predict_on_batch(self, x):
+        """
+        Args:
+            x: (batch, seq_length, n_features) pencereler
+
+        Returns:
+            np.ndarray: (batch, 1) ölçeklenmiş tahminler (float32)
+        """
+        out = np.asarray(x, dtype=np.float32)
+        for layer in self.layers:
+            if layer['type'] == 'lstm':
+                out = self._lstm(out, layer)
+            else:
+                out = ACTIVATIONS[layer['activation']](out @ layer['kernel'] + layer['bias'])
+        return out
+
+    def predict(self, x, batch_size=1024, verbose=0):
+        """keras Model.predict uyumlu toplu tahmin"""
+        x = np.asarray(x)
+        if len(x) == 0:
+            return np.empty((0, 1), dtype=np.float32)
+        return np.concatenate([
+            self.predict_on_batch(x[start:start + batch_size])
+            for start in range(0, len(x), batch_size)
+        ])
+
+
+def read_spec(path):
+    """.npz spec'i (yoksa / okunamıyorsa None)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            return json.loads(str(data['spec']))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def is_current(path, keras_path, dtype=WEIGHT_DTYPE):
+    """Ağırlık dosyası keras modeliyle güncel mi? (keras yoksa dosya geçerli sayılır)"""
+    spec = read_spec(path)
+    if spec is None or spec.get('version') != EXPORT_VERSION:
+        return False
+    if not os.path.exists(keras_path):
+        return True
+    return spec.get('dtype') == dtype and spec.get('source') == _source_info(keras_path)
+
+
+def load_lstm(keras_path=LSTM_MODEL_PATH, dtype=WEIGHT_DTYPE):
+    """
+    LSTM modelini NumPy runtime ile yükler; ağırlık dosyası yoksa veya
+    eskiyse keras modelinden üretir (sadece bu durumda TensorFlow import
+    edilir).
+
+    Returns:
+        NumpyLSTM
+    """
+    path = numpy_path(keras_path)
+    if is_current(path, keras_path, dtype):
+        return NumpyLSTM.load(path)
+
+    if not os.path.exists(keras_path):
+        raise FileNotFoundError(f"LSTM modeli bulunamadı: {keras_path}")
+
+    print(f"[*] LSTM NumPy ağırlıkları üretiliyor: {path}")
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    from tensorflow import keras
+
+    export_keras(keras.models.load_model(keras_path), path, dtype=dtype, keras_path=keras_path)
+    return NumpyLSTM.load(path)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    weight_dtype = WEIGHT_DTYPE
+    if '--dtype' in argv:
+        i = argv.index('--dtype')
+        weight_dtype = argv[i + 1]
+        del argv[i:i + 2]
+    keras_file = argv[0] if argv else LSTM_MODEL_PATH
+
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    from tensorflow import keras
+
+    export_keras(keras.models.load_model(keras_file), numpy_path(keras_file),
+                 dtype=weight_dtype, keras_path=keras_file)
+    model = NumpyLSTM.load(numpy_path(keras_file))
+    print(f"[*] {len(model.layers)} katman: "
+          + ", ".join(layer['type'] + ('/' + layer['activation'] if 'activation' in layer else '')
+                      for layer in model.layers))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Bellek Raporu - Veri Yükleme Yolları Karşılaştırması
+=====================================================
+
+Mevcut yol (load_combined_data + engineer_features) ile düşük bellekli yol
+(load_combined_data_compact + engineer_features(compact=True)) için:
+- tracemalloc ile tepe (peak) bellek
+- Sonuç DataFrame boyutu (memory_usage(deep=True))
+- Satır başına byte ve 10 yıllık saatlik veri için tahmin
+
+Kullanım:
+    python memory_report.py
+"""
+
+import tracemalloc
+import time
+import os
+import sys
+
+import numpy as np
+
+# Database path configuration
+try:
+    from db_config import DB_PATH
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import DB_PATH
+
+from features import (
+    load_combined_data,
+    load_combined_data_compact,
+    engineer_features
+)
+
+# 10 yıllık saatlik veri (raporda ölçekleme için)
+TEN_YEARS_HOURS = 10 * 8766
+
+
+def measure(name, fn):
+    """fn() çalıştırır; tepe bellek, süre ve sonuç boyutunu döndürür"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'name': name,
+        'rows': len(df),
+        'peak': peak,
+        'frame': int(df.memory_usage(deep=True).sum()),
+        'seconds': elapsed,
+        'df': df,
+    }
+
+
+def print_report(results):
+    """Karşılaştırma tablosunu yazdırır"""
+    mb = 1024 ** 2
+
+    print("\n" + "=" * 78)
+    print("BELLEK RAPORU")
+    print("=" * 78)
+    print(f"{'Yol':<12} {'Satır':>8} {'Peak (MB)':>10} {'DF (MB)':>9} "
+          f"{'B/satır':>8} {'10 yıl DF (MB)':>15} {'Süre (s)':>9}")
+    print("-" * 78)
+
+    for r in results:
+        per_row = r['frame'] / max(r['rows'], 1)
+        print(f"{r['name']:<12} {r['rows']:>8} {r['peak'] / mb:>10.1f} {r['frame'] / mb:>9.1f} "
+              f"{per_row:>8.0f} {per_row * TEN_YEARS_HOURS / mb:>15.1f} {r['seconds']:>9.2f}")
+
+    base, compact = results
+    print("-" * 78)
+    print(f"Peak bellek azalması: %{100 * (1 - compact['peak'] / base['peak']):.1f}")
+    print(f"DataFrame azalması:   %{100 * (1 - compact['frame'] / base['frame']):.1f}")
+
+    # Compact yolun doğruluk kontrolü (float32 yuvarlaması dışında aynı olmalı)
+    a, b = base['df'], compact['df']
+    if len(a) == len(b) and list(a.columns) == list(b.columns):
+        max_rel = 0.0
+        for col in a.columns:
+            if col == 'ds':
+                continue
+            x = a[col].to_numpy(dtype=np.float64)
+            z = b[col].to_numpy(dtype=np.float64)
+            mask = ~np.isnan(x)
+            denom = np.maximum(np.abs(x[mask]), 1.0)
+            if mask.any():
+                max_rel = max(max_rel, float(np.max(np.abs(x[mask] - z[mask]) / denom)))
+        print(f"Maks. göreli fark:    {max_rel:.2e} (float32 yuvarlaması)")
+    else:
+        print("[!] Uyarı: İki yolun çıktısı aynı yapıda değil")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Veri Yükleme Bellek Karşılaştırması")
+    print("=" * 60)
+    print(f"[*] Veritabanı: {DB_PATH}")
+
+    results = [
+        measure('mevcut', lambda: engineer_features(load_combined_data())),
+        measure('compact', lambda: engineer_features(load_combined_data_compact(), compact=True)),
+    ]
+
+    print_report(results)
@@ -10,9 +10,7 @@ gelecek günler için MCP fiyat tahminleri yapar.
 
 import pandas as pd
 import numpy as np
-from prophet.serialize import model_from_json
 import matplotlib.pyplot as plt
-import sqlite3
 import os
 from datetime import datetime, timedelta
 import sys
@@ -20,58 +18,81 @@ import sys
 # Model ve database yolu
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model_v2.json')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../../models')
-# Database path configuration
+# Toplu DB yazma katmanı
 try:
-    from db_config import DB_PATH
+    from forecast_store import save_week_forecasts
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from forecast_store import save_week_forecasts
+
+from features import add_features
+# Prophet/Stan import etmeden tahmin (serialize edilmiş parametrelerden)
+from prophet_numpy import last_history_date
+from prophet_artifact import load_prophet
+from prophet_hourly import use_hourly_family, load_family
 
 def load_model():
-    """Eğitilmiş Prophet modelini yükler"""
+    """
+    Eğitilmiş Prophet modelini yükler
+
+    PROPHET_FAMILY=hourly ise saatlik model ailesi (prophet_hourly) döner;
+    make_forecast ikisiyle de aynı şekilde çalışır.
+    """
+    if use_hourly_family():
+        return load_family()
+
     print("[*] Model yukleniyor...")
 
-    with open(MODEL_PATH, 'r') as f:
-        model = model_from_json(f.read())
+    model = load_prophet(MODEL_PATH)
 
     print(f"[+] Model basariyla yuklendi: {MODEL_PATH}")
     return model
 
-def make_forecast(model, days=7):
+def future_frame(model, days=7, start=None):
+    """
+    Sadece tahmin ufkunun saatlerini içeren ds dataframe'i oluşturur.
+
+    make_future_dataframe() tüm eğitim geçmişini + ufku döndürür; predict()
+    bunların hepsi için (belirsizlik simülasyonu dahil) çalışır ve geçmiş
+    satırlar atılırdı. Burada sadece istenen saatler üretilir.
+
+    Args:
+        model: Eğitilmiş Prophet / NumpyProphet modeli
+        days: Kaç günlük ufuk (days * 24 saat)
+        start: İlk tahmin saati (None ise eğitim verisinin son saatinden 1 saat sonra)
+
+    Returns:
+        pd.DataFrame: ds kolonu
+    """
+    if start is None:
+        start = last_history_date(model) + timedelta(hours=1)
+
+    return pd.DataFrame({'ds': pd.date_range(start=pd.Timestamp(start), periods=days*24, freq='H')})
+
+def make_forecast(model, days=7, start=None):
     """
     Gelecek için tahmin yapar
 
     Args:
-        model: Eğitilmiş Prophet modeli
+        model: Eğitilmiş Prophet / NumpyProphet modeli
         days: Kaç gün ileriye tahmin yapılacak
+        start: İlk tahmin saati (None ise eğitim verisinin hemen sonrası)
 
     Returns:
         pd.DataFrame: Tahmin sonuçları
     """
     print(f"\n[*] {days} gun ileriye tahmin yapiliyor...")
 
-    # Gelecek tarihler için dataframe oluştur (saatlik)
-    future = model.make_future_dataframe(periods=days*24, freq='H')
+    # Sadece ufuk saatleri (geçmiş tekrar tahmin edilmez)
+    future = future_frame(model, days=days, start=start)
 
-    # FEATURE ENGINEERING: Gelecek tarihler için de feature'ları ekle
+    # FEATURE ENGINEERING: Sadece modelin regressor'ları hesaplanır
+    # (v2 model için extreme_low_risk)
     print("[*] Feature engineering (gelecek tarihler icin)...")
-    future['hour'] = future['ds'].dt.hour
-    future['is_weekend'] = (future['ds'].dt.dayofweek >= 5).astype(int)
-    future['is_peak_hour'] = future['hour'].isin([8, 9, 10, 18, 19, 20, 21]).astype(int)
-    future['is_daytime'] = future['hour'].isin(range(10, 16)).astype(int)
-    future['day_of_week'] = future['ds'].dt.dayofweek
-
-    # Extreme low risk regressor (v2 model için gerekli)
-    future['is_sunday'] = future['ds'].dt.dayofweek == 6
-    future['is_midday'] = future['hour'].isin([10, 11, 12, 13, 14])
-    future['extreme_low_risk'] = (future['is_sunday'] & future['is_midday']).astype(int)
+    future = add_features(future, list(model.extra_regressors))
 
     # Tahmin yap
-    forecast = model.predict(future)
-
-    # Sadece gelecek tarihleri al
-    last_date = model.history['ds'].max()
-    future_forecast = forecast[forecast['ds'] > last_date]
+    future_forecast = model.predict(future)
 
     print(f"[+] Tahmin tamamlandi: {len(future_forecast)} saatlik veri")
     print(f"[*] Tarih araligi: {future_forecast['ds'].min()} -> {future_forecast['ds'].max()}")
@@ -169,37 +190,8 @@ def save_forecast_to_db(forecast, week_start, week_end):
     print(f"\n[*] Tahminler database'e kaydediliyor...")
     print(f"   Hafta: {week_start} - {week_end}")
 
-    conn = sqlite3.connect(DB_PATH)
-
-    # Önce bu hafta için eski kayıtları sil (varsa)
-    delete_query = "DELETE FROM forecast_history WHERE week_start = ?"
-    conn.execute(delete_query, (week_start,))
-
-    # Yeni tahminleri ekle (bileşen değerleri opsiyonel)
-    insert_query = """
-        INSERT INTO forecast_history (
-            week_start, week_end, forecast_datetime, predicted_price,
-            prophet_component, xgboost_component, lstm_component
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """
-
-    inserted = 0
-    for _, row in forecast.iterrows():
-        # Tarihi string'e çevir (timezone'suz)
-        forecast_dt = row['ds'].strftime('%Y-%m-%d %H:%M:%S')
-        predicted = float(row['yhat'] if 'yhat' in row else row.get('predicted_price', 0))
-        
-        # Bileşen değerlerini al (varsa)
-        prophet = float(row['prophet_component']) if 'prophet_component' in row else None
-        xgboost = float(row['xgboost_component']) if 'xgboost_component' in row else None
-        lstm = float(row['lstm_component']) if 'lstm_component' in row else None
-
-        conn.execute(insert_query, (week_start, week_end, forecast_dt, predicted, prophet, xgboost, lstm))
-        inserted += 1
-
-    conn.commit()
-    conn.close()
+    # Haftanın eski kayıtları silinir, yenileri toplu eklenir (tek transaction)
+    inserted = save_week_forecasts(forecast, week_start, week_end, replace_week=True)
 
     print(f"[+] {inserted} tahmin kaydı database'e eklendi")
 
@@ -232,15 +224,16 @@ def main():
     print("EPIAS MCP Fiyat Tahmini - Gelecek Tahminleri")
     print("="*60)
 
-    # Kullanıcıdan gün sayısı al (varsayılan 7)
+    # Kullanıcıdan gün sayısı (varsayılan 7) ve opsiyonel başlangıç saati al
     import sys
     days = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    start = sys.argv[2] if len(sys.argv) > 2 else None
 
     # 1. Modeli yükle
     model = load_model()
 
     # 2. Tahmin yap
-    forecast = make_forecast(model, days=days)
+    forecast = make_forecast(model, days=days, start=start)
 
     # 3. Görselleştir
     daily_avg = visualize_forecast(forecast, days=days)
@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Prophet Artifact - Kompakt İkili Prophet Model Dosyası
+======================================================
+
+Prophet JSON'u (model_to_json) tüm eğitim geçmişini metin olarak içerir;
+her yüklemede megabaytlarca JSON parse edilir ve dosya geçmişle birlikte
+büyür. Tahmin için sadece fit parametreleri ve model tanımı gerekir.
+
+Yapı:
+    prophet_model_v2_artifact/
+        spec.json            -> sürüm, model tanımı (NumpyProphet spec'i),
+                                içerik hash'i, kaynak JSON bilgisi, fit bilgisi
+        params/k.npy         -> fit parametreleri (PARAM_ARRAYS, her biri ayrı)
+        history/ds.npy       -> eğitim geçmişi (ds, y, Prophet'in standartlaştırdığı
+        history/y.npy           regressor'lar, trend); tahminde okunmaz,
+                                load_history() ham değerlerle döndürür
+        fitted/meta.json     -> in-sample tahminlerin ait olduğu model hash'i
+        fitted/yhat.npy      -> eğitim geçmişindeki yhat, trend ve bileşenler
+                                (residual modelleri için, fitted_values())
+
+Özellikler:
+- Parametreler memory-map ile açılır (mmap_mode='r'); yükleme süresi ve
+  spec.json boyutu geçmiş uzunluğundan bağımsız
+- İçerik hash'i (sha256): spec + parametre dizileri; yüklemede doğrulanır,
+  yarım kalmış / bozuk artifact kullanılmaz
+- JSON uyumluluğu: convert_json() mevcut JSON'dan artifact üretir,
+  load_prophet() JSON değiştiyse (mtime / boyut) artifact'i yeniler
+- In-sample tahminler kayıt anında bir kez hesaplanır; XGBoost residual
+  eğitimi tüm geçmişi yeniden tahmin etmek yerine bunları okur
+
+Kullanım:
+    model = load_prophet(MODEL_PATH)       # NumpyProphet
+    python prophet_artifact.py [model.json ...]   -> dönüştür ve özetle
+"""
+
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from prophet_numpy import NumpyProphet, PARAM_ARRAYS, split_model_dict, _table_rows
+from hourly_series import HourlySeries, to_epoch_hours
+
+# Format değişirse artifact JSON'dan yeniden üretilir
+# (3: in-sample tahminler ham regressor değerleriyle)
+ARTIFACT_VERSION = 3
+
+# Kayıtlı in-sample yhat ile Prophet.predict arasındaki izin verilen fark (y_scale oranı)
+FITTED_RTOL = 1e-6
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), '../../models')
+
+
+def artifact_path(json_path):
+    """JSON model dosyasının artifact dizini (models/x.json -> models/x_artifact)"""
+    return os.path.splitext(json_path)[0] + '_artifact'
+
+
+def content_hash(spec, arrays):
+    """Spec + parametre dizilerinin sha256 hash'i (dtype ve şekil dahil)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(spec, sort_keys=True).encode('utf-8'))
+    for name in PARAM_ARRAYS:
+        values = np.ascontiguousarray(arrays[name])
+        digest.update(f'{name}:{values.dtype.str}:{values.shape}'.encode('utf-8'))
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def _history_arrays(model):
+    """Model sözlüğündeki eğitim geçmişi -> kolon dizileri"""
+    columns, rows = _table_rows(model['history'])
+    keep = ['y'] + [name for name, _ in model['extra_regressors'][1].items()]
+    history = {
+        'ds': pd.to_datetime([row['ds'] for row in rows]).values.astype('datetime64[ns]'),
+    }
+    for col in columns:
+        if col in keep:
+            history[col] = np.array([row[col] for row in rows], dtype=np.float64)
+    # Fit edilen geçmiş trendi (ölçekli, iterasyon x n)
+    history['trend'] = np.asarray(model['params']['trend'], dtype=np.float64)
+    return history
+
+
+def _fitted_arrays(model, spec, arrays, history):
+    """
+    Eğitim geçmişi üzerindeki in-sample tahminler (aralıksız).
+
+    Prophet geçmişi regressor'ları (x - mu) / std ile standartlaştırılmış
+    tutar; NumpyProphet.predict ham değer beklediği için önce geri çevrilir.
+
+    Returns:
+        dict: ds + yhat, trend ve bileşen kolonları
+    """
+    frame = pd.DataFrame({'ds': history['ds']})
+    for name, props in model['extra_regressors'][1].items():
+        frame[name] = history[name] * props['std'] + props['mu']
+    forecast = NumpyProphet(spec, arrays).predict(frame, intervals=None)
+
+    fitted = {'ds': history['ds']}
+    for col in forecast.columns:
+        if col != 'ds' and not col.endswith(('_lower', '_upper')):
+            fitted[col] = forecast[col].to_numpy(dtype=np.float64)
+    return fitted
+
+
+# ========================================
+# YAZMA
+# ========================================
+
+def save_artifact(model, path, source=None, fit=None):
+    """
+    Prophet model sözlüğünü artifact dizini olarak yazar.
+
+    Diziler önce geçici dizine yazılır, spec.json en son yazılıp dizin
+    yerine taşınır (yarım artifact hash doğrulamasından geçmez).
+
+    Args:
+        model (dict): model_to_json içeriği (json.loads edilmiş)
+        path (str): Artifact dizini
+        source (str, optional): Kaynak JSON dosyası (güncellik kontrolü için)
+        fit (dict, optional): Fit bilgisi (prophet_warm_start.fit_prophet)
+
+    Returns:
+        str: İçerik hash'i
+    """
+    spec, arrays = split_model_dict(model)
+    digest = content_hash(spec, arrays)
+
+    tmp_dir = path + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    for subdir in ('params', 'history', 'fitted'):
+        os.makedirs(os.path.join(tmp_dir, subdir))
+
+    history = _history_arrays(model)
+    for name in PARAM_ARRAYS:
+        np.save(os.path.join(tmp_dir, 'params', f'{name}.npy'), arrays[name])
+    for name, values in history.items():
+        np.save(os.path.join(tmp_dir, 'history', f'{name}.npy'), values)
+
+    fitted = _fitted_arrays(model, spec, arrays, history)
+    for name, values in fitted.items():
+        np.save(os.path.join(tmp_dir, 'fitted', f'{name}.npy'), values)
+    with open(os.path.join(tmp_dir, 'fitted', 'meta.json'), 'w') as f:
+        json.dump({'model_hash': digest, 'columns': list(fitted)}, f, indent=2)
+
+    meta = {
+        'version': ARTIFACT_VERSION,
+        'hash': digest,
+        'prophet_version': model.get('__prophet_version'),
+        'source': None,
+        'fit': fit,
+        'spec': spec,
+    }
+    if source is not None:
+        stat = os.stat(source)
+        meta['source'] = {
+            'path': os.path.basename(source),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+        }
+    with open(os.path.join(tmp_dir, 'spec.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_dir, path)
+    return digest
+
+
+def convert_json(json_path, path=None):
+    """
+    Mevcut Prophet JSON dosyasından artifact üretir (uyumluluk dönüştürücüsü).
+
+    Returns:
+        str: Artifact dizini
+    """
+    path = path or artifact_path(json_path)
+    with open(json_path, 'r') as f:
+        model = json.load(f)
+    save_artifact(model, path, source=json_path)
+    return path
+
+
+def save_prophet(model, json_path, fit_info=None):
+    """
+    Eğitilmiş Prophet modelini JSON (prophet uyumlu) + artifact olarak kaydeder.
+
+    Args:
+        model: prophet.Prophet (fit edilmiş)
+        json_path (str): JSON dosya yolu; artifact yanına yazılır
+        fit_info (dict, optional): Fit bilgisi (warm start için gerekli)
+    """
+    from prophet.serialize import model_to_json
+
+    content = model_to_json(model)
+    with open(json_path, 'w') as f:
+        f.write(content)
+    path = artifact_path(json_path)
+    save_artifact(json.loads(content), path, source=json_path, fit=fit_info)
+    verify_fitted(model, path)
+
+
+def verify_fitted(model, path, rtol=FITTED_RTOL):
+    """
+    Kayıtlı in-sample yhat'i Prophet'in kendi geçmiş tahminiyle karşılaştırır.
+
+    Args:
+        model: prophet.Prophet (fit edilmiş)
+        path (str): Artifact dizini
+
+    Raises:
+        ValueError: Fark y_scale * rtol'u aşarsa (residual modelleri bozulur)
+    """
+    uncertainty_samples = model.uncertainty_samples
+    model.uncertainty_samples = 0
+    try:
+        expected = model.predict()['yhat'].to_numpy()
+    finally:
+        model.uncertainty_samples = uncertainty_samples
+
+    stored = load_fitted(path, ['yhat'])['yhat'].to_numpy()
+    error = float(np.max(np.abs(stored - expected))) if len(stored) else 0.0
+    if len(stored) != len(expected) or error > rtol * model.y_scale:
+        raise ValueError(f"In-sample tahminler Prophet ile uyuşmuyor: {path} (max fark {error:.4g})")
+
+
+# ========================================
+# OKUMA
+# ========================================
+
+def read_meta(path):
+    """spec.json içeriği (yoksa None)"""
+    meta_path = os.path.join(path, 'spec.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r') as f:
+        return json.load(f)
+
+
+def load_artifact(path, verify=True):
+    """
+    Artifact dizininden NumpyProphet yükler (parametreler memory-map).
+
+    Args:
+        path (str): Artifact dizini
+        verify (bool): İçerik hash'ini doğrula
+
+    Returns:
+        NumpyProphet
+    """
+    meta = read_meta(path)
+    if meta is None or meta.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Geçersiz veya eski formatta artifact: {path}")
+
+    arrays = {
+        name: np.load(os.path.join(path, 'params', f'{name}.npy'), mmap_mode='r')
+        for name in PARAM_ARRAYS
+    }
+    if verify and content_hash(meta['spec'], arrays) != meta['hash']:
+        raise ValueError(f"Artifact hash uyuşmuyor: {path}")
+    return NumpyProphet(meta['spec'], arrays)
+
+
+def load_history(path, columns=None, standardized=False):
+    """
+    Artifact'teki eğitim geçmişini DataFrame olarak okur (memory-map).
+
+    Prophet geçmişindeki regressor'lar standartlaştırılmıştır; eğitim
+    verisiyle karşılaştırılabilsin diye spec'teki mu/std ile ham değere
+    çevrilir.
+
+    Args:
+        path (str): Artifact dizini
+        columns (list, optional): Okunacak kolonlar (None ise hepsi, trend hariç)
+        standardized (bool): Regressor'ları Prophet'in sakladığı gibi bırak
+
+    Returns:
+        pd.DataFrame: ds + kolonlar (regressor'lar varsayılan olarak ham değerleriyle)
+    """
+    meta = read_meta(path)
+    regressors = dict(meta['spec']['extra_regressors']) if meta and not standardized else {}
+    history_dir = os.path.join(path, 'history')
+    if columns is None:
+        columns = sorted(
+            os.path.splitext(name)[0] for name in os.listdir(history_dir)
+            if name not in ('ds.npy', 'trend.npy')
+        )
+    data = {'ds': np.load(os.path.join(history_dir, 'ds.npy'), mmap_mode='r')}
+    for col in columns:
+        values = np.load(os.path.join(history_dir, f'{col}.npy'), mmap_mode='r')
+        # trend (iterasyon x n) -> ortalama
+        data[col] = values.mean(axis=0) if values.ndim == 2 else values
+        if col in regressors:
+            data[col] = values * regressors[col]['std'] + regressors[col]['mu']
+    return pd.DataFrame(data, copy=False)
+
+
+def load_fitted(path, columns=None):
+    """
+    Artifact'teki in-sample tahminleri okur (memory-map).
+
+    Model hash'i spec.json ile eşleşmezse (başka modelin tahminleri) hata verir.
+
+    Args:
+        path (str): Artifact dizini
+        columns (list, optional): Okunacak kolonlar (None ise hepsi)
+
+    Returns:
+        pd.DataFrame: ds + kolonlar
+    """
+    meta = read_meta(path)
+    fitted_dir = os.path.join(path, 'fitted')
+    with open(os.path.join(fitted_dir, 'meta.json'), 'r') as f:
+        fitted_meta = json.load(f)
+    if meta is None or fitted_meta['model_hash'] != meta['hash']:
+        raise ValueError(f"In-sample tahminler modelle uyuşmuyor: {path}")
+
+    columns = columns or [col for col in fitted_meta['columns'] if col != 'ds']
+    data = {
+        col: np.load(os.path.join(fitted_dir, f'{col}.npy'), mmap_mode='r')
+        for col in ['ds'] + list(columns)
+    }
+    return pd.DataFrame(data, copy=False)
+
+
+def fitted_values(json_path, df, columns=('yhat',)):
+    """
+    df satırları için Prophet'in in-sample tahminleri.
+
+    Eğitim geçmişindeki saatler kayıtlı fitted dizilerinden epoch-saat
+    pozisyonuyla okunur; geçmişte olmayan saatler (örn. model eğitildikten
+    sonra gelen veri) modelle tahmin edilir.
+
+    Args:
+        json_path (str): Prophet JSON model dosyası
+        df: ds + regressor kolonları
+        columns (tuple): İstenen tahmin kolonları
+
+    Returns:
+        pd.DataFrame: df.index hizalı kolonlar
+    """
+    model = load_prophet(json_path)
+    fitted = load_fitted(artifact_path(json_path), columns)
+
+    series = HourlySeries.from_epoch_hours(
+        to_epoch_hours(fitted['ds']), {col: fitted[col].to_numpy() for col in columns}
+    )
+    positions = series.positions(df['ds'])
+    found = positions >= 0
+
+    out = pd.DataFrame(index=df.index)
+    for col in columns:
+        values = np.full(len(df), np.nan)
+        values[found] = series[col][positions[found]]
+        out[col] = values
+
+    if not found.all():
+        missing = df.loc[~found]
+        forecast = model.predict(missing, intervals=None)
+        for col in columns:
+            out.loc[~found, col] = forecast[col].to_numpy()
+
+    print(f"[+] Prophet in-sample: {int(found.sum())} satır kayıtlı, "
+          f"{int((~found).sum())} satır yeniden tahmin edildi")
+    return out
+
+
+def is_current(path, json_path):
+    """Artifact JSON kaynağıyla güncel mi? (JSON yoksa artifact geçerli sayılır)"""
+    meta = read_meta(path)
+    if meta is None or meta.get('version') != ARTIFACT_VERSION:
+        return False
+    if not os.path.exists(json_path):
+        return True
+    source = meta.get('source')
+    stat = os.stat(json_path)
+    return (
+        source is not None
+        and source['mtime_ns'] == stat.st_mtime_ns
+        and source['size'] == stat.st_size
+    )
+
+
+def load_prophet(json_path):
+    """
+    Prophet modelini artifact'ten yükler; artifact yoksa, eskiyse ya da
+    bozuksa JSON'dan dönüştürüp kaydeder.
+
+    Args:
+        json_path (str): Prophet JSON model dosyası
+
+    Returns:
+        NumpyProphet
+    """
+    path = artifact_path(json_path)
+    if is_current(path, json_path):
+        try:
+            return load_artifact(path)
+        except (ValueError, OSError) as e:
+            if not os.path.exists(json_path):
+                raise
+            print(f"[!] {e}, JSON'dan yeniden üretiliyor")
+
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"Prophet modeli bulunamadı: {json_path}")
+
+    print(f"[*] Prophet artifact üretiliyor: {path}")
+    convert_json(json_path, path)
+    return load_artifact(path)
+
+
+def _dir_size(path):
+    """Dizin içindeki dosyaların toplam boyutu (byte)"""
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or [
+        os.path.join(MODELS_DIR, name) for name in sorted(os.listdir(MODELS_DIR))
+        if name.startswith('prophet_model') and name.endswith('.json')
+    ]
+
+    print("=" * 60)
+    print("Prophet JSON -> Artifact Dönüşümü")
+    print("=" * 60)
+
+    for json_path in paths:
+        path = convert_json(json_path)
+        meta = read_meta(path)
+
+        start = time.perf_counter()
+        load_artifact(path)
+        elapsed = time.perf_counter() - start
+
+        params_size = _dir_size(os.path.join(path, 'params'))
+        spec_size = os.path.getsize(os.path.join(path, 'spec.json'))
+        print(f"\n[+] {os.path.basename(json_path)} -> {os.path.basename(path)}")
+        print(f"    Hash: {meta['hash'][:16]}")
+        print(f"    JSON: {os.path.getsize(json_path) / 1024:.0f} KB, "
+              f"artifact (spec + params): {(spec_size + params_size) / 1024:.0f} KB, "
+              f"history: {_dir_size(os.path.join(path, 'history')) / 1024:.0f} KB")
+        print(f"    Yükleme: {elapsed * 1000:.1f} ms")
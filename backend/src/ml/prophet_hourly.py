@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Saatlik Prophet Ailesi - Teslim Saati Başına Bir Model
+=======================================================
+
+Gün öncesi fiyatları pratikte 24 ayrı seri gibi davranır (her teslim
+saatinin kendi seviyesi, hafta içi / mevsim deseni vardır). Tek v2 modeli
+(train_prophet_improved) tüm saatleri tek seride, ortak mevsimselliklerle
+eğitir.
+
+Bu modül opsiyonel bir alternatiftir:
+- Her teslim saati (0-23) için günlük seride ayrı, küçük bir Prophet modeli
+  (yıllık + haftalık mevsimsellik, bayram + TR tatilleri; gün içi desen
+  saat ayrımıyla zaten modellenir)
+- 24 fit süreç havuzunda (spawn) paralel; her fit tek modelin ~1/24'ü kadar
+- Modeller tek bir JSON paketi olarak kaydedilir; tahmin tarafı Prophet
+  import etmeden NumpyProphet ile çalışır
+- HourlyProphetFamily, predict.make_forecast'in beklediği arayüzü sağlar
+  (predict, extra_regressors, history_end)
+
+Açmak için: PROPHET_FAMILY=hourly (ortam değişkeni veya backend/.env);
+predict.load_model ve weekly_workflow_v2 bu ayara göre modeli seçer.
+
+Kullanım:
+    python prophet_hourly.py [end_date] [--workers N]
+"""
+
+import numpy as np
+import pandas as pd
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Database path configuration (backend/.env'yi yükler; PROPHET_FAMILY orada da tanımlanabilir)
+try:
+    import db_config
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import db_config
+
+from prophet_numpy import DEFAULT_INTERVALS, NumpyProphet, split_model_dict
+from walk_forward import _init_worker
+
+FAMILY_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_hourly.json')
+
+# Model ailesi seçimi: 'single' (v2, varsayılan) veya 'hourly'
+FAMILY_ENV = 'PROPHET_FAMILY'
+
+# Paket formatı değişirse yeniden eğitim gerekir
+BUNDLE_VERSION = 1
+
+HOURS = range(24)
+
+
+def use_hourly_family():
+    """PROPHET_FAMILY=hourly ise True"""
+    return os.getenv(FAMILY_ENV, 'single').strip().lower() == 'hourly'
+
+
+def build_hour_model():
+    """
+    Bir teslim saatinin günlük serisi için Prophet modeli (fit edilmemiş)
+
+    Returns:
+        Prophet: Tatilleri eklenmiş model
+    """
+    from prophet import Prophet
+    from calendar_table import bayram_holidays
+
+    model = Prophet(
+        holidays=bayram_holidays(),
+        daily_seasonality=False,   # Seride gün başına tek gözlem var
+        weekly_seasonality=True,
+        yearly_seasonality=True,
+        changepoint_prior_scale=0.05,
+        holidays_prior_scale=10.0,
+        seasonality_prior_scale=10.0,
+        interval_width=0.95,
+    )
+    model.add_country_holidays('TR')
+    return model
+
+
+def _fit_hour(hour, train):
+    """
+    Bir saatin modelini eğitir (işçide çalışır).
+
+    Returns:
+        dict: hour, model (JSON string), fit bilgisi
+    """
+    from prophet.serialize import model_to_json
+    from prophet_warm_start import optimizer_iterations
+
+    model = build_hour_model()
+
+    start = time.perf_counter()
+    model.fit(train)
+    seconds = time.perf_counter() - start
+
+    return {
+        'hour': hour,
+        'model': model_to_json(model),
+        'fit': {
+            'rows': len(train),
+            'seconds': round(seconds, 3),
+            'iterations': optimizer_iterations(model),
+        },
+    }
+
+
+class HourlyProphetFamily:
+    """24 saatlik NumpyProphet modeli; tek model gibi tahmin yapar"""
+
+    def __init__(self, models, fit=None):
+        """
+        Args:
+            models (dict): saat -> NumpyProphet
+            fit (dict, optional): saat -> fit bilgisi
+        """
+        missing = [hour for hour in HOURS if hour not in models]
+        if missing:
+            raise ValueError(f"Eksik saat modelleri: {missing}")
+        self.models = models
+        self.fit = fit or {}
+
+        # predict.make_forecast arayüzü: saat modellerinde regressor yok
+        self.extra_regressors = {}
+        self.start = min(model.start for model in models.values())
+        self.t_scale = self.history_end - self.start
+
+    @property
+    def history_end(self):
+        """Eğitim verisinin son saati (saat modellerinin son gözlemlerinin en geçi)"""
+        return max(model.history_end for model in self.models.values())
+
+    @classmethod
+    def load(cls, path=FAMILY_PATH):
+        """JSON paketinden yükler (Prophet import edilmez)"""
+        with open(path, 'r') as f:
+            bundle = json.load(f)
+        if bundle.get('version') != BUNDLE_VERSION:
+            raise ValueError(f"Desteklenmeyen paket sürümü: {bundle.get('version')}")
+
+        models = {
+            int(hour): NumpyProphet(*split_model_dict(json.loads(model_json)))
+            for hour, model_json in bundle['hours'].items()
+        }
+        fit = {int(hour): info for hour, info in bundle.get('fit', {}).items()}
+        return cls(models, fit)
+
+    def predict(self, df, intervals=DEFAULT_INTERVALS, n_samples=None, seed=None):
+        """
+        Her satırı kendi teslim saatinin modeliyle tahmin eder.
+
+        Args:
+            df: ds kolonu olan DataFrame (saatlik)
+            intervals, n_samples, seed: NumpyProphet.predict ile aynı
+
+        Returns:
+            pd.DataFrame: df satır sırasıyla tahminler
+        """
+        ds = pd.to_datetime(df['ds'])
+        hours = ds.dt.hour.to_numpy()
+
+        parts = []
+        for hour in np.unique(hours):
+            rows = np.flatnonzero(hours == hour)
+            forecast = self.models[int(hour)].predict(
+                df.iloc[rows][['ds']].reset_index(drop=True),
+                intervals=intervals, n_samples=n_samples, seed=seed
+            )
+            forecast.index = rows
+            parts.append(forecast)
+
+        return pd.concat(parts).sort_index().reset_index(drop=True)
+
+
+def load_family(path=FAMILY_PATH):
+    """Kayıtlı saatlik model ailesini yükler"""
+    print("[*] Saatlik Prophet ailesi yukleniyor...")
+    family = HourlyProphetFamily.load(path)
+    print(f"[+] 24 saat modeli yuklendi: {path}")
+    return family
+
+
+def save_family(results, path=FAMILY_PATH, end_date=None):
+    """
+    Saat modellerini tek JSON paketine atomik yazar.
+
+    Args:
+        results (list): _fit_hour çıktıları
+        end_date (str, optional): Eğitim kesim tarihi (bilgi amaçlı)
+    """
+    bundle = {
+        'version': BUNDLE_VERSION,
+        'created_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'end_date': end_date,
+        'hours': {str(r['hour']): r['model'] for r in sorted(results, key=lambda r: r['hour'])},
+        'fit': {str(r['hour']): r['fit'] for r in sorted(results, key=lambda r: r['hour'])},
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(bundle, f)
+    os.replace(tmp_path, path)
+
+
+def train_family(end_date=None, workers=None):
+    """
+    24 saat modelini paralel eğitir, değerlendirir ve kaydeder.
+
+    Args:
+        end_date (str, optional): Bu tarihe KADAR veri kullan (dahil degil!)
+        workers (int, optional): Süreç sayısı (None ise CPU sayısı)
+
+    Returns:
+        tuple: (family, mae, rmse, mape) - train_improved_model ile aynı
+    """
+    from train_prophet_improved import load_data
+
+    workers = min(workers or os.cpu_count() or 1, 24)
+
+    print("=" * 60)
+    print(f"Saatlik Prophet Ailesi Egitimi (24 model, {workers} surec)")
+    print("=" * 60)
+
+    df = load_data(end_date=end_date)
+    print(f"\n[*] Veri yuklendi: {len(df)} kayit")
+    if end_date:
+        print(f"    Data leakage önleme: {end_date} tarihine KADAR")
+
+    hours = df['ds'].dt.hour.to_numpy()
+    started = time.perf_counter()
+    results = []
+
+    # spawn: işçiler prophet/cmdstanpy'yi kendi geçici dizinleriyle import eder
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_fit_hour, hour, df.iloc[np.flatnonzero(hours == hour)][['ds', 'y']])
+            for hour in HOURS
+        ]
+        for task in as_completed(futures):
+            result = task.result()
+            results.append(result)
+            print(f"   [+] Saat {result['hour']:02d}: {result['fit']['rows']} gun, "
+                  f"{result['fit']['seconds']:.1f} sn [{len(results)}/24]")
+
+    elapsed = time.perf_counter() - started
+    total_fit = sum(r['fit']['seconds'] for r in results)
+    print(f"[+] Egitim tamamlandi: {elapsed:.1f} sn (toplam fit {total_fit:.1f} sn)")
+
+    save_family(results, end_date=end_date)
+    family = HourlyProphetFamily.load(FAMILY_PATH)
+
+    # Performans (son 168 saat, train_improved_model ile aynı)
+    test_df = df[-168:] if len(df) > 168 else df[:0]
+    if len(test_df) > 0:
+        y_true = test_df['y'].values
+        y_pred = family.predict(test_df[['ds']], intervals=None)['yhat'].values
+        mae = np.mean(np.abs(y_true - y_pred))
+        rmse = np.sqrt(np.mean((y_true - y_pred)**2))
+        mape = np.mean(np.abs((y_true - y_pred) / y_true)) * 100
+    else:
+        mae, rmse, mape = 0, 0, 0
+
+    print(f"\n[*] Test Performansi:")
+    print(f"    MAE: {mae:.2f} TRY")
+    print(f"    RMSE: {rmse:.2f} TRY")
+    print(f"    MAPE: {mape:.2f}%")
+    print(f"\n[+] Model paketi kaydedildi: {FAMILY_PATH}")
+    print("=" * 60)
+
+    return family, mae, rmse, mape
+
+
+def main(end_date=None, workers=None):
+    """Ana fonksiyon (train_prophet_improved.main ile aynı imza ve dönüş)"""
+    return train_family(end_date=end_date, workers=workers)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    n_workers = None
+    if '--workers' in argv:
+        i = argv.index('--workers')
+        n_workers = int(argv[i + 1])
+        del argv[i:i + 2]
+    main(end_date=argv[0] if argv else None, workers=n_workers)
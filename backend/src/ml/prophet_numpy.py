@@ -0,0 +1,461 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+NumPy Prophet Tahmincisi - Prophet/Stan Olmadan Tahmin
+======================================================
+
+Kaydedilmiş Prophet JSON'undaki fit parametrelerini (k, m, delta, beta,
+sigma_obs, changepoint'ler, mevsimsellik / tatil / regressor tanımları ve
+ölçekleri) okuyup Prophet.predict() ile aynı hesabı vektörel NumPy ile yapar:
+
+- Trend: parçalı doğrusal (piecewise linear) / flat
+- Mevsimsellik: Fourier serileri (koşullu mevsimsellik dahil)
+- Tatiller: özel tatiller (lower/upper window) + ülke tatilleri (holidays paketi)
+- Ek regressor'lar: eğitimdeki mu/std ile standartlaştırılır
+- Bileşenler: train_component_cols matrisiyle (additive ×y_scale)
+
+Aralıklar (yhat/trend _lower/_upper):
+- 'sample': Prophet'in vektörel simülasyonu (gelecek trend değişimleri +
+  gözlem gürültüsü), örnek sayısı ayarlanabilir
+- 'analytic': Aynı sürecin varyansından normal yaklaşımı (simülasyonsuz)
+- None: Aralık hesaplanmaz (alt/üst = tahmin)
+
+prophet / cmdstanpy import edilmez; sadece numpy, pandas ve holidays gerekir.
+Model JSON'u sadece json ile okunur (geçmiş veri tablosu parse edilmez);
+split_model_dict() tahmin için gereken spec + parametre dizilerini ayırır
+(ikili artifact için bkz. prophet_artifact.py).
+
+Kullanım:
+    model = NumpyProphet.load(MODEL_PATH)
+    forecast = model.predict(future)   # Prophet.predict ile aynı kolonlar
+"""
+
+import json
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import holidays as holidays_lib
+
+NANOSECONDS_PER_DAY = 86400 * 10**9
+
+# Varsayılan aralık yöntemi ('sample', 'analytic' veya None)
+DEFAULT_INTERVALS = 'sample'
+
+# Tahmin için gereken parametre dizileri (ikili artifact'te ayrı .npy dosyaları)
+PARAM_ARRAYS = ['k', 'm', 'delta', 'beta', 'sigma_obs', 'changepoints_t', 'component_matrix']
+
+
+def _table_rows(value):
+    """pandas to_json(orient='table') çıktısından (kolonlar, satırlar)"""
+    table = json.loads(value) if isinstance(value, str) else value
+    columns = [f['name'] for f in table['schema']['fields'] if f['name'] != 'index']
+    return columns, table['data']
+
+
+def _percentile(a, q, axis):
+    """np.nanpercentile ile aynı sonuç; NaN yoksa hızlı (satır satır değil) yol"""
+    if np.isnan(a).any():
+        return np.nanpercentile(a, q, axis=axis)
+    return np.percentile(a, q, axis=axis)
+
+
+def _series_values(value):
+    """pandas Series to_json() çıktısından değer listesi"""
+    if value is None:
+        return None
+    series = json.loads(value) if isinstance(value, str) else value
+    return series['data']
+
+
+def split_model_dict(model):
+    """
+    prophet.serialize model sözlüğünü (model_to_json içeriği) tahmin için
+    gereken küçük spec + parametre dizilerine ayırır. Eğitim geçmişi
+    (history, history_dates, params['trend']) spec'e alınmaz.
+
+    Returns:
+        tuple: (spec dict - JSON'a yazılabilir, arrays dict - np.ndarray)
+    """
+    seasonality_order, seasonality_props = model['seasonalities']
+    regressor_order, regressor_props = model['extra_regressors']
+    component_names, component_rows = _table_rows(model['train_component_cols'])
+    holidays = _table_rows(model['holidays'])[1] if model.get('holidays') is not None else []
+
+    spec = {
+        'growth': model['growth'],
+        'y_scale': float(model['y_scale']),
+        'y_min': model.get('y_min'),
+        'scaling': model.get('scaling', 'absmax'),
+        'logistic_floor': bool(model.get('logistic_floor', False)),
+        'start': float(model['start']),
+        't_scale': float(model['t_scale']),
+        'interval_width': float(model['interval_width']),
+        'uncertainty_samples': int(model['uncertainty_samples']),
+        'seasonalities': [[name, seasonality_props[name]] for name in seasonality_order],
+        'extra_regressors': [[name, regressor_props[name]] for name in regressor_order],
+        'component_modes': model['component_modes'],
+        'component_names': component_names,
+        'country_holidays': model.get('country_holidays'),
+        'train_holiday_names': _series_values(model.get('train_holiday_names')) or [],
+        'holidays': [
+            {
+                'holiday': row['holiday'],
+                'ds': row['ds'][:10],
+                'lower_window': int(row.get('lower_window') or 0),
+                'upper_window': int(row.get('upper_window') or 0),
+            }
+            for row in holidays
+        ],
+        'history_length': len(_series_values(model['history_dates'])),
+    }
+
+    params = model['params']
+    arrays = {
+        name: np.asarray(params[name], dtype=np.float64)
+        for name in ('k', 'm', 'delta', 'beta', 'sigma_obs')
+    }
+    arrays['changepoints_t'] = np.asarray(model['changepoints_t'], dtype=np.float64)
+    arrays['component_matrix'] = np.array(
+        [[row[c] for c in component_names] for row in component_rows], dtype=np.float64
+    )
+    return spec, arrays
+
+
+class NumpyProphet:
+    """Serialize edilmiş Prophet modelinden NumPy ile tahmin"""
+
+    def __init__(self, spec, arrays):
+        """
+        Args:
+            spec (dict): split_model_dict() spec'i
+            arrays (dict): PARAM_ARRAYS dizileri (memory-map olabilir)
+        """
+        if spec['logistic_floor'] or spec['growth'] == 'logistic':
+            raise NotImplementedError("Logistic growth desteklenmiyor")
+
+        self.spec = spec
+        self.growth = spec['growth']
+        self.y_scale = spec['y_scale']
+        self.floor = float(spec['y_min']) if spec['scaling'] == 'minmax' else 0.0
+        self.start = pd.Timestamp(spec['start'], unit='s')
+        self.t_scale = pd.Timedelta(seconds=spec['t_scale'])
+        self.interval_width = spec['interval_width']
+        self.uncertainty_samples = spec['uncertainty_samples']
+
+        self.changepoints_t = arrays['changepoints_t']
+        self.component_matrix = arrays['component_matrix']
+        self.component_names = spec['component_names']
+
+        # (iterasyon, n) şekli; k, m, sigma_obs iterasyon başına skaler
+        self.params = {name: arrays[name] for name in ('delta', 'beta')}
+        for name in ('k', 'm', 'sigma_obs'):
+            self.params[name] = arrays[name].reshape(-1)
+
+        self.seasonalities = [(name, props) for name, props in spec['seasonalities']]
+        self.extra_regressors = {name: props for name, props in spec['extra_regressors']}
+        self.component_modes = spec['component_modes']
+        self.country_holidays = spec['country_holidays']
+        self.train_holiday_names = spec['train_holiday_names']
+        self.custom_holidays = spec['holidays']
+        self.history_length = spec['history_length']
+
+        self.holiday_columns = self._holiday_columns()
+
+        n_seasonal = sum(2 * props['fourier_order'] for _, props in self.seasonalities)
+        n_features = n_seasonal + len(self.holiday_columns) + len(self.extra_regressors)
+        if n_features != self.component_matrix.shape[0]:
+            raise ValueError(
+                f"Feature sayısı uyuşmuyor: {n_features} != {self.component_matrix.shape[0]}"
+            )
+
+    # ========================================
+    # YÜKLEME
+    # ========================================
+
+    @classmethod
+    def load(cls, path):
+        """Prophet JSON dosyasından yükler (prophet.serialize.model_to_json formatı)"""
+        with open(path, 'r') as f:
+            return cls(*split_model_dict(json.load(f)))
+
+    @property
+    def history_end(self):
+        """Eğitim verisinin son saati (t=1)"""
+        return self.start + self.t_scale
+
+    # ========================================
+    # TATİLLER
+    # ========================================
+
+    def _holiday_windows(self):
+        """Tatil adı -> offset kümesi (eğitimde görülen isimler)"""
+        names = set(self.train_holiday_names)
+        windows = {}
+        for row in self.custom_holidays:
+            if row['holiday'] not in names:
+                continue
+            offsets = windows.setdefault(row['holiday'], set())
+            offsets.update(range(row['lower_window'], row['upper_window'] + 1))
+        for name in names:
+            # Ülke tatilleri pencere olmadan (sadece +0)
+            windows.setdefault(name, {0})
+        return windows
+
+    def _holiday_columns(self):
+        """Prophet ile aynı sırada (isim sıralı) tatil feature kolonları"""
+        columns = []
+        for name, offsets in self._holiday_windows().items():
+            for offset in offsets:
+                key = '{}_delim_{}{}'.format(name, '+' if offset >= 0 else '-', abs(offset))
+                columns.append((key, name, offset))
+        return sorted(columns)
+
+    def _holiday_days(self, days):
+        """
+        Tatil adı -> gün numaraları (epoch gün), tahmin yılları için.
+
+        Ülke tatilleri Prophet'in make_holidays_df'i gibi holidays paketinden
+        (en_US isimleri) üretilir.
+        """
+        out = {}
+        for row in self.custom_holidays:
+            day = np.datetime64(row['ds'], 'D').astype(np.int64)
+            out.setdefault(row['holiday'], []).append(day)
+
+        if self.country_holidays and len(days):
+            first, last = (pd.Timestamp(int(d) * NANOSECONDS_PER_DAY).year
+                           for d in (days.min(), days.max()))
+            country = getattr(holidays_lib, self.country_holidays)(
+                expand=False, language='en_US', years=range(first, last + 1)
+            )
+            for date in country:
+                day = np.datetime64(date, 'D').astype(np.int64)
+                for name in country.get_list(date):
+                    out.setdefault(name, []).append(day)
+
+        return {name: np.asarray(values, dtype=np.int64) for name, values in out.items()}
+
+    # ========================================
+    # FEATURE MATRİSİ
+    # ========================================
+
+    def _features(self, df, ns):
+        """Mevsimsellik + tatil + regressor matrisi (Prophet kolon sırası)"""
+        blocks = []
+
+        # Fourier (Prophet.fourier_series ile aynı zaman dönüşümü)
+        t_days = ns // 10**9 / (3600 * 24.)
+        for name, props in self.seasonalities:
+            x = t_days * np.pi * 2
+            order = props['fourier_order']
+            block = np.empty((len(ns), 2 * order))
+            for i in range(order):
+                c = x * (i + 1) / props['period']
+                block[:, 2 * i] = np.sin(c)
+                block[:, 2 * i + 1] = np.cos(c)
+            if props.get('condition_name') is not None:
+                block[~df[props['condition_name']].astype(bool).to_numpy()] = 0
+            blocks.append(block)
+
+        # Tatil göstergeleri (gün bazında)
+        if self.holiday_columns:
+            days = ns // NANOSECONDS_PER_DAY
+            holiday_days = self._holiday_days(days)
+            block = np.zeros((len(ns), len(self.holiday_columns)))
+            for j, (_, name, offset) in enumerate(self.holiday_columns):
+                if name in holiday_days:
+                    block[:, j] = np.isin(days, holiday_days[name] + offset)
+            blocks.append(block)
+
+        # Ek regressor'lar (eğitimdeki ölçekle)
+        for name, props in self.extra_regressors.items():
+            if name not in df:
+                raise ValueError(f"Regressor {name!r} missing from dataframe")
+            values = pd.to_numeric(df[name]).to_numpy(dtype=np.float64)
+            if np.isnan(values).any():
+                raise ValueError(f"Found NaN in column {name!r}")
+            blocks.append(((values - props['mu']) / props['std'])[:, None])
+
+        return np.hstack(blocks)
+
+    # ========================================
+    # TREND
+    # ========================================
+
+    def _trend(self, t, k, m, deltas):
+        """Ölçeklenmiş trend (Prophet.piecewise_linear / flat_trend)"""
+        if self.growth == 'flat':
+            return m * np.ones_like(t)
+        deltas_t = (self.changepoints_t[None, :] <= t[..., None]) * deltas
+        k_t = deltas_t.sum(axis=1) + k
+        m_t = (deltas_t * -self.changepoints_t).sum(axis=1) + m
+        return k_t * t + m_t
+
+    def _future_step(self, t):
+        """Gelecek satırların ortalama adımı (Prophet._sample_uncertainty ile aynı)"""
+        future_t = t[t > 1]
+        if len(future_t) > 1:
+            return np.diff(future_t).mean()
+        # Tek satırlık gelecek: geçmişin ortalama adımı (t geçmişte 0..1)
+        return 1.0 / max(self.history_length - 1, 1)
+
+    # ========================================
+    # TAHMİN
+    # ========================================
+
+    def predict(self, df, intervals=DEFAULT_INTERVALS, n_samples=None, seed=None):
+        """
+        Prophet.predict() ile aynı kolonlarda tahmin.
+
+        Args:
+            df: ds (+ regressor / koşul kolonları) içeren DataFrame
+            intervals (str): 'sample', 'analytic' veya None
+            n_samples (int, optional): 'sample' için örnek sayısı
+                                       (varsayılan modelin uncertainty_samples'ı)
+            seed (int, optional): Simülasyon tohumu
+
+        Returns:
+            pd.DataFrame
+        """
+        if len(df) == 0:
+            raise ValueError('Dataframe has no rows.')
+
+        df = df.copy()
+        df['ds'] = pd.to_datetime(df['ds'])
+        if df['ds'].dt.tz is not None:
+            raise ValueError('Column ds has timezone specified, which is not supported.')
+        df = df.sort_values('ds').reset_index(drop=True)
+
+        ns = df['ds'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        t = (ns - self.start.value) / self.t_scale.value
+
+        k = np.nanmean(self.params['k'])
+        m = np.nanmean(self.params['m'])
+        deltas = np.nanmean(self.params['delta'], axis=0)
+        trend = self._trend(t, k, m, deltas) * self.y_scale + self.floor
+
+        X = self._features(df, ns)
+        additive = set(self.component_modes['additive'])
+
+        lower_p = 100 * (1.0 - self.interval_width) / 2
+        upper_p = 100 * (1.0 + self.interval_width) / 2
+
+        components = {}
+        for j, name in enumerate(self.component_names):
+            comp = X @ (self.params['beta'] * self.component_matrix[:, j]).T
+            if name in additive:
+                comp *= self.y_scale
+            components[name] = np.nanmean(comp, axis=1)
+            components[name + '_lower'] = _percentile(comp, lower_p, axis=1)
+            components[name + '_upper'] = _percentile(comp, upper_p, axis=1)
+
+        yhat = trend * (1 + components['multiplicative_terms']) + components['additive_terms']
+
+        if intervals == 'sample':
+            bounds = self._sample_intervals(t, X, n_samples, seed, lower_p, upper_p)
+        elif intervals == 'analytic':
+            bounds = self._analytic_intervals(t, trend, yhat, components)
+        elif intervals is None:
+            bounds = {'yhat_lower': yhat, 'yhat_upper': yhat,
+                      'trend_lower': trend, 'trend_upper': trend}
+        else:
+            raise ValueError(f"Bilinmeyen aralık yöntemi: {intervals}")
+
+        out = {'ds': df['ds'], 'trend': trend}
+        out.update(bounds)
+        out.update(components)
+        out['yhat'] = yhat
+        return pd.DataFrame(out)
+
+    # ========================================
+    # ARALIKLAR
+    # ========================================
+
+    def _trend_shift_samples(self, t, n_samples, iteration, rng):
+        """Gelecek trend değişim simülasyonu (n_samples, len(t)), ölçeklenmemiş"""
+        out = np.zeros((n_samples, len(t)))
+        future = t > 1
+        n_future = int(future.sum())
+        if n_future == 0 or self.growth == 'flat':
+            return out
+
+        step = self._future_step(t)
+        likelihood = len(self.changepoints_t) * step
+        mean_delta = np.mean(np.abs(self.params['delta'][iteration])) + 1e-8
+
+        change = rng.uniform(size=(n_samples, n_future)) < likelihood
+        shifts = rng.laplace(0, mean_delta, size=change.shape) * change
+        shifts = (np.hstack([np.zeros((n_samples, 1)), shifts])[:, :-1] + shifts) / 2
+        out[:, future] = shifts.cumsum(axis=1).cumsum(axis=1) * step
+        return out
+
+    def _sample_intervals(self, t, X, n_samples, seed, lower_p, upper_p):
+        """Prophet'in vektörel posterior predictive simülasyonu"""
+        rng = np.random.default_rng(seed)
+        n_samples = n_samples or self.uncertainty_samples
+        n_iterations = self.params['k'].shape[0]
+        per_iteration = max(1, int(np.ceil(n_samples / float(n_iterations))))
+
+        s_a = self.component_matrix[:, self.component_names.index('additive_terms')]
+        s_m = self.component_matrix[:, self.component_names.index('multiplicative_terms')]
+
+        yhats, trends = [], []
+        for i in range(n_iterations):
+            beta = self.params['beta'][i]
+            xb_a = X @ (beta * s_a) * self.y_scale
+            xb_m = X @ (beta * s_m)
+
+            expected = self._trend(t, self.params['k'][i], self.params['m'][i],
+                                   self.params['delta'][i])
+            sims = (expected + self._trend_shift_samples(t, per_iteration, i, rng)) \
+                * self.y_scale + self.floor
+            noise = rng.normal(0, self.params['sigma_obs'][i], sims.shape) * self.y_scale
+
+            trends.append(sims)
+            yhats.append(sims * (1 + xb_m) + xb_a + noise)
+
+        yhats = np.vstack(yhats)
+        trends = np.vstack(trends)
+        return {
+            'yhat_lower': _percentile(yhats, lower_p, axis=0),
+            'yhat_upper': _percentile(yhats, upper_p, axis=0),
+            'trend_lower': _percentile(trends, lower_p, axis=0),
+            'trend_upper': _percentile(trends, upper_p, axis=0),
+        }
+
+    def _analytic_intervals(self, t, trend, yhat, components):
+        """
+        Simülasyonla aynı sürecin varyansından normal yaklaşımı.
+
+        Gelecek trend değişimleri ε_l = Laplace(0, b) * Bernoulli(p), bir önceki
+        adımla ortalanıp iki kez kümülatif toplanır; j. gelecek adımda
+        U_j = step * Σ_{l<=j} (j - l + 0.5) ε_l, Var(ε) = 2 b² p.
+        """
+        z = NormalDist().inv_cdf((1 + self.interval_width) / 2)
+        sigma = np.nanmean(self.params['sigma_obs']) * self.y_scale
+
+        trend_var = np.zeros(len(t))
+        future = t > 1
+        n_future = int(future.sum())
+        if n_future and self.growth != 'flat':
+            step = self._future_step(t)
+            likelihood = min(len(self.changepoints_t) * step, 1.0)
+            mean_delta = np.mean(np.abs(np.nanmean(self.params['delta'], axis=0))) + 1e-8
+            shift_var = 2 * mean_delta ** 2 * likelihood
+            weights = np.cumsum((np.arange(n_future) + 0.5) ** 2)
+            trend_var[future] = shift_var * weights * (step * self.y_scale) ** 2
+
+        trend_sd = np.sqrt(trend_var)
+        yhat_sd = np.sqrt(trend_var * (1 + components['multiplicative_terms']) ** 2 + sigma ** 2)
+        return {
+            'yhat_lower': yhat - z * yhat_sd,
+            'yhat_upper': yhat + z * yhat_sd,
+            'trend_lower': trend - z * trend_sd,
+            'trend_upper': trend + z * trend_sd,
+        }
+
+
+def last_history_date(model):
+    """Prophet veya NumpyProphet modelinin son eğitim saati"""
+    return model.start + model.t_scale
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Prophet Warm Start - Önceki Fit'ten Başlatılan Haftalık Yeniden Eğitim
+=======================================================================
+
+Haftalık döngü ve catch-up script'leri Prophet'i her hafta sıfırdan eğitir;
+oysa geçmiş sadece 168 satır uzamıştır. Stan optimizer'ı önceki modelin
+parametreleriyle (k, m, delta, beta, sigma_obs; Prophet fit(init=...))
+başlatılırsa çok daha az iterasyonda yakınsar.
+
+Warm start koşulları (aksi halde cold fit):
+- Önceki modelin artifact'i ve fit bilgisi var (prophet_artifact)
+- Model tanımı aynı (prior'lar, mevsimsellik, regressor'lar, tatiller)
+- Veri revizyonu yok: önceki geçmiş, yeni geçmişin başında aynen duruyor
+- Geçmiş, son cold fit'ten bu yana MAX_CHANGEPOINT_DRIFT'ten fazla büyümedi
+
+Changepoint'ler son cold fit'tekiyle aynı tarihlerde tutulur (delta'lar
+aynı noktaları ifade etsin diye); drift sınırı aşılınca cold fit ile
+yeniden yerleştirilir. Parametreler yeni y_scale / t_scale'e çevrilir.
+
+Fit süresi, iterasyon sayısı ve warm/cold kararı artifact'in spec.json
+dosyasına ('fit') yazılır.
+"""
+
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import re
+import time
+
+from prophet_artifact import artifact_path, is_current, read_meta, load_artifact, load_history
+
+# Son cold fit'ten sonra geçmiş bu oranda büyürse changepoint'ler yeniden yerleştirilir
+MAX_CHANGEPOINT_DRIFT = 0.10
+
+# Veri revizyonu kontrolünde tolerans
+REVISION_RTOL = 1e-9
+
+# Model tanımına giren Prophet ayarları
+CONFIG_ATTRIBUTES = [
+    'growth', 'n_changepoints', 'changepoint_range',
+    'yearly_seasonality', 'weekly_seasonality', 'daily_seasonality',
+    'seasonality_mode', 'seasonality_prior_scale', 'changepoint_prior_scale',
+    'holidays_prior_scale', 'holidays_mode', 'interval_width',
+    'country_holidays', 'scaling',
+]
+
+
+def config_signature(model, df):
+    """
+    Fit edilmemiş Prophet modelinin tanım hash'i.
+
+    Tatillerden sadece geçmiş aralığına düşenler alınır (gelecek yılların
+    eklenmesi fit'i değiştirmez).
+
+    Args:
+        model: prophet.Prophet (fit edilmemiş)
+        df: Eğitim verisi (ds)
+
+    Returns:
+        str: sha256
+    """
+    config = {name: getattr(model, name, None) for name in CONFIG_ATTRIBUTES}
+    config['seasonalities'] = {
+        name: {key: props[key] for key in ('period', 'fourier_order', 'prior_scale', 'mode')}
+        for name, props in model.seasonalities.items()
+    }
+    config['extra_regressors'] = {
+        name: {key: props[key] for key in ('prior_scale', 'standardize', 'mode')}
+        for name, props in model.extra_regressors.items()
+    }
+    if model.holidays is not None:
+        holidays = model.holidays[pd.to_datetime(model.holidays['ds']) <= df['ds'].max()]
+        config['holidays'] = [
+            [row.holiday, str(pd.Timestamp(row.ds).date()),
+             int(row.lower_window), int(row.upper_window)]
+            for row in holidays.itertuples()
+        ]
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def optimizer_iterations(model):
+    """
+    Son fit'in optimizer iterasyon sayısı (CmdStan çıktısından).
+
+    Returns:
+        int: İterasyon sayısı, okunamazsa None
+    """
+    stan_fit = getattr(model, 'stan_fit', None)
+    try:
+        with open(stan_fit.runset.stdout_files[0], 'r') as f:
+            lines = f.read().splitlines()
+    except (AttributeError, IndexError, OSError):
+        return None
+
+    iterations = None
+    for line in lines:
+        match = re.match(r'^\s+(\d+)\s+-?[\d.]', line)
+        if match:
+            iterations = int(match.group(1))
+    return iterations
+
+
+def _check_revision(path, meta, history):
+    """
+    Önceki modelin geçmişi yeni geçmişin başında aynen duruyor mu?
+
+    Returns:
+        str: Sorun açıklaması, yoksa None
+    """
+    regressors = dict(meta['spec']['extra_regressors'])
+    # Regressor'lar Prophet'in sakladığı ölçekte (x - mu) / std karşılaştırılır:
+    # yeni değerler aynı mu/std ve Prophet'le aynı işlemle (kolonun kendi
+    # dtype'ında, örn. compact float32) standartlaştırılınca değişmeyen veri birebir tutar
+    previous = load_history(path, ['y'] + list(regressors), standardized=True)
+    if len(history) < len(previous):
+        return "geçmiş kısaldı"
+
+    head = history.iloc[:len(previous)]
+    if not np.array_equal(head['ds'].to_numpy(dtype='datetime64[ns]'), previous['ds'].to_numpy()):
+        return "geçmiş tarihleri değişti"
+    for col in ['y'] + list(regressors):
+        values = head[col]
+        if col in regressors:
+            values = (values - regressors[col]['mu']) / regressors[col]['std']
+        values = values.to_numpy(dtype=np.float64)
+        if not np.allclose(values, previous[col].to_numpy(),
+                           rtol=REVISION_RTOL, equal_nan=True):
+            return f"veri revizyonu ({col})"
+    return None
+
+
+def _warm_init(path, meta, history):
+    """
+    Önceki parametreleri yeni geçmişin ölçeğine çevirir.
+
+    y_scaled = y / y_scale, t = (ds - start) / t_scale olduğu için eğimler
+    (k, delta) y ve t oranıyla, seviye (m, sigma_obs) ve additive beta'lar
+    y oranıyla ölçeklenir; multiplicative beta'lar ölçeksizdir.
+
+    Returns:
+        dict: Prophet fit(init=...) sözlüğü
+    """
+    previous = load_artifact(path)
+    spec = meta['spec']
+
+    y_scale = float(np.abs(history['y']).max())
+    t_scale = (history['ds'].max() - history['ds'].min()).total_seconds()
+    y_ratio = spec['y_scale'] / y_scale
+    t_ratio = t_scale / spec['t_scale']
+
+    additive = previous.component_matrix[:, previous.component_names.index('additive_terms')] > 0
+    beta = np.asarray(previous.params['beta'])[0]
+    beta = np.where(additive, beta * y_ratio, beta)
+
+    return {
+        'k': float(previous.params['k'][0]) * y_ratio * t_ratio,
+        'm': float(previous.params['m'][0]) * y_ratio,
+        'delta': np.asarray(previous.params['delta'])[0] * y_ratio * t_ratio,
+        'beta': beta,
+        'sigma_obs': float(previous.params['sigma_obs'][0]) * y_ratio,
+    }
+
+
+def warm_start_state(model_path, df, signature):
+    """
+    Önceki modelden warm start yapılabilir mi?
+
+    Args:
+        model_path (str): Önceki Prophet JSON model dosyası (artifact yanında)
+        df: Yeni eğitim verisi
+        signature (str): Yeni modelin config_signature() değeri
+
+    Returns:
+        tuple: (state dict veya None, karar açıklaması)
+    """
+    path = artifact_path(model_path)
+    meta = read_meta(path) if is_current(path, model_path) else None
+    fit = meta.get('fit') if meta else None
+    if not fit:
+        return None, "önceki fit bilgisi yok"
+    if meta['spec']['scaling'] != 'absmax' or meta['spec']['growth'] != 'linear':
+        return None, "sadece absmax ölçekli linear trend destekleniyor"
+    if fit['signature'] != signature:
+        return None, "model tanımı değişti"
+
+    history = df[df['y'].notnull()].sort_values('ds').reset_index(drop=True)
+    problem = _check_revision(path, meta, history)
+    if problem:
+        return None, problem
+    if len(history) > fit['anchor_length'] * (1 + MAX_CHANGEPOINT_DRIFT):
+        return None, "changepoint yerleşimi eskidi"
+
+    state = {
+        'init': _warm_init(path, meta, history),
+        'changepoints': fit['changepoints'],
+        'anchor_length': fit['anchor_length'],
+    }
+    return state, f"{len(history) - meta['spec']['history_length']} yeni satır"
+
+
+def fit_prophet(model, df, model_path, warm_start=True):
+    """
+    Prophet modelini eğitir; mümkünse önceki modelden warm start yapar.
+
+    Args:
+        model: prophet.Prophet (fit edilmemiş; regressor/tatiller eklenmiş)
+        df: Eğitim verisi (ds, y, regressor'lar)
+        model_path (str): Önceki (ve kaydedilecek) model JSON dosyası
+        warm_start (bool): False ise her zaman cold fit
+
+    Returns:
+        dict: Fit bilgisi (save_prophet(..., fit_info=) ile artifact'e yazılır)
+    """
+    signature = config_signature(model, df)
+    state, reason = (
+        warm_start_state(model_path, df, signature) if warm_start else (None, "kapalı")
+    )
+
+    kwargs = {}
+    if state:
+        model.changepoints = pd.Series(pd.to_datetime(state['changepoints']), name='ds')
+        model.n_changepoints = len(model.changepoints)
+        model.specified_changepoints = True
+        kwargs['init'] = state['init']
+
+    start = time.perf_counter()
+    model.fit(df, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    # beta boyutu değiştiyse (örn. geçmişe yeni tatil girdi) Prophet onu varsayılandan başlatır
+    if state and len(state['init']['beta']) != model.params['beta'].shape[1]:
+        reason += ", beta varsayılandan başlatıldı"
+
+    fit_info = {
+        'mode': 'warm' if state else 'cold',
+        'reason': reason,
+        'signature': signature,
+        'seconds': round(elapsed, 3),
+        'iterations': optimizer_iterations(model),
+        'changepoints': [str(ds) for ds in model.changepoints],
+        'anchor_length': state['anchor_length'] if state else len(model.history),
+        'fitted_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+    }
+    print(f"[+] Prophet fit ({fit_info['mode']}, {reason}): "
+          f"{fit_info['iterations']} iterasyon, {elapsed:.1f} sn")
+    return fit_info
@@ -4,32 +4,29 @@
 Backtesting Script - Tüm geçmiş haftalar için MAPE hesaplama
 """
 
-import sqlite3
 import os
 from datetime import datetime, timedelta
 import sys
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 
 # compare_forecasts modülünü import et
 from compare_forecasts import compare_week
 
 def get_all_forecast_weeks():
     """Forecast history'deki tüm haftaları döndürür"""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
+    cur = get_read_connection().cursor()
     cur.execute('''
         SELECT DISTINCT week_start 
         FROM forecast_history 
         ORDER BY week_start
     ''')
     weeks = [row[0] for row in cur.fetchall()]
-    conn.close()
     return weeks
 
 def calculate_week_end(week_start):
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Mevsimsel Profil - Gelecek Exogenous Feature'lar için Önbellek
+==============================================================
+
+Gelecek tarihlerin consumption / generation / oran değerleri bilinmediği için
+geçmişten bir profil ile doldurulur. Eskiden her çağrıda tüm geçmiş üzerinde
+kolon başına ayrı groupby('hour') yapılıyor ve gün / mevsim farkı yok
+sayılıyordu.
+
+SeasonalProfile:
+- Ortalama: ay (12) x haftanın saati (168) hücresi, tüm geçmiş üzerinden
+  toplam + sayı olarak tutulur -> yeni veri geldikçe artımlı güncellenir
+    * Kalıcı toplamlara sadece SETTLE_HOURS'tan eski (oturmuş) satırlar
+      girer: son saatlerin tüketim/üretimi henüz yayınlanmamış olabilir
+      (ffill yer tutucu) ve sonradan düzelir. Kuyruk her çağrıda bellekte
+      ayrıca toplanır, diske yazılmaz
+- Kantiller: son RECENT_WEEKS haftada haftanın saati bazında p10/p50/p90
+  (senaryolar için)
+- Hücre indeksi bir kez hesaplanır, tüm kolonlar aynı geçişte toplanır
+- Model dosyalarının yanında .npz olarak saklanır (DB adıyla)
+- Gelecek frame'i: hücre pozisyonundan dizi okuma (groupby yok)
+
+Boş hücrede sırayla haftanın saati, günün saati ve genel ortalamaya düşülür.
+"""
+
+import numpy as np
+import os
+import sys
+
+# Database path configuration
+try:
+    from db_config import DB_PATH
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import DB_PATH
+
+from hourly_series import to_epoch_hours
+
+# Profili tutulan exogenous kolonlar (prepare_future_features'ın doldurdukları)
+PROFILE_COLUMNS = [
+    'consumption', 'generation_total',
+    'renewable', 'renewable_ratio',
+    'fossil', 'fossil_ratio', 'hydro_ratio',
+]
+
+# Kantiller son N haftadan hesaplanır
+RECENT_WEEKS = 8
+QUANTILES = [0.1, 0.5, 0.9]
+
+HOURS_PER_WEEK = 168
+N_CELLS = 12 * HOURS_PER_WEEK
+
+# Format değişirse profil yeniden oluşturulur
+PROFILE_VERSION = 2
+
+# Bu kadar saatten yeni satırlar kalıcı toplamlara girmez (geç gelen veri;
+# feature_store.REVISION_HOURS ile aynı)
+SETTLE_HOURS = 48
+
+# Profil, model dosyalarının yanında tutulur (dev/prod DB'leri karışmasın diye DB adıyla)
+PROFILE_PATH = os.path.join(
+    os.path.dirname(__file__), '../../models',
+    f"seasonal_profile_{os.path.splitext(os.path.basename(DB_PATH))[0]}.npz"
+)
+
+# Aynı süreçte tekrar tekrar okunmasın (backfill / çok haftalı tahmin)
+_cache = {}
+
+
+def profile_cells(ds):
+    """
+    ds değerlerinin profil hücreleri.
+
+    Returns:
+        tuple: (ay indeksi 0-11, haftanın saati 0-167) int dizileri
+    """
+    ts = to_epoch_hours(ds)
+    days = ts // 24
+    hour_of_week = ((days + 3) % 7) * 24 + ts % 24   # 1970-01-01 Perşembe
+    month = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % 12
+    return month, hour_of_week
+
+
+class SeasonalProfile:
+    """Ay x haftanın saati ortalamaları + son haftaların kantilleri"""
+
+    def __init__(self, columns, sums, counts, quantiles, first, watermark, rows):
+        """
+        Args:
+            columns (list): Kolon isimleri
+            sums, counts (np.ndarray): (kolon, 12 * 168) oturmuş satırların
+                                       toplam ve sayısı
+            quantiles (np.ndarray): (kolon, len(QUANTILES), 168)
+            first, watermark (int): Kapsanan ilk / son oturmuş epoch-saat
+            rows (int): Kapsanan oturmuş satır sayısı (revizyon kontrolü)
+        """
+        self.columns = list(columns)
+        self.sums = sums
+        self.counts = counts
+        self.quantiles = quantiles
+        self.first = int(first)
+        self.watermark = int(watermark)
+        self.rows = int(rows)
+        # Oturmamış kuyruk (watermark sonrası son SETTLE_HOURS; kaydedilmez)
+        self.tail_sums = np.zeros_like(sums)
+        self.tail_counts = np.zeros_like(counts)
+        self._means = None
+
+    # ========================================
+    # OLUŞTURMA / GÜNCELLEME
+    # ========================================
+
+    @staticmethod
+    def _accumulate(df, columns):
+        """df satırlarının hücre toplamları ve sayıları (tek geçiş)"""
+        month, hour_of_week = profile_cells(df['ds'])
+        cell = month * HOURS_PER_WEEK + hour_of_week
+
+        sums = np.zeros((len(columns), N_CELLS))
+        counts = np.zeros((len(columns), N_CELLS), dtype=np.int64)
+        for i, col in enumerate(columns):
+            values = df[col].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(values)
+            sums[i] = np.bincount(cell[valid], weights=values[valid], minlength=N_CELLS)
+            counts[i] = np.bincount(cell[valid], minlength=N_CELLS)
+        return sums, counts
+
+    @staticmethod
+    def _recent_quantiles(df, columns):
+        """Son RECENT_WEEKS haftanın haftanın-saati kantilleri"""
+        recent = df.tail(RECENT_WEEKS * HOURS_PER_WEEK)
+        _, hour_of_week = profile_cells(recent['ds'])
+
+        grouped = recent[columns].groupby(hour_of_week).quantile(QUANTILES)
+        out = np.full((len(columns), len(QUANTILES), HOURS_PER_WEEK), np.nan)
+        if len(grouped) > 0:
+            how = grouped.index.get_level_values(0).to_numpy()
+            q = np.searchsorted(QUANTILES, grouped.index.get_level_values(1).to_numpy())
+            out[:, q, how] = grouped.to_numpy().T
+        return out
+
+    @classmethod
+    def build(cls, df, columns=PROFILE_COLUMNS):
+        """
+        Geçmiş veriden profili sıfırdan oluşturur.
+
+        Args:
+            df: ds sıralı, kolonları içeren DataFrame (engineer_features çıktısı)
+        """
+        ts = to_epoch_hours(df['ds'])
+        profile = cls(
+            columns,
+            np.zeros((len(columns), N_CELLS)),
+            np.zeros((len(columns), N_CELLS), dtype=np.int64),
+            cls._recent_quantiles(df, columns),
+            first=ts[0], watermark=ts[0] - 1, rows=0
+        )
+        profile.update(df)
+        return profile
+
+    def update(self, df):
+        """
+        Watermark sonrası oturmuş satırları kalıcı toplamlara ekler
+        (artımlı); son SETTLE_HOURS saat kuyruk olarak ayrıca toplanır.
+
+        Args:
+            df: Profilin kapsadığı satırları da içeren tam geçmiş (sıralı)
+
+        Returns:
+            int: Kalıcı toplamlara eklenen satır sayısı
+        """
+        ts = to_epoch_hours(df['ds'])
+        start = int(np.searchsorted(ts, self.watermark, side='right'))
+        settled = max(start, int(np.searchsorted(ts, ts[-1] - SETTLE_HOURS, side='right')))
+
+        if settled > start:
+            sums, counts = self._accumulate(df.iloc[start:settled], self.columns)
+            self.sums += sums
+            self.counts += counts
+            self.watermark = int(ts[settled - 1])
+            self.rows += settled - start
+
+        self.tail_sums, self.tail_counts = self._accumulate(df.iloc[settled:], self.columns)
+        self.quantiles = self._recent_quantiles(df, self.columns)
+        self._means = None
+        return settled - start
+
+    def covers(self, df):
+        """
+        Profil df'nin başlangıcıyla tutarlı mı? (aynı ilk saat, watermark'a
+        kadar aynı satır sayısı, watermark df içinde)
+        """
+        ts = to_epoch_hours(df['ds'])
+        return (
+            len(ts) > 0
+            and int(ts[0]) == self.first
+            and self.watermark <= int(ts[-1])
+            and int(np.searchsorted(ts, self.watermark, side='right')) == self.rows
+        )
+
+    # ========================================
+    # OKUMA
+    # ========================================
+
+    def _mean_tables(self):
+        """
+        Kolon başına (12, 168) ortalama tablosu; boş hücreler haftanın saati,
+        günün saati ve genel ortalama ile doldurulur.
+        """
+        if self._means is not None:
+            return self._means
+
+        sums = (self.sums + self.tail_sums).reshape(len(self.columns), 12, HOURS_PER_WEEK)
+        counts = (self.counts + self.tail_counts).reshape(len(self.columns), 12, HOURS_PER_WEEK)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cell = sums / counts
+            week = sums.sum(axis=1) / counts.sum(axis=1)
+            day = (sums.sum(axis=1).reshape(len(self.columns), 7, 24).sum(axis=1)
+                   / counts.sum(axis=1).reshape(len(self.columns), 7, 24).sum(axis=1))
+            overall = sums.sum(axis=(1, 2)) / counts.sum(axis=(1, 2))
+
+        week = np.where(np.isnan(week), np.tile(day, 7), week)
+        week = np.where(np.isnan(week), overall[:, None], week)
+        self._means = np.where(np.isnan(cell), week[:, None, :], cell)
+        return self._means
+
+    def lookup(self, column, ds):
+        """
+        ds tarihleri için kolonun profil ortalaması (dizi okuma).
+
+        Returns:
+            np.ndarray
+        """
+        month, hour_of_week = profile_cells(ds)
+        return self._mean_tables()[self.columns.index(column)][month, hour_of_week]
+
+    def quantile(self, column, q, ds):
+        """
+        ds tarihleri için kolonun son haftalardaki q kantili (QUANTILES içinden).
+
+        Returns:
+            np.ndarray
+        """
+        _, hour_of_week = profile_cells(ds)
+        return self.quantiles[self.columns.index(column), QUANTILES.index(q)][hour_of_week]
+
+    # ========================================
+    # SAKLAMA
+    # ========================================
+
+    def save(self, path=PROFILE_PATH):
+        """Profili .npz olarak atomik yazar (sadece oturmuş toplamlar)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(
+            tmp_path,
+            version=PROFILE_VERSION,
+            columns=np.array(self.columns),
+            sums=self.sums,
+            counts=self.counts,
+            quantiles=self.quantiles,
+            first=self.first,
+            watermark=self.watermark,
+            rows=self.rows,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=PROFILE_PATH):
+        """Kayıtlı profili okur (yoksa / format eskiyse None)"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if int(data['version']) != PROFILE_VERSION:
+                return None
+            return cls(
+                data['columns'].tolist(), data['sums'], data['counts'], data['quantiles'],
+                data['first'], data['watermark'], data['rows']
+            )
+
+
+def get_profile(df, path=PROFILE_PATH):
+    """
+    df geçmişine karşılık gelen profili döndürür.
+
+    - Kayıtlı profil df ile tutarlıysa yeni satırlar artımlı eklenir ve kaydedilir
+    - df kayıtlı profilden daha kısa ise (örn. backtest, end_date geçmişte)
+      gelecek verisi sızmasın diye profil df'den bellekte oluşturulur
+    - df kayıtlı profilden sonra başlıyorsa (eğitim penceresi, walk-forward /
+      arama dilimleri) profil bellekte oluşturulur; tam geçmiş profili ezilmez
+    - Aksi halde (profil yok / eski, df aynı veya daha erken başlıyor)
+      sıfırdan oluşturulup kaydedilir
+
+    Args:
+        df: ds sıralı geçmiş (engineer_features çıktısı)
+
+    Returns:
+        SeasonalProfile
+    """
+    ts = to_epoch_hours(df['ds'])
+    key = (path, len(ts), int(ts[0]), int(ts[-1])) if len(ts) else None
+    if key in _cache:
+        return _cache[key]
+
+    profile = SeasonalProfile.load(path)
+    columns_match = profile is not None and profile.columns == PROFILE_COLUMNS
+
+    if columns_match and profile.covers(df):
+        added = profile.update(df)
+        if added:
+            profile.save(path)
+            print(f"[+] Mevsimsel profil: {added} yeni satır eklendi")
+    elif columns_match and len(ts) and (int(ts[-1]) < profile.watermark
+                                        or int(ts[0]) > profile.first):
+        profile = SeasonalProfile.build(df)
+    else:
+        profile = SeasonalProfile.build(df)
+        profile.save(path)
+        print(f"[+] Mevsimsel profil oluşturuldu: {len(df)} satır -> {path}")
+
+    _cache.clear()
+    _cache[key] = profile
+    return profile
@@ -5,18 +5,21 @@ Basit Haftalik Tahmin - Sadece Prophet v2 Modeli Kullanarak
 """
 
 import pandas as pd
-import sqlite3
 import os
 import sys
 from datetime import datetime, timedelta
-from prophet.serialize import model_from_json
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
+
+from forecast_store import save_week_forecasts, save_week_actuals
+from predict import make_forecast
+from prophet_artifact import load_prophet
+
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model_v2.json')
 
 def get_monday_date(offset_weeks=0):
@@ -45,32 +48,11 @@ def forecast_week(week_monday):
 
     # Model yukle
     print("[1] Model yukleniyor...")
-    with open(MODEL_PATH, 'r') as f:
-        model = model_from_json(f.read())
+    model = load_prophet(MODEL_PATH)
 
-    # Haftalik tahmin yap
+    # Haftalik tahmin yap (sadece bu haftanin 168 saati)
     print(f"[2] 7 gunluk tahmin yapiliyor...")
-    future = model.make_future_dataframe(periods=7*24, freq='H')
-
-    # Feature engineering (v2 model icin)
-    future['hour'] = future['ds'].dt.hour
-    future['is_sunday'] = future['ds'].dt.dayofweek == 6
-    future['is_midday'] = future['hour'].isin([10, 11, 12, 13, 14])
-    future['extreme_low_risk'] = (future['is_sunday'] & future['is_midday']).astype(int)
-
-    # Tahmin
-    forecast = model.predict(future)
-
-    # Sadece gelecek tarihleri al
-    last_date = model.history['ds'].max()
-    future_forecast = forecast[forecast['ds'] > last_date].copy()
-
-    # Bu haftanin tahminlerini filtrele
-    week_start_dt = datetime.strptime(week_monday, '%Y-%m-%d')
-    week_end_dt = datetime.strptime(week_sunday, '%Y-%m-%d') + timedelta(days=1)
-
-    mask = (future_forecast['ds'] >= week_start_dt) & (future_forecast['ds'] < week_end_dt)
-    week_forecasts = future_forecast[mask].copy()
+    week_forecasts = make_forecast(model, days=7, start=week_monday)
 
     if len(week_forecasts) == 0:
         print(f"[!] Bu hafta icin tahmin uretilmedi!")
@@ -82,26 +64,9 @@ def forecast_week(week_monday):
     # Database'e kaydet
     print(f"[3] Database'e kaydediliyor...")
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    inserted = 0
-    for _, row in week_forecasts.iterrows():
-        cursor.execute("""
-            INSERT OR REPLACE INTO forecast_history
-            (week_start, week_end, forecast_datetime, predicted_price, actual_price,
-             absolute_error, percentage_error)
-            VALUES (?, ?, ?, ?, NULL, NULL, NULL)
-        """, (
-            week_monday,
-            week_sunday,
-            row['ds'].strftime('%Y-%m-%d %H:%M:%S'),
-            float(row['yhat'])
-        ))
-        inserted += 1
-
-    conn.commit()
-    conn.close()
+    inserted = save_week_forecasts(
+        week_forecasts[['ds', 'yhat']], week_monday, week_sunday, replace_week=False
+    )
 
     print(f"[+] {inserted} tahmin database'e kaydedildi")
 
@@ -116,7 +81,7 @@ def update_actuals_and_performance(week_monday):
     print(f"PERFORMANS GUNCELLEME: {week_monday} - {week_sunday}")
     print(f"{'='*70}")
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
 
     # Gercek degerleri cek
     print("[1] Gercek degerler aliniyor...")
@@ -130,7 +95,6 @@ def update_actuals_and_performance(week_monday):
 
     if len(actuals) == 0:
         print("[!] Bu hafta icin gercek veri yok!")
-        conn.close()
         return False
 
     print(f"[+] {len(actuals)} gercek deger bulundu")
@@ -146,7 +110,6 @@ def update_actuals_and_performance(week_monday):
 
     if len(forecasts) == 0:
         print("[!] Bu hafta icin tahmin yok!")
-        conn.close()
         return False
 
     # Merge
@@ -158,32 +121,13 @@ def update_actuals_and_performance(week_monday):
 
     if len(valid) == 0:
         print("[!] Esleşen veri bulunamadi!")
-        conn.close()
         return False
 
     print(f"[2] {len(valid)} tahmin guncelleniyor...")
 
-    # Hatalari hesapla ve guncelle
-    cursor = conn.cursor()
-    for _, row in valid.iterrows():
-        abs_error = abs(row['predicted_price'] - row['price'])
-        pct_error = (abs_error / row['price']) * 100 if row['price'] != 0 else 0
-
-        cursor.execute("""
-            UPDATE forecast_history
-            SET actual_price = ?,
-                absolute_error = ?,
-                percentage_error = ?
-            WHERE week_start = ? AND forecast_datetime = ?
-        """, (
-            float(row['price']),
-            float(abs_error),
-            float(pct_error),
-            week_monday,
-            row['forecast_datetime']
-        ))
-
-    conn.commit()
+    # Hatalari hesapla
+    abs_error = (valid['predicted_price'] - valid['price']).abs()
+    pct_error = (abs_error / valid['price'] * 100).where(valid['price'] != 0, 0)
 
     # Performans hesapla
     print("[3] Performans hesaplaniyor...")
@@ -200,22 +144,21 @@ def update_actuals_and_performance(week_monday):
     print(f"    MAE: {mae_val:.2f} TRY")
     print(f"    RMSE: {rmse_val:.2f} TRY")
 
-    # Weekly performance'a kaydet
-    cursor.execute("""
-        INSERT OR REPLACE INTO weekly_performance
-        (week_start, week_end, mape, mae, rmse, total_predictions)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
+    # Gercek degerler + weekly performance tek transaction'da kaydedilir
+    save_week_actuals(
         week_monday,
-        week_sunday,
-        float(mape_val),
-        float(mae_val),
-        float(rmse_val),
-        len(valid)
-    ))
-
-    conn.commit()
-    conn.close()
+        valid['forecast_datetime'],
+        valid['price'],
+        abs_error,
+        pct_error,
+        performance={
+            'week_end': week_sunday,
+            'mape': mape_val,
+            'mae': mae_val,
+            'rmse': rmse_val,
+            'total_predictions': len(valid)
+        }
+    )
 
     print("[+] Performans kaydedildi!")
 
@@ -21,7 +21,8 @@ except ImportError:
 # v2 model egitimi yaptik, simdi manuel test yapalim
 # Model dosyasini yukleyemiyoruz (bug), ama egitim scriptini import edebiliriz
 
-from train_prophet_improved import load_data, create_holidays, add_extreme_low_regressor
+from train_prophet_improved import load_data, add_extreme_low_regressor
+from calendar_table import bayram_holidays
 from prophet import Prophet
 
 def test_v2_performance():
@@ -45,7 +46,7 @@ def test_v2_performance():
     # Model egit
     print(f"\n[*] v2 model egitiliyor (extreme_low_risk regressor ile)...")
 
-    holidays = create_holidays()
+    holidays = bayram_holidays()
 
     model = Prophet(
         holidays=holidays,
@@ -10,6 +10,12 @@ Bu script:
 3. Model'i Keras formatında kaydeder (.keras)
 4. Ensemble'a dahil edilmek üzere residual tahmin yapar
 
+Eğitim verisi pencere başına kopya üretmez: pencereler feature matrisi
+üzerinde kopyasız bir görünümdür ve tf.data her batch'te sadece o batch'in
+pencerelerini kopyalar (bellek ~ feature matrisi, seq_length katı değil).
+Ölçeklenmiş matris istenirse diskte memmap olarak tutulur:
+    python train_lstm.py [--tuned] [--memmap DIR]
+
 LSTM Avantajları:
 - Uzun vadeli bağımlılıkları öğrenir
 - Sequence-to-sequence tahmin
@@ -36,69 +42,149 @@ import joblib
 
 # Feature engineering modülünü import et
 from features import (
-    load_combined_data,
-    engineer_features,
     get_xgboost_features,
     train_test_split_timeseries
 )
+from feature_store import load_features
+from lstm_inference import predict_sequences, predict_windows, sequence_windows
+from lstm_numpy import export_keras, numpy_path
 
 # Model yolları
 LSTM_MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/lstm_model.keras')
 SCALER_PATH = os.path.join(os.path.dirname(__file__), '../../models/lstm_scaler.joblib')
 
 # Hyperparameters
-SEQUENCE_LENGTH = 24  # Son 24 saat (1 gün)
+SEQUENCE_LENGTH = int(os.getenv('LSTM_SEQUENCE_LENGTH', 24))  # Son 24 saat (1 gün); 168 = 1 hafta
 EPOCHS = 50
 BATCH_SIZE = 32
 LSTM_UNITS = 64
+LEARNING_RATE = 0.001
+DROPOUT = 0.2
+
+# tf.data karıştırma tamponu (pencere sayısı); 0 = tüm eğitim seti (tam karıştırma)
+SHUFFLE_BUFFER = int(os.getenv('LSTM_SHUFFLE_BUFFER', 0))
+
+# Memmap'e ölçeklerken bellekte tutulan satır sayısı
+MEMMAP_BLOCK_ROWS = 65536
+
+# Ayarlanabilir hiperparametreler (hyperparameter_search)
+LSTM_PARAMS = {
+    'units': LSTM_UNITS,
+    'learning_rate': LEARNING_RATE,
+    'dropout': DROPOUT,
+    'batch_size': BATCH_SIZE,
+    'epochs': EPOCHS,
+}
 
 
 def create_sequences(data, target, seq_length):
     """
     LSTM için sequence formatında veri oluşturur
     
+    X kopyasız bir strided görünümdür (data memmap ise diskten okunur);
+    model.fit'e doğrudan vermek yerine window_dataset kullanın.
+    
     Args:
         data: Feature array (n_samples, n_features)
         target: Target array (n_samples,)
         seq_length: Sequence uzunluğu
         
     Returns:
-        X: (n_samples - seq_length, seq_length, n_features)
+        X: (n_samples - seq_length, seq_length, n_features) görünüm
         y: (n_samples - seq_length,)
     """
-    X, y = [], []
-    for i in range(len(data) - seq_length):
-        X.append(data[i:(i + seq_length)])
-        y.append(target[i + seq_length])
-    return np.array(X), np.array(y)
+    return sequence_windows(data, seq_length), np.asarray(target)[seq_length:]
+
+
+def window_dataset(data, target, seq_length, batch_size, shuffle=True,
+                   shuffle_buffer=SHUFFLE_BUFFER, seed=42):
+    """
+    Kayan pencerelerden akan tf.data veri seti.
+    
+    Pencere indeksleri karıştırılıp batch'lenir; her batch'in pencereleri
+    o anda görünümden kopyalanır ve prefetch ile eğitimle örtüşür.
+    
+    Args:
+        data: Feature array (n_samples, n_features); np.memmap olabilir
+        target: Target array (n_samples,)
+        seq_length: Sequence uzunluğu
+        batch_size: Batch boyutu
+        shuffle (bool): Her epoch pencereleri karıştır (doğrulamada False)
+        shuffle_buffer (int): Karıştırma tamponu; 0 = tüm pencereler
+        seed (int): Karıştırma tohumu
+        
+    Returns:
+        tf.data.Dataset: (batch, seq_length, n_features), (batch,) float32
+    """
+    windows, y = create_sequences(data, target, seq_length)
+    n_features = windows.shape[2]
+    
+    def load_batch(index):
+        return windows[index].astype(np.float32), y[index].astype(np.float32)
+    
+    def to_tensors(index):
+        X_batch, y_batch = tf.numpy_function(load_batch, [index], (tf.float32, tf.float32))
+        X_batch.set_shape([None, seq_length, n_features])
+        y_batch.set_shape([None])
+        return X_batch, y_batch
+    
+    dataset = tf.data.Dataset.range(len(windows))
+    if shuffle and len(windows):
+        dataset = dataset.shuffle(min(shuffle_buffer or len(windows), len(windows)),
+                                  seed=seed, reshuffle_each_iteration=True)
+    return (dataset.batch(batch_size)
+                   .map(to_tensors, num_parallel_calls=tf.data.AUTOTUNE)
+                   .prefetch(tf.data.AUTOTUNE))
+
+
+def scale_to_memmap(values, scaler, path, block_rows=MEMMAP_BLOCK_ROWS):
+    """
+    Fit edilmiş scaler ile blok blok ölçekleyip .npy memmap'e yazar.
+    
+    Returns:
+        np.memmap: Salt-okunur ölçeklenmiş dizi (float32)
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=values.shape)
+    for start in range(0, len(values), block_rows):
+        out[start:start + block_rows] = scaler.transform(values[start:start + block_rows])
+    out.flush()
+    del out
+    return np.load(path, mmap_mode='r')
 
 
-def build_lstm_model(input_shape):
+def build_lstm_model(input_shape, units=LSTM_UNITS, learning_rate=LEARNING_RATE,
+                     dropout=DROPOUT, verbose=True):
     """
     LSTM model mimarisini oluşturur
     
     Args:
         input_shape: (sequence_length, n_features)
+        units (int): İlk LSTM katmanının birim sayısı (ikincisi yarısı)
+        learning_rate (float): Adam öğrenme oranı
+        dropout (float): LSTM katmanlarından sonraki dropout (Dense'te yarısı)
+        verbose (bool): Model bilgisini yazdır
         
     Returns:
         Compiled Keras model
     """
-    print(f"[*] LSTM model oluşturuluyor: input_shape={input_shape}")
+    if verbose:
+        print(f"[*] LSTM model oluşturuluyor: input_shape={input_shape}")
     
     model = Sequential([
         # İlk LSTM katmanı
-        LSTM(LSTM_UNITS, return_sequences=True, input_shape=input_shape),
+        LSTM(units, return_sequences=True, input_shape=input_shape),
         BatchNormalization(),
-        Dropout(0.2),
+        Dropout(dropout),
         
         # İkinci LSTM katmanı
-        LSTM(LSTM_UNITS // 2, return_sequences=False),
+        LSTM(units // 2, return_sequences=False),
         BatchNormalization(),
-        Dropout(0.2),
+        Dropout(dropout),
         
         # Dense katmanlar
         Dense(32, activation='relu'),
-        Dropout(0.1),
+        Dropout(dropout / 2),
         Dense(16, activation='relu'),
         
         # Çıkış katmanı
@@ -106,22 +192,26 @@ def build_lstm_model(input_shape):
     ])
     
     model.compile(
-        optimizer=Adam(learning_rate=0.001),
+        optimizer=Adam(learning_rate=learning_rate),
         loss='mse',
         metrics=['mae']
     )
     
-    print(f"[+] Model parametreleri: {model.count_params():,}")
+    if verbose:
+        print(f"[+] Model parametreleri: {model.count_params():,}")
     return model
 
 
-def train_lstm_model(df, test_days=30):
+def train_lstm_model(df, test_days=30, params=None, memmap_dir=None):
     """
     LSTM modelini eğitir
     
     Args:
         df: Feature'lar eklenmiş veri seti
         test_days: Test için ayrılacak gün sayısı
+        params (dict, optional): LSTM_PARAMS üzerine yazılacak değerler
+        memmap_dir (str, optional): Ölçeklenmiş feature matrisleri bu dizinde
+                                    memmap olarak tutulur (bellek yerine disk)
         
     Returns:
         model: Eğitilmiş LSTM modeli
@@ -129,6 +219,7 @@ def train_lstm_model(df, test_days=30):
         history: Eğitim geçmişi
     """
     print("\n[*] LSTM model eğitimi başlıyor...")
+    params = {**LSTM_PARAMS, **(params or {})}
     
     # Feature'ları seç
     feature_cols = get_xgboost_features()
@@ -150,21 +241,33 @@ def train_lstm_model(df, test_days=30):
     scaler_X = MinMaxScaler()
     scaler_y = MinMaxScaler()
     
-    X_train_scaled = scaler_X.fit_transform(X_train)
-    X_test_scaled = scaler_X.transform(X_test)
+    scaler_X.fit(X_train)
+    if memmap_dir:
+        X_train_scaled = scale_to_memmap(X_train, scaler_X, os.path.join(memmap_dir, 'lstm_train_X.npy'))
+        X_test_scaled = scale_to_memmap(X_test, scaler_X, os.path.join(memmap_dir, 'lstm_test_X.npy'))
+        print(f"   [*] Ölçeklenmiş feature'lar memmap: {memmap_dir}")
+    else:
+        X_train_scaled = scaler_X.transform(X_train)
+        X_test_scaled = scaler_X.transform(X_test)
     y_train_scaled = scaler_y.fit_transform(y_train.reshape(-1, 1)).flatten()
     y_test_scaled = scaler_y.transform(y_test.reshape(-1, 1)).flatten()
     
-    # Sequence oluştur
+    # Sequence'lar (kopyasız pencereler, batch batch akar)
     print(f"   [*] Sequence'lar oluşturuluyor (length={SEQUENCE_LENGTH})...")
-    X_train_seq, y_train_seq = create_sequences(X_train_scaled, y_train_scaled, SEQUENCE_LENGTH)
+    batch_size = params['batch_size']
+    train_data = window_dataset(X_train_scaled, y_train_scaled, SEQUENCE_LENGTH, batch_size)
+    test_data = window_dataset(X_test_scaled, y_test_scaled, SEQUENCE_LENGTH, batch_size, shuffle=False)
     X_test_seq, y_test_seq = create_sequences(X_test_scaled, y_test_scaled, SEQUENCE_LENGTH)
     
-    print(f"   [+] Train: {X_train_seq.shape}, Test: {X_test_seq.shape}")
+    n_train = max(len(X_train_scaled) - SEQUENCE_LENGTH, 0)
+    print(f"   [+] Train: {n_train} pencere, Test: {len(X_test_seq)} pencere")
     
     # Model oluştur
     input_shape = (SEQUENCE_LENGTH, len(available_features))
-    model = build_lstm_model(input_shape)
+    model = build_lstm_model(
+        input_shape, units=params['units'],
+        learning_rate=params['learning_rate'], dropout=params['dropout']
+    )
     
     # Callbacks
     callbacks = [
@@ -184,20 +287,18 @@ def train_lstm_model(df, test_days=30):
     ]
     
     # Eğitim
-    print(f"\n   [*] Eğitim başlıyor (epochs={EPOCHS}, batch_size={BATCH_SIZE})...")
+    print(f"\n   [*] Eğitim başlıyor (epochs={params['epochs']}, batch_size={params['batch_size']})...")
     history = model.fit(
-        X_train_seq, y_train_seq,
-        validation_data=(X_test_seq, y_test_seq),
-        epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
+        train_data,
+        validation_data=test_data,
+        epochs=params['epochs'],
         callbacks=callbacks,
         verbose=1
     )
     
     # Performans değerlendirme
     print("\n[*] Model performansı değerlendiriliyor...")
-    y_pred_scaled = model.predict(X_test_seq, verbose=0)
-    y_pred = scaler_y.inverse_transform(y_pred_scaled).flatten()
+    y_pred = predict_windows(model, X_test_seq, scaler_y)
     y_true = scaler_y.inverse_transform(y_test_seq.reshape(-1, 1)).flatten()
     
     mae = mean_absolute_error(y_true, y_pred)
@@ -234,6 +335,9 @@ def save_model(model, scaler_data):
     print(f"[*] Scaler kaydediliyor: {SCALER_PATH}")
     joblib.dump(scaler_data, SCALER_PATH)
     
+    # TensorFlow'suz tahmin için ağırlıklar (ensemble NumPy runtime'ı kullanır)
+    export_keras(model, numpy_path(LSTM_MODEL_PATH), keras_path=LSTM_MODEL_PATH)
+    
     print("[+] LSTM modeli başarıyla kaydedildi!")
 
 
@@ -265,33 +369,31 @@ def predict_with_lstm(df, model, scaler_data):
     X = df[features].values
     X_scaled = scaler_X.transform(X)
     
-    # Son seq_length satırdan sequence oluştur
-    predictions = []
-    for i in range(seq_length, len(X_scaled)):
-        seq = X_scaled[i-seq_length:i].reshape(1, seq_length, -1)
-        pred_scaled = model.predict(seq, verbose=0)
-        pred = scaler_y.inverse_transform(pred_scaled).flatten()[0]
-        predictions.append(pred)
-    
-    return np.array(predictions)
+    # Tüm kayan pencereler tek seferde (kopyasız görünüm, toplu tahmin)
+    return predict_sequences(model, X_scaled, scaler_y, seq_length)
 
 
-def main():
-    """Ana eğitim fonksiyonu"""
+def main(params=None, memmap_dir=None):
+    """
+    Ana eğitim fonksiyonu
+
+    Args:
+        params (dict, optional): Hiperparametreler (örn. hyperparameter_search.best_params)
+        memmap_dir (str, optional): Ölçeklenmiş feature'lar için memmap dizini
+    """
     print("=" * 60)
     print("EPİAŞ MCP Fiyat Tahmini - LSTM Model Eğitimi")
     print("=" * 60)
     
-    # 1. Veri yükle
-    df = load_combined_data()
-    df = engineer_features(df)
+    # 1. Veri yükle (feature store üzerinden)
+    df = load_features()
     
     print(f"\n[*] Veri Özeti:")
     print(f"   - Toplam kayıt: {len(df)}")
     print(f"   - Fiyat aralığı: {df['y'].min():.2f} - {df['y'].max():.2f} TRY")
     
     # 2. Model eğit
-    model, scaler_data, history, metrics = train_lstm_model(df)
+    model, scaler_data, history, metrics = train_lstm_model(df, params=params, memmap_dir=memmap_dir)
     mae, rmse, mape = metrics
     
     # 3. Modeli kaydet
@@ -303,7 +405,7 @@ def main():
     print(f"[*] Model Özeti:")
     print(f"   - Tip: LSTM (Deep Learning)")
     print(f"   - Sequence length: {SEQUENCE_LENGTH}")
-    print(f"   - LSTM units: {LSTM_UNITS}")
+    print(f"   - LSTM units: {(params or {}).get('units', LSTM_UNITS)}")
     print(f"   - Test MAPE: {mape:.2f}%")
     print(f"   - Model dosyası: {LSTM_MODEL_PATH}")
     print("=" * 60)
@@ -312,4 +414,13 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+    # --tuned: hyperparameter_search'ün son kazanan ayarlarıyla eğit
+    params = None
+    if '--tuned' in sys.argv:
+        from hyperparameter_search import best_params
+        params = best_params('lstm')
+    memmap_dir = None
+    if '--memmap' in sys.argv:
+        memmap_dir = sys.argv[sys.argv.index('--memmap') + 1]
+    main(params=params, memmap_dir=memmap_dir)
@@ -10,14 +10,13 @@ Bu script:
 1. features.py modülünü kullanarak birleştirilmiş veri yükler
 2. Consumption, generation, renewable_ratio gibi exogenous regressor'lar ekler
 3. Türkiye resmi tatillerini otomatik ekler
-4. Ramazan ve Kurban Bayramı tarihlerini manuel ekler
+4. Ramazan ve Kurban Bayramı tarihlerini takvim tablosundan ekler
 5. Prophet modelini eğitir ve kaydeder
 6. Model performansını değerlendirir
 
 Eski univariate model: train_prophet_legacy.py olarak yedeklendi
 """
 
-import pandas as pd
 import numpy as np
 from prophet import Prophet
 from datetime import datetime, timedelta
@@ -28,60 +27,40 @@ warnings.filterwarnings('ignore')
 
 # Feature engineering modülünü import et
 from features import (
-    load_combined_data, 
-    engineer_features, 
     get_prophet_features,
     train_test_split_timeseries
 )
+from feature_store import load_features
+from calendar_table import bayram_holidays
+from prophet_artifact import save_prophet
+from prophet_warm_start import fit_prophet
+from training_window import apply_training_window
 
 # Model yolu
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model.json')
 
+# Varsayılan hiperparametreler (hyperparameter_search ile ayarlanabilir)
+PROPHET_PARAMS = {
+    'changepoint_prior_scale': 0.1,   # Biraz artırıldı, daha esnek trend
+    'holidays_prior_scale': 10.0,     # Bayram etkisi gücü
+    'seasonality_prior_scale': 10.0,  # Mevsimsellik esnekliği
+    'regressor_prior_factor': 1.0,    # Regressor prior_scale'lerinin çarpanı
+}
+
 
 def create_turkish_holidays():
     """
-    Türkiye'ye özel tatil günlerini oluşturur
+    Türkiye'ye özel tatil günlerini oluşturur (calendar_table'dan)
+
+    Ramazan ve Kurban bayramları: arife + bayram + köprü günleri + bitişik
+    hafta sonları, her yıl için otomatik hesaplanır.
 
     Returns:
         pd.DataFrame: Tatil tarihleri ve isimleri
     """
     print("\n[*] Türk tatilleri oluşturuluyor...")
 
-    holidays = pd.DataFrame({
-        'holiday': [
-            # 2024 Ramazan Bayramı (6-14 Nisan, uzatmalı)
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-
-            # 2024 Kurban Bayramı (15-19 Haziran)
-            'Kurban_Bayrami', 'Kurban_Bayrami', 'Kurban_Bayrami',
-            'Kurban_Bayrami', 'Kurban_Bayrami',
-
-            # 2025 Ramazan Bayramı (29 Mart - 1 Nisan)
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-
-            # 2025 Kurban Bayramı (5-9 Haziran)
-            'Kurban_Bayrami', 'Kurban_Bayrami', 'Kurban_Bayrami',
-            'Kurban_Bayrami', 'Kurban_Bayrami',
-        ],
-        'ds': pd.to_datetime([
-            # 2024 Ramazan (9 günlük uzatma)
-            '2024-04-06', '2024-04-07', '2024-04-08', '2024-04-09', '2024-04-10',
-            '2024-04-11', '2024-04-12', '2024-04-13', '2024-04-14',
-
-            # 2024 Kurban
-            '2024-06-15', '2024-06-16', '2024-06-17', '2024-06-18', '2024-06-19',
-
-            # 2025 Ramazan
-            '2025-03-29', '2025-03-30', '2025-04-01',
-
-            # 2025 Kurban
-            '2025-06-05', '2025-06-06', '2025-06-07', '2025-06-08', '2025-06-09',
-        ]),
-        'lower_window': 0,
-        'upper_window': 1,  # Bayram öncesi gün etkisini de yakala
-    })
+    holidays = bayram_holidays()
 
     print(f"[+] {len(holidays)} bayram günü eklendi:")
     print(f"   - Ramazan Bayramı: {len(holidays[holidays['holiday']=='Ramazan_Bayrami'])} gün")
@@ -90,18 +69,19 @@ def create_turkish_holidays():
     return holidays
 
 
-def train_prophet_model(df, holidays):
+def build_prophet_model(holidays, verbose=True, params=None):
     """
-    Multivariate Prophet modelini eğitir
+    Multivariate Prophet modelini oluşturur (fit edilmemiş)
 
     Args:
-        df: Eğitim verisi (feature'lar dahil)
         holidays: Tatil günleri
+        verbose (bool): Regressor listesini yazdır
+        params (dict, optional): PROPHET_PARAMS üzerine yazılacak değerler
 
     Returns:
-        Prophet: Eğitilmiş model
+        Prophet: Tatilleri ve regressor'ları eklenmiş model
     """
-    print("\n[*] Multivariate Prophet modeli eğitiliyor...")
+    params = {**PROPHET_PARAMS, **(params or {})}
 
     model = Prophet(
         # Tatil günleri
@@ -113,13 +93,13 @@ def train_prophet_model(df, holidays):
         yearly_seasonality=True,  # Mevsimsel desenleri yakala
 
         # Değişim noktaları (trend değişiklikleri)
-        changepoint_prior_scale=0.1,  # Biraz artırıldı, daha esnek trend
+        changepoint_prior_scale=params['changepoint_prior_scale'],
 
         # Bayram etkisi gücü
-        holidays_prior_scale=10.0,
+        holidays_prior_scale=params['holidays_prior_scale'],
 
         # Mevsimsellik esnekliği
-        seasonality_prior_scale=10.0,
+        seasonality_prior_scale=params['seasonality_prior_scale'],
 
         # Tahmin aralığı genişliği
         interval_width=0.95,
@@ -133,7 +113,8 @@ def train_prophet_model(df, holidays):
     # =============================================
     
     regressors = get_prophet_features()
-    print(f"   [*] {len(regressors)} regressor ekleniyor...")
+    if verbose:
+        print(f"   [*] {len(regressors)} regressor ekleniyor...")
     
     # Prior scale değerleri: Yüksek = daha güçlü etki
     prior_scales = {
@@ -151,19 +132,41 @@ def train_prophet_model(df, holidays):
     }
     
     for reg in regressors:
-        prior = prior_scales.get(reg, 5.0)
+        prior = prior_scales.get(reg, 5.0) * params['regressor_prior_factor']
         model.add_regressor(reg, prior_scale=prior)
-        print(f"      + {reg} (prior_scale={prior})")
+        if verbose:
+            print(f"      + {reg} (prior_scale={prior})")
+
+    return model
+
+
+def train_prophet_model(df, holidays, warm_start=True, params=None):
+    """
+    Multivariate Prophet modelini eğitir
+
+    Args:
+        df: Eğitim verisi (feature'lar dahil)
+        holidays: Tatil günleri
+        warm_start (bool): Önceki modelin parametreleriyle başlat (uygunsa)
+        params (dict, optional): Hiperparametreler (varsayılan PROPHET_PARAMS)
+
+    Returns:
+        tuple: (Eğitilmiş Prophet modeli, fit bilgisi)
+    """
+    print("\n[*] Multivariate Prophet modeli eğitiliyor...")
+
+    model = build_prophet_model(holidays, params=params)
+    regressors = get_prophet_features()
 
     print("   [*] Eğitim başlıyor (bu birkaç dakika sürebilir)...")
     
     # Prophet'e fit için sadece gerekli kolonları ver
     train_df = df[['ds', 'y'] + regressors].copy()
-    model.fit(train_df)
+    fit_info = fit_prophet(model, train_df, MODEL_PATH, warm_start)
 
     print("[+] Model eğitimi tamamlandı!")
 
-    return model
+    return model, fit_info
 
 
 def evaluate_model(model, df):
@@ -234,29 +237,30 @@ def evaluate_model(model, df):
     return mae, rmse, mape
 
 
-def save_model(model):
+def save_model(model, fit_info=None):
     """
-    Eğitilmiş modeli JSON formatında kaydeder
+    Eğitilmiş modeli JSON formatında ve ikili artifact olarak kaydeder
 
     Args:
         model: Eğitilmiş Prophet modeli
+        fit_info (dict, optional): Fit bilgisi (warm start için)
     """
     print(f"\n[*] Model kaydediliyor: {MODEL_PATH}")
 
-    from prophet.serialize import model_to_json
-    with open(MODEL_PATH, 'w') as f:
-        f.write(model_to_json(model))
+    save_prophet(model, MODEL_PATH, fit_info)
 
     print("[+] Model başarıyla kaydedildi!")
 
 
-def main(end_date=None):
+def main(end_date=None, warm_start=True, params=None):
     """
     Ana eğitim fonksiyonu
 
     Args:
         end_date (str, optional): Bu tarihe KADAR veri kullan (dahil değil!)
                                   Format: 'YYYY-MM-DD'
+        warm_start (bool): Önceki modelin parametreleriyle başlat (uygunsa)
+        params (dict, optional): Hiperparametreler (örn. hyperparameter_search.best_params)
     
     Returns:
         tuple: (model, mae, rmse, mape)
@@ -265,11 +269,11 @@ def main(end_date=None):
     print("EPİAŞ MCP Fiyat Tahmini - MULTIVARIATE Prophet Eğitimi")
     print("=" * 60)
 
-    # 1. Birleştirilmiş veri yükleme (MCP + Consumption + Generation)
-    df = load_combined_data(end_date=end_date)
+    # 1-2. Birleştirilmiş veri + feature'lar (feature store üzerinden)
+    df = load_features(end_date=end_date)
 
-    # 2. Feature engineering
-    df = engineer_features(df)
+    # Eğitim penceresi (son N ay tam + seyreltilmiş eski geçmiş)
+    df = apply_training_window(df)
     
     print(f"\n[*] Veri Özeti:")
     print(f"   - Toplam kayıt: {len(df)}")
@@ -280,13 +284,13 @@ def main(end_date=None):
     holidays = create_turkish_holidays()
 
     # 4. Modeli eğit
-    model = train_prophet_model(df, holidays)
+    model, fit_info = train_prophet_model(df, holidays, warm_start, params)
 
     # 5. Performansı değerlendir
     mae, rmse, mape = evaluate_model(model, df)
 
     # 6. Modeli kaydet
-    save_model(model)
+    save_model(model, fit_info)
 
     print("\n" + "=" * 60)
     print("[+] Eğitim tamamlandı!")
@@ -305,6 +309,12 @@ def main(end_date=None):
 if __name__ == "__main__":
     import sys
     # Komut satırından end_date parametresi al
-    # Kullanım: python train_prophet.py 2025-10-20
-    end_date = sys.argv[1] if len(sys.argv) > 1 else None
-    main(end_date=end_date)
+    # Kullanım: python train_prophet.py 2025-10-20 [--tuned]
+    # --tuned: hyperparameter_search'ün son kazanan ayarlarıyla eğit
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    end_date = args[0] if args else None
+    params = None
+    if '--tuned' in sys.argv:
+        from hyperparameter_search import best_params
+        params = best_params('prophet')
+    main(end_date=end_date, params=params)
@@ -7,15 +7,22 @@ Iyilestirilmis Prophet Modeli - Extreme Fiyat Handling
 import pandas as pd
 import numpy as np
 from prophet import Prophet
-import sqlite3
 import os
+import sys
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
+
+from features import add_features
+from calendar_table import bayram_holidays
+from prophet_artifact import save_prophet
+from prophet_warm_start import fit_prophet
+from training_window import apply_training_window
+
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model_v2.json')
 
 def load_data(end_date=None):
@@ -26,7 +33,7 @@ def load_data(end_date=None):
         end_date (str, optional): Bu tarihe KADAR veri kullan (dahil degil!)
                                   Format: 'YYYY-MM-DD'
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
 
     if end_date:
         query = "SELECT date as ds, price as y FROM mcp_data WHERE date < ? ORDER BY date"
@@ -35,55 +42,52 @@ def load_data(end_date=None):
         query = "SELECT date as ds, price as y FROM mcp_data ORDER BY date"
         df = pd.read_sql_query(query, conn)
 
-    conn.close()
     df['ds'] = pd.to_datetime(df['ds']).dt.tz_localize(None)
     return df
 
-def create_holidays():
-    """Tatilleri olustur"""
-    holidays = pd.DataFrame({
-        'holiday': [
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-            'Kurban_Bayrami', 'Kurban_Bayrami', 'Kurban_Bayrami',
-            'Kurban_Bayrami', 'Kurban_Bayrami',
-            'Ramazan_Bayrami', 'Ramazan_Bayrami', 'Ramazan_Bayrami',
-            'Kurban_Bayrami', 'Kurban_Bayrami', 'Kurban_Bayrami',
-            'Kurban_Bayrami', 'Kurban_Bayrami',
-        ],
-        'ds': pd.to_datetime([
-            '2024-04-06', '2024-04-07', '2024-04-08', '2024-04-09', '2024-04-10',
-            '2024-04-11', '2024-04-12', '2024-04-13', '2024-04-14',
-            '2024-06-15', '2024-06-16', '2024-06-17', '2024-06-18', '2024-06-19',
-            '2025-03-29', '2025-03-30', '2025-04-01',
-            '2025-06-05', '2025-06-06', '2025-06-07', '2025-06-08', '2025-06-09',
-        ]),
-        'lower_window': 0,
-        'upper_window': 1,
-    })
-    return holidays
-
 def add_extreme_low_regressor(df):
     """
     Ekstrem dusuk fiyat regressoru ekle
     Pazar + ogle saati kombinasyonu
     """
-    df = df.copy()
+    # Pazar gunu + ogle saatleri (10-14), tanim features.py registry'sinde
+    return add_features(df, ['is_sunday', 'is_midday', 'extreme_low_risk'])
 
-    # Pazar gunu + ogle saatleri (10-14)
-    df['is_sunday'] = df['ds'].dt.dayofweek == 6
-    df['is_midday'] = df['ds'].dt.hour.isin([10, 11, 12, 13, 14])
-    df['extreme_low_risk'] = (df['is_sunday'] & df['is_midday']).astype(int)
+def build_model():
+    """
+    v2 Prophet modelini olusturur (fit edilmemis)
 
-    return df
+    Returns:
+        Prophet: Tatilleri ve extreme_low_risk regressoru eklenmis model
+    """
+    # Tatiller
+    holidays = bayram_holidays()
+
+    model = Prophet(
+        holidays=holidays,
+        daily_seasonality=True,
+        weekly_seasonality=True,
+        yearly_seasonality=True,
+        changepoint_prior_scale=0.05,
+        holidays_prior_scale=10.0,
+        seasonality_prior_scale=10.0,
+        interval_width=0.95,
+    )
+
+    # Turkiye tatilleri
+    model.add_country_holidays('TR')
 
-def train_improved_model(end_date=None):
+    # Extreme low regressor ekle
+    model.add_regressor('extreme_low_risk', prior_scale=15.0)
+    return model
+
+def train_improved_model(end_date=None, warm_start=True):
     """
     Iyilestirilmis model egitimi
 
     Args:
         end_date (str, optional): Bu tarihe KADAR veri kullan (dahil degil!)
+        warm_start (bool): Onceki modelin parametreleriyle baslat (uygunsa)
 
     Returns:
         tuple: (model, mae, rmse, mape)
@@ -98,33 +102,18 @@ def train_improved_model(end_date=None):
     if end_date:
         print(f"    Data leakage önleme: {end_date} tarihine KADAR")
 
+    # Eğitim penceresi (son N ay tam + seyreltilmiş eski geçmiş)
+    df = apply_training_window(df)
+
     # Extreme low regressor ekle
     df = add_extreme_low_regressor(df)
 
-    # Tatiller
-    holidays = create_holidays()
-
     # Model olustur
     print(f"\n[*] Model olusturuluyor...")
-    model = Prophet(
-        holidays=holidays,
-        daily_seasonality=True,
-        weekly_seasonality=True,
-        yearly_seasonality=True,
-        changepoint_prior_scale=0.05,
-        holidays_prior_scale=10.0,
-        seasonality_prior_scale=10.0,
-        interval_width=0.95,
-    )
-
-    # Turkiye tatilleri
-    model.add_country_holidays('TR')
-
-    # Extreme low regressor ekle
-    model.add_regressor('extreme_low_risk', prior_scale=15.0)
+    model = build_model()
 
     print("[*] Egitim basliyor...")
-    model.fit(df[['ds', 'y', 'extreme_low_risk']])
+    fit_info = fit_prophet(model, df[['ds', 'y', 'extreme_low_risk']], MODEL_PATH, warm_start)
 
     print("[+] Egitim tamamlandi!")
 
@@ -153,19 +142,17 @@ def train_improved_model(end_date=None):
     print(f"    RMSE: {rmse:.2f} TRY")
     print(f"    MAPE: {mape:.2f}%")
 
-    # Model kaydet
-    from prophet.serialize import model_to_json
-    with open(MODEL_PATH, 'w') as f:
-        f.write(model_to_json(model))
+    # Model kaydet (JSON + ikili artifact)
+    save_prophet(model, MODEL_PATH, fit_info)
 
     print(f"\n[+] Model kaydedildi: {MODEL_PATH}")
     print("="*60)
 
     return model, mae, rmse, mape
 
-def main(end_date=None):
+def main(end_date=None, warm_start=True):
     """Ana fonksiyon (catchup script uyumlu)"""
-    return train_improved_model(end_date=end_date)
+    return train_improved_model(end_date=end_date, warm_start=warm_start)
 
 if __name__ == "__main__":
     model, mae, rmse, mape = train_improved_model()
@@ -8,12 +8,21 @@ Bu script Prophet modelinin yakalayamadığı residual'ları (hataları)
 tahmin etmek için XGBoost modeli eğitir.
 
 Pipeline:
-1. Prophet tahminlerini yükle
+1. Prophet tahminlerini yükle (eğitimde kaydedilen in-sample tahminler)
 2. Residual hesapla (gerçek - tahmin)
 3. XGBoost ile residual'ları tahmin etmeyi öğren
 4. Model'i .joblib olarak kaydet
 
 Ensemble tahmini: final = prophet_pred + xgboost_residual_pred
+
+Eğitim xgboost native API ile:
+- tree_method='hist'; veri bir kez QuantileDMatrix'e çevrilir, fold
+  matrisleri aynı bin sınırlarını paylaşır (ref=)
+- Her fold early stopping ile durur; fold'ların en iyi ağaç sayılarının
+  ortalaması final modele taşınır (n_estimators bir üst sınırdır)
+- Fold'lar thread havuzunda eşzamanlı; çekirdekler fold'lara bölünür
+- CV sonucu (fold skorları, ağaç sayıları) veri + parametre hash'iyle
+  önbelleğe yazılır; aynı girdiyle yeniden eğitimde CV atlanır
 """
 
 import pandas as pd
@@ -22,49 +31,79 @@ import xgboost as xgb
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import joblib
+import hashlib
+import json
 import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
 # Feature engineering modülünü import et
 from features import (
-    load_combined_data, 
-    engineer_features, 
     get_xgboost_features,
     train_test_split_timeseries
 )
+from feature_store import load_features
 
-# Prophet modülünden tahmin fonksiyonu
-from prophet.serialize import model_from_json
+# Prophet modeli ve in-sample tahminleri (Prophet/Stan import etmeden, ikili artifact'ten)
+from prophet_artifact import load_prophet, fitted_values
+from training_window import apply_training_window, recency_weights
 
 # Model yolları
 PROPHET_MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/prophet_model.json')
 XGBOOST_MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/xgboost_residual.joblib')
+CV_CACHE_PATH = os.path.join(os.path.dirname(__file__), '../../models/xgboost_cv_cache.json')
+
+# Varsayılan hiperparametreler (hyperparameter_search ile ayarlanabilir)
+XGBOOST_PARAMS = {
+    'n_estimators': 300,
+    'max_depth': 7,
+    'learning_rate': 0.03,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'min_child_weight': 3,
+    'reg_alpha': 0.1,
+    'reg_lambda': 1.0,
+}
+
+CV_FOLDS = 5
+EARLY_STOPPING_ROUNDS = 30
+MAX_BIN = 256
+
+# Erken durdurmanın izlediği iç holdout: fold eğitim diliminin son saatleri
+# (hyperparameter_search.EARLY_STOPPING_HOURS ile aynı, bir hafta). Doğrulama
+# dilimi sadece skorlanır; erken durdurma onu izlerse CV MAE iyimser çıkar
+EARLY_STOPPING_HOURS = 7 * 24
+
+# Format değişirse CV önbelleği geçersiz sayılır
+CV_CACHE_VERSION = 2
 
 
 def load_prophet_model():
     """Prophet modelini yükler"""
     print("[*] Prophet modeli yükleniyor...")
     
-    with open(PROPHET_MODEL_PATH, 'r') as f:
-        model = model_from_json(f.read())
+    model = load_prophet(PROPHET_MODEL_PATH)
     
     print(f"[+] Prophet modeli yüklendi: {PROPHET_MODEL_PATH}")
     return model
 
 
-def calculate_prophet_predictions(prophet_model, df):
+def calculate_prophet_predictions(df):
     """
-    Prophet modelinin tahminlerini hesaplar
-    
+    Prophet modelinin tahminlerini döndürür.
+
+    Eğitim geçmişindeki saatler Prophet eğitiminde kaydedilen in-sample
+    tahminlerden okunur (model hash'i kontrol edilir); sadece model
+    eğitildikten sonra gelen saatler tahmin edilir.
+
     Args:
-        prophet_model: Eğitilmiş Prophet modeli
         df: Feature'lar eklenmiş veri seti
         
     Returns:
         np.array: Prophet tahminleri
     """
-    print("[*] Prophet tahminleri hesaplanıyor...")
+    print("[*] Prophet tahminleri yükleniyor...")
     
     # Prophet için gerekli kolonlar
     prophet_features = ['ds', 'hour', 'is_weekend', 'is_peak_hour', 'is_daytime', 
@@ -73,12 +112,11 @@ def calculate_prophet_predictions(prophet_model, df):
     
     # Sadece mevcut kolonları al
     available_features = [col for col in prophet_features if col in df.columns]
-    feature_df = df[available_features].copy()
     
     # Prophet tahminleri
-    forecast = prophet_model.predict(feature_df)
+    forecast = fitted_values(PROPHET_MODEL_PATH, df[available_features])
     
-    print(f"[+] {len(forecast)} tahmin hesaplandı")
+    print(f"[+] {len(forecast)} tahmin hazır")
     
     return forecast['yhat'].values
 
@@ -106,18 +144,110 @@ def calculate_residuals(df, prophet_predictions):
     return residuals
 
 
-def train_xgboost_model(df, residuals):
+def _booster_params(params, n_jobs):
+    """XGBRegressor hiperparametreleri -> xgb.train parametreleri (n_estimators hariç)"""
+    booster_params = {k: v for k, v in params.items() if k != 'n_estimators'}
+    booster_params.update({
+        'objective': 'reg:squarederror',
+        'eval_metric': 'mae',
+        'tree_method': 'hist',
+        'max_bin': MAX_BIN,
+        'seed': 42,
+        'nthread': n_jobs,
+        'verbosity': 0,
+    })
+    return booster_params
+
+
+def _cv_cache_key(X, y, sample_weight, params):
+    """CV girdilerinin hash'i (veri, ağırlık, parametreler, fold ayarı, xgboost sürümü)"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'version': CV_CACHE_VERSION,
+        'xgboost': xgb.__version__,
+        'params': params,
+        'folds': CV_FOLDS,
+        'early_stopping': EARLY_STOPPING_ROUNDS,
+        'early_stopping_hours': EARLY_STOPPING_HOURS,
+        'max_bin': MAX_BIN,
+        'shape': list(X.shape),
+    }, sort_keys=True).encode('utf-8'))
+    for values in (X, y, sample_weight):
+        if values is not None:
+            digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _load_cv_cache(key):
+    """Önbellekteki CV sonucu (anahtar eşleşmezse None)"""
+    if not os.path.exists(CV_CACHE_PATH):
+        return None
+    try:
+        with open(CV_CACHE_PATH, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if cached.get('key') == key else None
+
+
+def _save_cv_cache(key, cv_result):
+    """CV sonucunu atomik yazar"""
+    tmp_path = CV_CACHE_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'key': key, **cv_result}, f, indent=2)
+    os.replace(tmp_path, CV_CACHE_PATH)
+
+
+def _fit_fold(full, X, y, sample_weight, train_idx, val_idx, booster_params, num_rounds):
+    """
+    Bir CV fold'unu early stopping ile eğitir (thread'de çalışır).
+
+    Erken durdurma eğitim diliminin son EARLY_STOPPING_HOURS saatini izler;
+    doğrulama dilimi bulunan ağaç sayısıyla sadece skorlanır.
+
+    Returns:
+        tuple: (doğrulama MAE, en iyi ağaç sayısı)
+    """
+    split = len(train_idx) - EARLY_STOPPING_HOURS
+    if split < 1:
+        raise ValueError(f"Erken durdurma holdout'u için eğitim verisi yetersiz ({len(train_idx)} satır)")
+    fit_idx, stop_idx = train_idx[:split], train_idx[split:]
+
+    dtrain = xgb.QuantileDMatrix(
+        X[fit_idx], y[fit_idx],
+        weight=sample_weight[fit_idx] if sample_weight is not None else None,
+        ref=full, max_bin=MAX_BIN
+    )
+    dstop = xgb.QuantileDMatrix(X[stop_idx], y[stop_idx], ref=dtrain, max_bin=MAX_BIN)
+
+    booster = xgb.train(
+        booster_params, dtrain,
+        num_boost_round=num_rounds,
+        evals=[(dstop, 'early_stopping')],
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        verbose_eval=False
+    )
+    best_rounds = booster.best_iteration + 1
+    dval = xgb.QuantileDMatrix(X[val_idx], ref=dtrain, max_bin=MAX_BIN)
+    val_pred = booster.predict(dval, iteration_range=(0, best_rounds))
+    return mean_absolute_error(y[val_idx], val_pred), best_rounds
+
+
+def train_xgboost_model(df, residuals, params=None, sample_weight=None):
     """
     XGBoost modelini residual'ları tahmin etmek için eğitir
     
     Args:
         df: Feature'lar içeren veri seti
         residuals: Prophet residual'ları
+        params (dict, optional): XGBOOST_PARAMS üzerine yazılacak değerler
+        sample_weight (np.array, optional): Satır ağırlıkları (yakınlık ağırlığı)
         
     Returns:
         xgb.XGBRegressor: Eğitilmiş model
     """
     print("\n[*] XGBoost modeli eğitiliyor...")
+    params = {**XGBOOST_PARAMS, **(params or {})}
     
     # Feature'ları al
     features = get_xgboost_features()
@@ -127,51 +257,57 @@ def train_xgboost_model(df, residuals):
     available_features = [f for f in features if f in df.columns]
     print(f"   [*] {len(available_features)} feature mevcut")
     
-    X = df[available_features].values
-    y = residuals
+    X = np.ascontiguousarray(df[available_features].values, dtype=np.float32)
+    y = np.asarray(residuals, dtype=np.float64)
+    
+    # Bin sınırları bir kez hesaplanır; fold ve final matrisleri paylaşır
+    n_jobs = os.cpu_count() or 1
+    full = xgb.QuantileDMatrix(X, y, weight=sample_weight, max_bin=MAX_BIN, nthread=n_jobs)
+    
+    # Time Series Cross Validation (önbellekte yoksa)
+    key = _cv_cache_key(X, y, sample_weight, params)
+    cv_result = _load_cv_cache(key)
+    if cv_result is not None:
+        print(f"   [+] CV sonucu önbellekten: {CV_CACHE_PATH}")
+    else:
+        n_parallel = min(CV_FOLDS, n_jobs)
+        print(f"   [*] Time Series Cross Validation yapılıyor ({CV_FOLDS} fold, {n_parallel} paralel)...")
+        splits = list(TimeSeriesSplit(n_splits=CV_FOLDS).split(X))
+        fold_params = _booster_params(params, max(1, n_jobs // n_parallel))
+        
+        with ThreadPoolExecutor(max_workers=n_parallel) as pool:
+            results = list(pool.map(
+                lambda split: _fit_fold(full, X, y, sample_weight, split[0], split[1],
+                                        fold_params, params['n_estimators']),
+                splits
+            ))
+        cv_result = {
+            'cv_scores': [float(mae) for mae, _ in results],
+            'best_rounds': [int(rounds) for _, rounds in results],
+        }
+        _save_cv_cache(key, cv_result)
+    
+    cv_scores = cv_result['cv_scores']
+    for fold, (mae, rounds) in enumerate(zip(cv_scores, cv_result['best_rounds'])):
+        print(f"      Fold {fold+1}: MAE = {mae:.2f} ({rounds} ağaç)")
+    print(f"\n   [*] CV Ortalama MAE: {np.mean(cv_scores):.2f} (+/- {np.std(cv_scores):.2f})")
     
-    # Time Series Cross Validation
-    print("   [*] Time Series Cross Validation yapılıyor (5 fold)...")
-    tscv = TimeSeriesSplit(n_splits=5)
+    # Tüm veri ile final model (fold'ların en iyi ağaç sayısıyla)
+    num_rounds = max(1, int(round(np.mean(cv_result['best_rounds']))))
+    print(f"   [*] Final model eğitiliyor ({num_rounds} ağaç)...")
+    booster = xgb.train(_booster_params(params, n_jobs), full, num_boost_round=num_rounds)
     
-    # XGBoost hyperparameters
+    # Kayıt ve tahmin tarafı XGBRegressor arayüzünü kullanır
     model = xgb.XGBRegressor(
-        n_estimators=300,
-        max_depth=7,
-        learning_rate=0.03,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        min_child_weight=3,
-        reg_alpha=0.1,
-        reg_lambda=1.0,
+        **{**params, 'n_estimators': num_rounds},
         objective='reg:squarederror',
+        tree_method='hist',
+        max_bin=MAX_BIN,
         random_state=42,
         n_jobs=-1,
         verbosity=0
     )
-    
-    # Cross validation ile eğit
-    cv_scores = []
-    for fold, (train_idx, val_idx) in enumerate(tscv.split(X)):
-        X_train, X_val = X[train_idx], X[val_idx]
-        y_train, y_val = y[train_idx], y[val_idx]
-        
-        model.fit(
-            X_train, y_train,
-            eval_set=[(X_val, y_val)],
-            verbose=False
-        )
-        
-        val_pred = model.predict(X_val)
-        val_mae = mean_absolute_error(y_val, val_pred)
-        cv_scores.append(val_mae)
-        print(f"      Fold {fold+1}: MAE = {val_mae:.2f}")
-    
-    print(f"\n   [*] CV Ortalama MAE: {np.mean(cv_scores):.2f} (+/- {np.std(cv_scores):.2f})")
-    
-    # Tüm veri ile final model eğit
-    print("   [*] Final model eğitiliyor...")
-    model.fit(X, y, verbose=False)
+    model.load_model(bytearray(booster.save_raw()))
     
     # Feature importance
     print("\n   [*] Önemli Feature'lar (Top 5):")
@@ -188,13 +324,13 @@ def train_xgboost_model(df, residuals):
     return model, available_features
 
 
-def evaluate_ensemble(df, prophet_model, xgboost_model, features, test_days=30):
+def evaluate_ensemble(df, prophet_predictions, xgboost_model, features, test_days=30):
     """
     Ensemble modelin performansını değerlendirir
     
     Args:
         df: Tüm veri seti
-        prophet_model: Prophet modeli
+        prophet_predictions: df satırlarının Prophet tahminleri
         xgboost_model: XGBoost modeli
         features: XGBoost feature listesi
         test_days: Test süresi (gün)
@@ -207,13 +343,8 @@ def evaluate_ensemble(df, prophet_model, xgboost_model, features, test_days=30):
     # Train/test split
     train, test = train_test_split_timeseries(df, test_days=test_days)
     
-    # Prophet tahminleri (test seti için)
-    prophet_features = ['ds', 'hour', 'is_weekend', 'is_peak_hour', 'is_daytime', 
-                       'day_of_week', 'consumption', 'supply_demand_gap', 
-                       'renewable_ratio', 'fossil_ratio', 'price_lag_24h']
-    available_prophet_features = [col for col in prophet_features if col in test.columns]
-    prophet_forecast = prophet_model.predict(test[available_prophet_features])
-    prophet_pred = prophet_forecast['yhat'].values
+    # Prophet tahminleri (test seti için, yeniden tahmin yok)
+    prophet_pred = np.asarray(prophet_predictions)[df.index.get_indexer(test.index)]
     
     # XGBoost residual tahminleri
     X_test = test[features].values
@@ -273,30 +404,36 @@ def save_model(model, features):
     print("[+] XGBoost modeli başarıyla kaydedildi!")
 
 
-def main():
-    """Ana eğitim fonksiyonu"""
+def main(params=None):
+    """
+    Ana eğitim fonksiyonu
+
+    Args:
+        params (dict, optional): Hiperparametreler (örn. hyperparameter_search.best_params)
+    """
     print("=" * 60)
     print("EPİAŞ MCP Fiyat Tahmini - XGBoost Residual Eğitimi")
     print("=" * 60)
     
-    # 1. Veri yükle ve feature'ları hazırla
-    df = load_combined_data()
-    df = engineer_features(df)
-    
-    # 2. Prophet modelini yükle
-    prophet_model = load_prophet_model()
+    # 1. Veri yükle ve feature'ları hazırla (feature store üzerinden)
+    df = load_features()
+
+    # Eğitim penceresi (son N ay tam + seyreltilmiş eski geçmiş)
+    df = apply_training_window(df)
     
-    # 3. Prophet tahminlerini hesapla
-    prophet_predictions = calculate_prophet_predictions(prophet_model, df)
+    # 2-3. Prophet tahminleri (eğitimde kaydedilen in-sample değerler)
+    prophet_predictions = calculate_prophet_predictions(df)
     
     # 4. Residual hesapla
     residuals = calculate_residuals(df, prophet_predictions)
     
     # 5. XGBoost'u residual'ları tahmin etmek için eğit
-    xgboost_model, features = train_xgboost_model(df, residuals)
+    xgboost_model, features = train_xgboost_model(
+        df, residuals, params, sample_weight=recency_weights(df['ds'])
+    )
     
     # 6. Ensemble performansını değerlendir
-    mae, rmse, mape = evaluate_ensemble(df, prophet_model, xgboost_model, features)
+    mae, rmse, mape = evaluate_ensemble(df, prophet_predictions, xgboost_model, features)
     
     # 7. Modeli kaydet
     save_model(xgboost_model, features)
@@ -315,4 +452,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+    # --tuned: hyperparameter_search'ün son kazanan ayarlarıyla eğit
+    params = None
+    if '--tuned' in sys.argv:
+        from hyperparameter_search import best_params
+        params = best_params('xgboost')
+    main(params=params)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Eğitim Penceresi - Sınırlı Geçmiş + Yakınlık Ağırlıkları
+=========================================================
+
+Prophet ve XGBoost her hafta tüm mcp_data geçmişiyle eğitiliyordu; fit
+maliyeti veritabanıyla birlikte sınırsız büyür (README 100k satırda
+uyarıyor).
+
+- Son TRAIN_WINDOW_MONTHS ay tam saatlik çözünürlükte tutulur (pencere
+  başlangıcı ay başına yuvarlanır: pencere ayda bir kayar, aradaki
+  haftalarda geçmiş sadece uzar -> Prophet warm start bozulmaz)
+- Daha eski geçmiş TRAIN_WINDOW_OLDER_EVERY_DAYS günde bir tam gün olarak
+  seyreltilir (yıllık mevsimsellik için). Günlük ortalama yerine tam gün
+  tutulur: tek saate konan günlük ortalama gün içi mevsimselliği o saatte
+  sıfıra çekerdi. Gün seçimi epoch gününe göredir (seçilen günler haftadan
+  haftaya değişmez); 7 ile aralarında asal bir aralık tüm hafta günlerini
+  kapsar
+- Eski geçmiş pencere başlangıcından en fazla TRAIN_WINDOW_MAX_YEARS yıl
+  geriye gider (başlangıç yine ay başında: seçilen günler kaymaz)
+- XGBoost örnekleri yaşa göre üstel ağırlık alır (yarı ömür
+  RECENCY_HALF_LIFE_DAYS gün, ortalama 1'e normalize)
+
+Ayarlar ortam değişkeni / backend/.env ile değiştirilebilir; 0 = kapalı
+(TRAIN_WINDOW_MONTHS=0 -> tüm geçmiş).
+
+Satır tavanı (saatlik veri): MONTHS x 744 + MAX_YEARS x 8784 / OLDER_EVERY_DAYS;
+varsayılanlarla (24 ay, 5 günde bir, 5 yıl) 17856 + 8784 = 26640 satır.
+Veritabanı ne kadar büyürse büyüsün fit bu satır sayısını aşmaz
+(TRAIN_WINDOW_MAX_YEARS=0 -> eski geçmiş sınırsız).
+
+Rapor (pencere boyutlarına göre doğruluk ve fit süresi):
+    python training_window.py [--months 3,6,12,24,0] [--weeks 4] [--workers N]
+"""
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+import time
+
+# Database path configuration (backend/.env'yi yükler)
+try:
+    from db_config import DB_PATH
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import DB_PATH
+
+# Tam çözünürlüklü pencere (ay); 0 = tüm geçmiş
+WINDOW_MONTHS = int(os.getenv('TRAIN_WINDOW_MONTHS', 24))
+
+# Pencere öncesinden her N günde bir tam gün; 0 = eski geçmiş atılır
+OLDER_EVERY_DAYS = int(os.getenv('TRAIN_WINDOW_OLDER_EVERY_DAYS', 5))
+
+# Eski geçmişin pencere başlangıcından geriye en fazla kaç yıl gideceği; 0 = sınırsız
+MAX_YEARS = int(os.getenv('TRAIN_WINDOW_MAX_YEARS', 5))
+
+# XGBoost yakınlık ağırlığı yarı ömrü (gün); 0 = ağırlıksız
+RECENCY_HALF_LIFE_DAYS = float(os.getenv('RECENCY_HALF_LIFE_DAYS', 180))
+
+REPORT_PATH = os.path.join(os.path.dirname(__file__), '../../models/training_window_report.csv')
+
+NANOSECONDS_PER_DAY = 24 * 3600 * 10**9
+
+
+def window_start(last_ds, months=WINDOW_MONTHS):
+    """
+    Tam çözünürlüklü pencerenin başlangıcı (ay başı).
+
+    Returns:
+        pd.Timestamp: None ise pencere yok (tüm geçmiş)
+    """
+    if not months:
+        return None
+    return (pd.Period(pd.Timestamp(last_ds), 'M') - (months - 1)).start_time
+
+
+def apply_training_window(df, months=WINDOW_MONTHS, older_every_days=OLDER_EVERY_DAYS,
+                          verbose=True, max_years=MAX_YEARS):
+    """
+    Eğitim verisini pencereye indirir.
+
+    Args:
+        df: ds sıralı eğitim verisi
+        months (int): Tam çözünürlüklü son ay sayısı (0 = tüm geçmiş)
+        older_every_days (int): Eski geçmişten N günde bir tam gün (0 = hiç)
+        max_years (int): Eski geçmişin pencereden geriye en fazla yıl sayısı
+                         (0 = sınırsız)
+
+    Returns:
+        pd.DataFrame: Pencere satırları (index sıfırlanmış; pencere tüm
+                      veriyi kapsıyorsa df'nin kendisi)
+    """
+    start = window_start(df['ds'].max(), months) if len(df) else None
+    if start is None:
+        return df
+
+    ns = df['ds'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    recent = ns >= start.value
+    if recent.all():
+        return df
+
+    keep = recent
+    if older_every_days:
+        older = (ns // NANOSECONDS_PER_DAY) % older_every_days == 0
+        if max_years:
+            older &= ns >= (start - pd.DateOffset(years=max_years)).value
+        keep = recent | older
+
+    if verbose:
+        older = int(keep.sum() - recent.sum())
+        print(f"[*] Egitim penceresi: {start.date()} sonrasi {int(recent.sum())} saat"
+              f" + eski geçmişten {older} saat (toplam {len(df)} satirdan)")
+    return df[keep].reset_index(drop=True)
+
+
+def recency_weights(ds, half_life_days=RECENCY_HALF_LIFE_DAYS):
+    """
+    Yaşa göre üstel örnek ağırlıkları (en yeni satır en ağır).
+
+    Returns:
+        np.ndarray: Ortalaması 1 olan ağırlıklar (half_life_days=0 ise None)
+    """
+    if not half_life_days or len(ds) == 0:
+        return None
+    ns = pd.to_datetime(ds).to_numpy(dtype='datetime64[ns]').view(np.int64)
+    age_days = (ns.max() - ns) / NANOSECONDS_PER_DAY
+    weights = 0.5 ** (age_days / half_life_days)
+    return weights / weights.mean()
+
+
+# ========================================
+# RAPOR
+# ========================================
+
+def _xgboost_report(months_list, test_days=28):
+    """
+    XGBoost residual modeli: son test_days gün ayrılır, her pencere için
+    ağırlıklı / ağırlıksız eğitilir.
+
+    Returns:
+        list: Satır dict'leri (Prophet modeli yoksa boş)
+    """
+    import xgboost as xgb
+    from feature_store import load_features
+    from features import get_xgboost_features
+    from train_xgboost import PROPHET_MODEL_PATH, XGBOOST_PARAMS, calculate_prophet_predictions
+
+    if not os.path.exists(PROPHET_MODEL_PATH):
+        print(f"[!] XGBoost raporu atlandi: Prophet modeli yok ({PROPHET_MODEL_PATH})")
+        return []
+
+    df = load_features()
+    df['prophet'] = calculate_prophet_predictions(df)
+    features = [f for f in get_xgboost_features() if f in df.columns]
+    split = df['ds'].max() - pd.Timedelta(days=test_days)
+    train, test = df[df['ds'] <= split], df[df['ds'] > split]
+
+    rows = []
+    for months in months_list:
+        windowed = apply_training_window(train, months, verbose=False)
+        for weighted in (False, True):
+            weights = recency_weights(windowed['ds']) if weighted else None
+            if weighted and weights is None:
+                continue
+            model = xgb.XGBRegressor(**XGBOOST_PARAMS, objective='reg:squarederror',
+                                     random_state=42, n_jobs=-1, verbosity=0)
+            start = time.perf_counter()
+            model.fit(windowed[features].values, (windowed['y'] - windowed['prophet']).values,
+                      sample_weight=weights)
+            seconds = time.perf_counter() - start
+
+            y_pred = test['prophet'].values + model.predict(test[features].values)
+            y_true = test['y'].values
+            mask = y_true >= 500
+            rows.append({
+                'model': 'xgboost' + ('_weighted' if weighted else ''),
+                'months': months,
+                'train_rows': len(windowed),
+                'fit_seconds': seconds,
+                'mae': float(np.mean(np.abs(y_true - y_pred))),
+                'mape': float(np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])) * 100)
+                        if mask.any() else None,
+            })
+    return rows
+
+
+def window_report(months_list=(3, 6, 12, 24, 0), weeks=4, workers=None):
+    """
+    Pencere boyutlarına göre doğruluk ve fit süresi.
+
+    Prophet v2: son `weeks` hafta walk-forward (her pencere ayrı spec
+    adıyla walk_forward_results'a yazılır). XGBoost: son 4 hafta holdout,
+    yakınlık ağırlıklı ve ağırlıksız.
+
+    Returns:
+        pd.DataFrame: model, months, train_rows, fit_seconds, mae, mape
+    """
+    from walk_forward import run_walk_forward
+    from hyperparameter_search import fold_cutoffs
+    from train_prophet_improved import load_data
+
+    cutoffs = fold_cutoffs(load_data()['ds'], weeks)
+
+    rows = []
+    for months in months_list:
+        summary = run_walk_forward(cutoffs, 'prophet_v2', workers=workers,
+                                   window=(months, OLDER_EVERY_DAYS))
+        if len(summary):
+            rows.append({
+                'model': 'prophet_v2',
+                'months': months,
+                'train_rows': int(summary['train_rows'].mean()),
+                'fit_seconds': float(summary['fit_seconds'].mean()),
+                'mae': float(summary['mae'].mean()),
+                'mape': float(summary['mape'].mean()),
+            })
+
+    rows += _xgboost_report(months_list)
+    report = pd.DataFrame(rows)
+
+    print("\n" + "=" * 70)
+    print(f"EĞİTİM PENCERESİ RAPORU ({DB_PATH})")
+    print("=" * 70)
+    print(f"{'Model':<18} {'Pencere':>8} {'Satır':>8} {'Fit (sn)':>9} {'MAE':>9} {'MAPE':>8}")
+    for row in report.itertuples():
+        window = f"{row.months} ay" if row.months else "tümü"
+        mape = f"{row.mape:.2f}%" if row.mape is not None and not np.isnan(row.mape) else "-"
+        print(f"{row.model:<18} {window:>8} {row.train_rows:>8} {row.fit_seconds:>9.2f} "
+              f"{row.mae:>9.2f} {mape:>8}")
+    print("=" * 70)
+
+    report.to_csv(REPORT_PATH, index=False)
+    print(f"[+] Rapor kaydedildi: {REPORT_PATH}")
+    return report
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    options = {'--months': '3,6,12,24,0', '--weeks': '4', '--workers': None}
+    for flag in list(options):
+        if flag in argv:
+            i = argv.index(flag)
+            options[flag] = argv[i + 1]
+            del argv[i:i + 2]
+
+    window_report(
+        months_list=[int(m) for m in options['--months'].split(',')],
+        weeks=int(options['--weeks']),
+        workers=int(options['--workers']) if options['--workers'] else None,
+    )
@@ -5,18 +5,18 @@ Ekstrem dusuk fiyatlarin dogrulamasi - EPİAŞ verisinde hata var mi?
 """
 
 import pandas as pd
-import sqlite3
 import os
 import sys
 from datetime import datetime
 
 # Database path configuration
 try:
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 except ImportError:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from db_config import DB_PATH
+    from db_config import get_read_connection
 
+from hourly_panel import sync_hourly_panel
 
 def analyze_extreme_prices():
     """Ekstrem dusuk fiyatlari detayli analiz et"""
@@ -24,29 +24,28 @@ def analyze_extreme_prices():
     print("EKSTREM DUSUK FIYAT ANALIZI - Veri Kalitesi Kontrolu")
     print("="*70)
 
-    conn = sqlite3.connect(DB_PATH)
+    # hourly_panel'i guncelle (3 tablo onceden birlesik, JOIN gerekmez)
+    sync_hourly_panel()
+    conn = get_read_connection()
 
     # Ekstrem dusuk fiyatlari cek (< 100 TRY)
     query = """
         SELECT
-            m.date,
-            m.hour,
-            m.price as mcp_price,
-            c.consumption,
-            g.solar,
-            g.wind,
-            g.hydro,
-            g.total as total_generation,
-            CAST(strftime('%w', m.date) AS INTEGER) as day_of_week
-        FROM mcp_data m
-        LEFT JOIN consumption_data c ON m.date = c.date
-        LEFT JOIN generation_data g ON m.date = g.date
-        WHERE m.price < 100
-        ORDER BY m.price, m.date
+            date,
+            ts % 24 as hour,
+            price as mcp_price,
+            consumption,
+            solar,
+            wind,
+            hydro,
+            generation_total as total_generation,
+            CAST(strftime('%w', date) AS INTEGER) as day_of_week
+        FROM hourly_panel
+        WHERE price < 100
+        ORDER BY price, ts
     """
 
     df = pd.read_sql_query(query, conn)
-    conn.close()
 
     df['datetime'] = pd.to_datetime(df['date'])
     df['day_name'] = df['datetime'].dt.day_name()
@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Walk-Forward Motoru - Paralel Geçmiş Hafta Yeniden Eğitim + Tahmin
+===================================================================
+
+run_backtesting sadece forecast_history'deki kayıtlı tahminleri yeniden
+puanlar; gerçek "o günkü şartlarla eğit, sonraki haftayı tahmin et"
+simülasyonları (catchup_weekly_forecasts, backfill, evaluate_split) hafta hafta sırayla
+çalışır.
+
+Her kesim (cutoff) Pazartesi için:
+1. Sadece cutoff'tan ÖNCEKİ veriyle model eğitilir (data leakage yok)
+2. cutoff'tan başlayan hafta tahmin edilir
+3. Gerçek değerlerle puanlanır (MAPE / MAE / RMSE)
+
+- Veri bir kez yüklenir; her cutoff'un eğitim dilimi ve gelecek
+  feature'ları ana süreçte hazırlanır (seasonal_profile gibi önbellekler
+  tek süreçten yazılır)
+- Eğitim dilimine üretimdeki eğitim penceresi uygulanır (training_window);
+  rapor için farklı pencereler ayrı spec adlarıyla (örn. prophet_v2_w6)
+  çalıştırılabilir
+- Fit + tahmin süreç havuzunda (spawn) paralel; her işçinin kendi geçici
+  dizini vardır (cmdstan çıktı / init dosyaları çakışmaz)
+- Sonuçlar tamamlandıkça DB'ye yazılır (walk_forward_results /
+  walk_forward_forecasts); istenirse forecast_history + weekly_performance
+
+Kullanım:
+    python walk_forward.py prophet_v2 2025-01-06 2025-12-29 [--workers 8] [--history]
+"""
+
+import numpy as np
+import pandas as pd
+import atexit
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+# Database path configuration
+try:
+    from db_config import run_write
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from db_config import run_write
+
+from features import add_features, get_prophet_features
+from forecast_store import format_datetimes, save_week_forecasts
+from training_window import OLDER_EVERY_DAYS, WINDOW_MONTHS, apply_training_window
+
+# Tahmin ufku (saat)
+HORIZON_HOURS = 7 * 24
+
+# MAPE'ye dahil edilen minimum gerçek fiyat (compare_forecasts ile aynı)
+MAPE_MIN_PRICE = 100
+
+CREATE_RESULTS_SQL = """
+    CREATE TABLE IF NOT EXISTS walk_forward_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        spec TEXT NOT NULL,
+        cutoff DATE NOT NULL,
+        train_rows INTEGER NOT NULL,
+        fit_seconds REAL,
+        iterations INTEGER,
+        mape REAL,
+        mae REAL,
+        rmse REAL,
+        total_predictions INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(spec, cutoff)
+    )
+"""
+
+CREATE_FORECASTS_SQL = """
+    CREATE TABLE IF NOT EXISTS walk_forward_forecasts (
+        spec TEXT NOT NULL,
+        cutoff DATE NOT NULL,
+        forecast_datetime TEXT NOT NULL,
+        predicted_price REAL NOT NULL,
+        actual_price REAL,
+        PRIMARY KEY (spec, cutoff, forecast_datetime)
+    )
+"""
+
+UPSERT_RESULT_SQL = """
+    INSERT INTO walk_forward_results (
+        run_id, spec, cutoff, train_rows, fit_seconds, iterations,
+        mape, mae, rmse, total_predictions
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(spec, cutoff) DO UPDATE SET
+        run_id = excluded.run_id,
+        train_rows = excluded.train_rows,
+        fit_seconds = excluded.fit_seconds,
+        iterations = excluded.iterations,
+        mape = excluded.mape,
+        mae = excluded.mae,
+        rmse = excluded.rmse,
+        total_predictions = excluded.total_predictions,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+
+# ========================================
+# MODEL TANIMLARI
+# ========================================
+
+def _load_prophet_v2():
+    """v2 modelinin verisi: mcp_data fiyatları + extreme_low_risk"""
+    from train_prophet_improved import load_data, add_extreme_low_regressor
+    return add_extreme_low_regressor(load_data())[['ds', 'y', 'extreme_low_risk']]
+
+
+def _build_prophet_v2():
+    from train_prophet_improved import build_model
+    return build_model()
+
+
+def _load_prophet():
+    """
+    Multivariate modelin verisi: feature store (gelecek regressor'ları
+    profil / lag kolonlarından türetildiği için tüm kolonlar)
+    """
+    from feature_store import load_features
+    return load_features()
+
+
+def _build_prophet():
+    from train_prophet import build_prophet_model
+    from calendar_table import bayram_holidays
+    return build_prophet_model(bayram_holidays(), verbose=False)
+
+
+# spec adı -> veri yükleyici (ana süreç), model kurucu (işçi), regressor'lar
+MODEL_SPECS = {
+    'prophet_v2': {
+        'load': _load_prophet_v2,
+        'build': _build_prophet_v2,
+        'regressors': ['extreme_low_risk'],
+    },
+    'prophet': {
+        'load': _load_prophet,
+        'build': _build_prophet,
+        'regressors': get_prophet_features(),
+    },
+}
+
+
+# ========================================
+# İŞÇİ SÜREÇ
+# ========================================
+
+def quiet_stan_logging():
+    """
+    cmdstanpy / prophet INFO loglarını ("Chain [1] start processing") susturur.
+
+    cmdstanpy logger'ını ilk log anında (fit içinde) kurar ve handler'ı
+    yoksa seviyesini DEBUG'a çeker; model kurulduktan sonra verilen seviye
+    bu yüzden ezilir. Önceden eklenen NullHandler bunu engeller, WARNING ve
+    üstü root logger'a iletilmeye devam eder.
+    """
+    for name in ('cmdstanpy', 'prophet'):
+        logger = logging.getLogger(name)
+        logger.addHandler(logging.NullHandler())
+        logger.setLevel(logging.WARNING)
+
+
+def _init_worker():
+    """
+    İşçiye özel geçici dizin (cmdstanpy, prophet import edilmeden önce)
+    ve sessiz Stan logları.
+
+    cmdstanpy veri/init JSON'larını ve optimizer çıktısını import anında
+    oluşturduğu tempfile dizinine yazar; spawn ile her işçi kendi dizininde
+    başlar.
+    """
+    worker_dir = tempfile.mkdtemp(prefix=f'walk_forward_{os.getpid()}_')
+    tempfile.tempdir = worker_dir
+    os.environ['TMPDIR'] = worker_dir
+    atexit.register(shutil.rmtree, worker_dir, ignore_errors=True)
+    quiet_stan_logging()
+
+
+def _fit_and_forecast(spec_name, cutoff, train, future):
+    """
+    Bir cutoff için modeli eğitir ve ufku tahmin eder (işçide çalışır).
+
+    Returns:
+        dict: cutoff, forecast (ds, yhat), fit_seconds, iterations
+    """
+    from prophet_warm_start import optimizer_iterations
+
+    model = MODEL_SPECS[spec_name]['build']()
+
+    start = time.perf_counter()
+    model.fit(train)
+    fit_seconds = time.perf_counter() - start
+
+    forecast = model.predict(future)
+    return {
+        'cutoff': cutoff,
+        'forecast': forecast[['ds', 'yhat']],
+        'fit_seconds': fit_seconds,
+        'iterations': optimizer_iterations(model),
+    }
+
+
+# ========================================
+# ANA SÜREÇ
+# ========================================
+
+def ensure_walk_forward_tables(conn):
+    """walk_forward_results / walk_forward_forecasts tablolarını oluşturur"""
+    conn.execute(CREATE_RESULTS_SQL)
+    conn.execute(CREATE_FORECASTS_SQL)
+
+
+def mondays(start_date, end_date):
+    """[start_date, end_date] aralığındaki Pazartesiler ('YYYY-MM-DD' listesi)"""
+    dates = pd.date_range(pd.Timestamp(start_date), pd.Timestamp(end_date), freq='W-MON')
+    return [d.strftime('%Y-%m-%d') for d in dates]
+
+
+def score_week(y_true, y_pred):
+    """
+    Haftalık metrikler (compare_forecasts.compare_week ile aynı tanımlar).
+
+    Returns:
+        dict: mape, mae, rmse, total_predictions (gerçek değer yoksa metrikler None)
+    """
+    if len(y_true) == 0:
+        return {'mape': None, 'mae': None, 'rmse': None, 'total_predictions': 0}
+
+    errors = y_true - y_pred
+    mask = y_true > MAPE_MIN_PRICE
+    return {
+        'mape': float(np.mean(np.abs(errors[mask]) / y_true[mask]) * 100) if mask.any() else 0.0,
+        'mae': float(np.mean(np.abs(errors))),
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'total_predictions': int(len(y_true)),
+    }
+
+
+def _prepare_cutoff(data, regressors, cutoff, window=None):
+    """
+    cutoff için eğitim dilimi, gelecek frame'i ve gerçek değerler.
+
+    Gelecek regressor'ları sadece eğitim diliminden türetilir
+    (predict / prepare_future_features ile aynı yol); işçiye sadece
+    ds, y ve regressor kolonları gönderilir.
+
+    Args:
+        window (tuple, optional): (ay, eski geçmiş gün aralığı); None ise
+                                  üretim ayarları (WINDOW_MONTHS, OLDER_EVERY_DAYS)
+    """
+    start = pd.Timestamp(cutoff)
+    end = start + timedelta(hours=HORIZON_HOURS)
+    ds = data['ds'].to_numpy()
+    lo = int(np.searchsorted(ds, start.to_datetime64()))
+    hi = int(np.searchsorted(ds, end.to_datetime64()))
+
+    train = data.iloc[:lo]
+    future = pd.DataFrame({'ds': pd.date_range(start, periods=HORIZON_HOURS, freq='h')})
+    future = add_features(future, regressors, history=train)
+    actual = data.iloc[lo:hi][['ds', 'y']]
+
+    # Pencere, gelecek feature'ları tam geçmişten türetildikten sonra uygulanır
+    months, older_every_days = window or (WINDOW_MONTHS, OLDER_EVERY_DAYS)
+    train = apply_training_window(train, months, older_every_days, verbose=False)
+    return train[['ds', 'y'] + regressors], future, actual
+
+
+def _save_result(run_id, spec_name, cutoff, train_rows, result, merged, metrics):
+    """Bir cutoff'un sonucunu ve saatlik tahminlerini tek transaction'da yazar"""
+    actual = merged['y'].to_numpy(dtype=np.float64)
+    rows = list(zip(
+        [spec_name] * len(merged),
+        [cutoff] * len(merged),
+        format_datetimes(merged['ds']),
+        merged['yhat'].to_numpy(dtype=np.float64).tolist(),
+        [None if np.isnan(v) else v for v in actual.tolist()],
+    ))
+
+    def write(conn):
+        ensure_walk_forward_tables(conn)
+        conn.execute(UPSERT_RESULT_SQL, (
+            run_id, spec_name, cutoff, train_rows,
+            float(result['fit_seconds']), result['iterations'],
+            metrics['mape'], metrics['mae'], metrics['rmse'], metrics['total_predictions'],
+        ))
+        conn.execute(
+            "DELETE FROM walk_forward_forecasts WHERE spec = ? AND cutoff = ?",
+            (spec_name, cutoff)
+        )
+        conn.executemany("INSERT INTO walk_forward_forecasts VALUES (?, ?, ?, ?, ?)", rows)
+
+    run_write(write)
+
+
+def run_walk_forward(cutoffs, spec_name='prophet_v2', workers=None, save_history=False,
+                     window=None):
+    """
+    Cutoff Pazartesileri için paralel eğit-tahmin et-puanla.
+
+    Args:
+        cutoffs (list): 'YYYY-MM-DD' Pazartesi listesi
+        spec_name (str): MODEL_SPECS anahtarı
+        workers (int, optional): Süreç sayısı (None ise CPU sayısı)
+        save_history (bool): Tahminleri forecast_history'ye de yaz ve
+                             compare_week ile weekly_performance'ı güncelle
+                             (catch-up / backfill için)
+        window (tuple, optional): (ay, eski geçmiş gün aralığı) eğitim
+                                  penceresi; verilirse sonuçlar
+                                  '<spec>_w<ay>' adıyla kaydedilir
+
+    Returns:
+        pd.DataFrame: cutoff başına metrikler (cutoff sıralı)
+    """
+    spec = MODEL_SPECS[spec_name]
+    result_name = f"{spec_name}_w{window[0]}" if window else spec_name
+    cutoffs = sorted(set(cutoffs))
+    workers = min(workers or os.cpu_count() or 1, len(cutoffs)) or 1
+    run_id = pd.Timestamp.now().strftime('%Y%m%d%H%M%S')
+
+    print("=" * 70)
+    print(f"WALK-FORWARD: {result_name}, {len(cutoffs)} hafta, {workers} süreç")
+    print("=" * 70)
+
+    print("[*] Veri yükleniyor...")
+    data = spec['load']().sort_values('ds').reset_index(drop=True)
+    print(f"[+] {len(data)} satır ({data['ds'].min()} -> {data['ds'].max()})")
+
+    started = time.perf_counter()
+    results = []
+    actuals = {}
+
+    # spawn: işçiler prophet/cmdstanpy'yi kendi geçici dizinleriyle import eder
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker) as pool:
+        futures = {}
+        for cutoff in cutoffs:
+            train, future, actual = _prepare_cutoff(data, spec['regressors'], cutoff, window)
+            if len(train) < 2:
+                print(f"[!] {cutoff}: cutoff öncesi veri yok, atlandı")
+                continue
+            actuals[cutoff] = (len(train), actual)
+            futures[pool.submit(_fit_and_forecast, spec_name, cutoff, train, future)] = cutoff
+
+        for done, task in enumerate(as_completed(futures), start=1):
+            cutoff = futures[task]
+            try:
+                result = task.result()
+            except Exception as e:
+                print(f"[!] {cutoff}: HATA - {e}")
+                continue
+
+            train_rows, actual = actuals.pop(cutoff)
+            merged = result['forecast'].merge(actual, on='ds', how='left')
+            known = merged['y'].notna().to_numpy()
+            metrics = score_week(merged['y'].to_numpy()[known], merged['yhat'].to_numpy()[known])
+
+            _save_result(run_id, result_name, cutoff, train_rows, result, merged, metrics)
+            if save_history:
+                week_end = (pd.Timestamp(cutoff) + timedelta(days=6)).strftime('%Y-%m-%d')
+                save_week_forecasts(result['forecast'], cutoff, week_end)
+                if metrics['total_predictions']:
+                    from compare_forecasts import compare_week
+                    compare_week(cutoff, week_end)
+
+            mape = f"{metrics['mape']:.2f}%" if metrics['mape'] is not None else "-"
+            print(f"[+] {cutoff}: MAPE {mape}, fit {result['fit_seconds']:.1f} sn, "
+                  f"{result['iterations']} iterasyon [{done}/{len(futures)}]")
+            results.append({
+                'cutoff': cutoff,
+                'train_rows': train_rows,
+                'fit_seconds': result['fit_seconds'],
+                'iterations': result['iterations'],
+                **metrics,
+            })
+
+    summary = pd.DataFrame(results)
+    if len(summary):
+        summary = summary.sort_values('cutoff').reset_index(drop=True)
+
+    elapsed = time.perf_counter() - started
+    print("\n" + "=" * 70)
+    print(f"[+] {len(summary)}/{len(cutoffs)} hafta tamamlandı: {elapsed:.1f} sn")
+    if len(summary) and summary['mape'].notna().any():
+        print(f"[*] Ortalama MAPE: {summary['mape'].mean():.2f}%, "
+              f"MAE: {summary['mae'].mean():.2f} TRY")
+        print(f"[*] Toplam fit süresi: {summary['fit_seconds'].sum():.1f} sn "
+              f"(paralel hızlanma x{summary['fit_seconds'].sum() / elapsed:.1f})")
+    print("=" * 70)
+    return summary
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    n_workers = None
+    if '--workers' in argv:
+        i = argv.index('--workers')
+        n_workers = int(argv[i + 1])
+        del argv[i:i + 2]
+
+    args = [arg for arg in argv if not arg.startswith('--')]
+    if len(args) < 3 or args[0] not in MODEL_SPECS:
+        print(f"Kullanım: python walk_forward.py <{'|'.join(MODEL_SPECS)}> "
+              f"<ilk Pazartesi> <son Pazartesi> [--workers N] [--history]")
+        sys.exit(1)
+
+    run_walk_forward(
+        mondays(args[1], args[2]),
+        spec_name=args[0],
+        workers=n_workers,
+        save_history='--history' in argv,
+    )
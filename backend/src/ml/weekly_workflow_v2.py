@@ -6,11 +6,15 @@ EPİAŞ MCP Fiyat Tahmini - Haftalık İş Akışı (v2 - Sadece Prophet v2)
 
 Bu script haftalık döngüyü orkestre eder:
 1. Geçen hafta tahmin vs gerçek karşılaştırması
-2. Prophet v2 model eğitimi (sadece time-based features)
+2. Prophet v2 model eğitimi (sadece time-based features) - drift_monitor
+   kararına göre: atla / warm start / tam yeniden eğitim
 3. Bu hafta tahmini
 4. JSON export
 
 Her Pazartesi sabah 07:00 TRT'de GitHub Actions tarafından çalıştırılır.
+
+PROPHET_FAMILY=hourly ise tek v2 modeli yerine saatlik Prophet ailesi
+(prophet_hourly, 24 model) eğitilir ve tahminde kullanılır.
 """
 
 import sys
@@ -102,13 +106,33 @@ def run_weekly_cycle():
     print("="*70)
     print(f"Egitim verisi: {this_week_monday} tarihine KADAR (dahil degil)")
 
+    # Drift / hata trendi / revizyon kontrolü; hata olursa her zamanki gibi eğitilir
     try:
-        from train_prophet_improved import main as train_prophet_v2
-        model, mae, rmse, mape = train_prophet_v2()
-        print(f"\nBasarili! Prophet v2 model egitimi tamamlandi!")
-        print(f"   Test performansi: MAE={mae:.2f} TRY, MAPE={mape:.2f}%")
+        from drift_monitor import decide_retrain, log_decision
+        decision = decide_retrain(this_week_monday)
+        log_decision(decision)
+        model_name, decision = decision['model'], decision['decision']
+    except Exception as e:
+        print(f"\nUyari: Drift kontrolu yapilamadi, model yeniden egitilecek: {e}")
+        model_name, decision = None, 'warm'
+
+    try:
+        from prophet_hourly import use_hourly_family
+        if model_name is None:
+            model_name = 'prophet_hourly' if use_hourly_family() else 'prophet_v2'
+        if decision == 'skip':
+            print(f"\nModel egitimi atlandi (mevcut model kullanilacak)")
+        elif use_hourly_family():
+            from prophet_hourly import main as train_prophet_hourly
+            model, mae, rmse, mape = train_prophet_hourly()
+        else:
+            from train_prophet_improved import main as train_prophet_v2
+            model, mae, rmse, mape = train_prophet_v2(warm_start=(decision == 'warm'))
+        if decision != 'skip':
+            print(f"\nBasarili! {model_name} model egitimi tamamlandi ({decision})!")
+            print(f"   Test performansi: MAE={mae:.2f} TRY, MAPE={mape:.2f}%")
     except Exception as e:
-        print(f"\nHATA: Prophet v2 model egitimi BASARISIZ: {e}")
+        print(f"\nHATA: {model_name or 'Prophet'} model egitimi BASARISIZ: {e}")
         import traceback
         traceback.print_exc()
         raise e
@@ -127,8 +151,8 @@ def run_weekly_cycle():
         # Prophet v2 modelini yukle
         model = load_model()
 
-        # 7 günlük tahmin
-        forecasts = make_forecast(model, days=7)
+        # 7 günlük tahmin (model atlandıysa eğitim sonu geçen haftada kalır)
+        forecasts = make_forecast(model, days=7, start=this_week_monday)
 
         print(f"\nBasarili! {len(forecasts)} saatlik tahmin uretildi")
         print(f"   Ortalama: {forecasts['yhat'].mean():.2f} TRY")
@@ -168,7 +192,8 @@ def run_weekly_cycle():
     print("HAFTALIK IS AKISI TAMAMLANDI!")
     print("="*70)
     print(f"Yeni hafta tahmini hazir: {this_week_monday} - {this_week_sunday}")
-    print(f"Model: Prophet v2 (time-based)")
+    from prophet_hourly import use_hourly_family
+    print(f"Model: Prophet v2 ({'saatlik aile' if use_hourly_family() else 'time-based'})")
     print(f"Gecen hafta performansi kaydedildi")
     print(f"JSON dosyasi frontend icin guncellendi")
     print("="*70)
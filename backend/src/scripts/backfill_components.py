@@ -10,8 +10,8 @@ Bu script bir defaya mahsus çalıştırılır.
 
 import sys
 import os
-from datetime import datetime, timedelta
-import sqlite3
+import numpy as np
+import pandas as pd
 
 # Path ayarları
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,13 +21,13 @@ sys.path.append(ml_dir)
 # ML modülleri
 from ensemble import EnsembleModel
 from features import load_combined_data, engineer_features
-
-# Veritabanı yolu
-DB_PATH = os.path.join(script_dir, '../../data/energy.db')
+from db_config import get_read_connection
+from forecast_store import update_forecast_components
+from hourly_series import HourlySeries
 
 def get_weeks_without_components():
     """Model bileşen verisi olmayan haftaları döndürür"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
     query = """
         SELECT DISTINCT week_start, week_end
         FROM forecast_history
@@ -35,7 +35,6 @@ def get_weeks_without_components():
         ORDER BY week_start DESC
     """
     weeks = conn.execute(query).fetchall()
-    conn.close()
     return weeks
 
 def update_week_components(week_start, week_end, ensemble, df):
@@ -43,7 +42,7 @@ def update_week_components(week_start, week_end, ensemble, df):
     print(f"\n[*] {week_start} haftası için bileşenler hesaplanıyor...")
     
     # Hafta için tahmin tarihlerini al
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_read_connection()
     forecast_query = """
         SELECT id, forecast_datetime
         FROM forecast_history
@@ -54,7 +53,6 @@ def update_week_components(week_start, week_end, ensemble, df):
     
     if len(forecasts) == 0:
         print(f"   [!] Bu hafta için tahmin bulunamadı")
-        conn.close()
         return 0
     
     # Ensemble model ile tüm veri üzerinde tahmin yap
@@ -65,40 +63,33 @@ def update_week_components(week_start, week_end, ensemble, df):
         lstm_all = predictions['lstm_pred']
     except Exception as e:
         print(f"   [!] Tahmin hatası: {e}")
-        conn.close()
         return 0
     
-    # Her forecast için eşleşen bileşen değerlerini bul
-    updated = 0
-    update_query = """
-        UPDATE forecast_history
-        SET prophet_component = ?, xgboost_component = ?, lstm_component = ?
-        WHERE id = ?
-    """
+    # Tahminler epoch-saat indeksli seriye alınır; her forecast saati
+    # df['ds'] == dt taraması yerine O(1) pozisyon hesabıyla bulunur
+    n_rows = min(len(df), len(prophet_all), len(xgboost_all), len(lstm_all))
+    components = HourlySeries.from_frame(pd.DataFrame({
+        'ds': df['ds'].values[:n_rows],
+        'prophet': np.asarray(prophet_all)[:n_rows],
+        'xgboost': np.asarray(xgboost_all)[:n_rows],
+        'lstm': np.asarray(lstm_all)[:n_rows],
+    }))
+    
+    forecast_ids = np.array([forecast_id for forecast_id, _ in forecasts])
+    forecast_times = pd.to_datetime([forecast_dt for _, forecast_dt in forecasts], format='%Y-%m-%d %H:%M:%S')
     
-    for forecast_id, forecast_dt in forecasts:
-        # forecast_datetime'ı datetime'a çevir
-        dt = datetime.strptime(forecast_dt, '%Y-%m-%d %H:%M:%S')
-        
-        # df'de bu tarihi bul - positional index kullan
-        mask = df['ds'] == dt
-        if mask.sum() > 0:
-            # Pozisyonel indeks bul (iloc için)
-            pos_idx = mask.values.argmax()
-            
-            try:
-                prophet_val = float(prophet_all[pos_idx])
-                xgboost_val = float(xgboost_all[pos_idx])
-                lstm_val = float(lstm_all[pos_idx])
-                
-                conn.execute(update_query, (prophet_val, xgboost_val, lstm_val, forecast_id))
-                updated += 1
-            except (IndexError, KeyError) as e:
-                # Bu tarih için veri yoksa atla
-                pass
+    # Bu tarih için veri yoksa atla
+    positions = components.positions(forecast_times)
+    found = positions >= 0
+    positions = positions[found]
     
-    conn.commit()
-    conn.close()
+    # Tek transaction: staging tablo + UPDATE ... FROM
+    updated = update_forecast_components(
+        forecast_ids[found],
+        components['prophet'][positions],
+        components['xgboost'][positions],
+        components['lstm'][positions]
+    )
     
     print(f"   [+] {updated} kayıt güncellendi")
     return updated
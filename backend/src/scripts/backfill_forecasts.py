@@ -22,7 +22,7 @@ sys.path.append(ml_dir)
 from train_prophet import main as train_prophet
 from train_xgboost import main as train_xgboost
 from ensemble import EnsembleModel, export_forecasts_json
-from features import load_combined_data, engineer_features
+from feature_store import load_features
 from predict import save_forecast_to_db
 
 def run_backfill_for_date(target_monday):
@@ -53,8 +53,7 @@ def run_backfill_for_date(target_monday):
         
         # 3. Tahmin Üretme
         print("\n[3/4] Tahmin Üretiliyor...")
-        df = load_combined_data(end_date=target_monday) # Tahmin için o tarihe kadar olan veri lazım
-        df = engineer_features(df)
+        df = load_features(end_date=target_monday) # Tahmin için o tarihe kadar olan veri lazım
         
         ensemble = EnsembleModel()
         ensemble.load_models()
@@ -62,6 +62,61 @@ function initTestDatabase(db: Database.Database) {
       UNIQUE(date, hour)
     )
   `);
+
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS hourly_panel (
+      ts INTEGER PRIMARY KEY,
+      date TEXT NOT NULL,
+      price REAL NOT NULL,
+      price_usd REAL,
+      price_eur REAL,
+      consumption REAL,
+      generation_total REAL,
+      biomass REAL,
+      fueloil REAL,
+      geothermal REAL,
+      hydro REAL,
+      import_export REAL,
+      lignite REAL,
+      lng REAL,
+      natural_gas REAL,
+      naphtha REAL,
+      river REAL,
+      solar REAL,
+      wind REAL,
+      wasteheat REAL,
+      asphaltite_coal REAL,
+      black_coal REAL,
+      import_coal REAL
+    )
+  `);
+}
+
+function refreshHourlyPanel(db: Database.Database, fromDate?: string, toDate?: string): number {
+  const from = fromDate ? fromDate.substring(0, 10) : '0000-00-00';
+  const to = toDate ? `${toDate.substring(0, 10)}~` : '9999-99-99';
+
+  const refresh = db.prepare(`
+    INSERT OR REPLACE INTO hourly_panel (
+      ts, date, price, price_usd, price_eur, consumption, generation_total,
+      biomass, fueloil, geothermal, hydro, import_export, lignite, lng,
+      natural_gas, naphtha, river, solar, wind, wasteheat,
+      asphaltite_coal, black_coal, import_coal
+    )
+    SELECT
+      CAST(strftime('%s', substr(m.date, 1, 10)) AS INTEGER) / 3600
+        + CAST(substr(m.hour, 1, 2) AS INTEGER),
+      m.date, m.price, m.price_usd, m.price_eur, c.consumption, g.total,
+      g.biomass, g.fueloil, g.geothermal, g.hydro, g.import_export, g.lignite, g.lng,
+      g.natural_gas, g.naphtha, g.river, g.solar, g.wind, g.wasteheat,
+      g.asphaltite_coal, g.black_coal, g.import_coal
+    FROM mcp_data m
+    LEFT JOIN consumption_data c ON c.date = m.date AND c.hour = m.hour
+    LEFT JOIN generation_data g ON g.date = m.date AND g.hour = m.hour
+    WHERE m.date >= ? AND m.date <= ?
+  `);
+
+  return refresh.run(from, to).changes;
 }
 
 // Test implementations of database functions
@@ -422,4 +477,65 @@ describe('Database Service', () => {
       expect(result[2].hour).toBe('02:00');
     });
   });
+
+  describe('Hourly Panel', () => {
+    it('should combine price, consumption and generation into one row per hour', () => {
+      insertMCPData(testDb, [
+        { date: '2025-10-28T00:00:00+03:00', hour: '00:00', price: 2500, priceUsd: 85, priceEur: 78 },
+        { date: '2025-10-28T01:00:00+03:00', hour: '01:00', price: 2400, priceUsd: 82, priceEur: 75 }
+      ]);
+      insertConsumptionData(testDb, [
+        { date: '2025-10-28T00:00:00+03:00', time: '00:00', consumption: 32000 }
+      ]);
+      insertGenerationData(testDb, [
+        { date: '2025-10-28T00:00:00+03:00', hour: '00:00', total: 33000, sun: 0, wind: 5000 }
+      ]);
+
+      const written = refreshHourlyPanel(testDb, '2025-10-28', '2025-10-28');
+      expect(written).toBe(2);
+
+      const rows = testDb.prepare('SELECT * FROM hourly_panel ORDER BY ts').all() as any[];
+      expect(rows).toHaveLength(2);
+
+      // ts = yerel saat bazlı epoch-saat
+      expect(rows[0].ts).toBe(Date.UTC(2025, 9, 28, 0) / 3600000);
+      expect(rows[1].ts - rows[0].ts).toBe(1);
+
+      expect(rows[0].price).toBe(2500);
+      expect(rows[0].consumption).toBe(32000);
+      expect(rows[0].generation_total).toBe(33000);
+      expect(rows[0].wind).toBe(5000);
+
+      // Tüketim/üretim verisi olmayan saat de panelde yer alır (LEFT JOIN)
+      expect(rows[1].consumption).toBeNull();
+      expect(rows[1].generation_total).toBeNull();
+    });
+
+    it('should only refresh the requested date range', () => {
+      insertMCPData(testDb, [
+        { date: '2025-10-27T23:00:00+03:00', hour: '23:00', price: 2000, priceUsd: 70, priceEur: 65 },
+        { date: '2025-10-28T00:00:00+03:00', hour: '00:00', price: 2500, priceUsd: 85, priceEur: 78 }
+      ]);
+
+      refreshHourlyPanel(testDb, '2025-10-28', '2025-10-28');
+
+      const count = testDb.prepare('SELECT COUNT(*) as count FROM hourly_panel').get() as { count: number };
+      expect(count.count).toBe(1);
+    });
+
+    it('should pick up late-arriving consumption on refresh', () => {
+      insertMCPData(testDb, [
+        { date: '2025-10-28T00:00:00+03:00', hour: '00:00', price: 2500, priceUsd: 85, priceEur: 78 }
+      ]);
+      refreshHourlyPanel(testDb);
+
+      insertConsumptionData(testDb, [
+        { date: '2025-10-28T00:00:00+03:00', time: '00:00', consumption: 31000 }
+      ]);
+      refreshHourlyPanel(testDb, '2025-10-28', '2025-10-28');
+
+      const row = testDb.prepare('SELECT consumption FROM hourly_panel').get() as { consumption: number };
+      expect(row.consumption).toBe(31000);
+    });
+  });
 });
@@ -146,9 +146,101 @@ export function initDatabase() {
     CREATE INDEX IF NOT EXISTS idx_weekly_perf_week ON weekly_performance(week_start);
   `);
 
+  // Saatlik Panel (Hourly Panel) tablosu
+  // mcp_data + consumption_data + generation_data'nın tek satırda birleşmiş hali.
+  // ts = yerel saat (TRT) bazlı epoch-saat (tarih + saat kolonundan hesaplanır).
+  // ML tarafı DATE() JOIN yerine bu tablodan düz range scan ile okur.
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS hourly_panel (
+      ts INTEGER PRIMARY KEY,
+      date TEXT NOT NULL,
+      price REAL NOT NULL,
+      price_usd REAL,
+      price_eur REAL,
+      consumption REAL,
+      generation_total REAL,
+      biomass REAL,
+      fueloil REAL,
+      geothermal REAL,
+      hydro REAL,
+      import_export REAL,
+      lignite REAL,
+      lng REAL,
+      natural_gas REAL,
+      naphtha REAL,
+      river REAL,
+      solar REAL,
+      wind REAL,
+      wasteheat REAL,
+      asphaltite_coal REAL,
+      black_coal REAL,
+      import_coal REAL
+    )
+  `);
+
+  // Panel boşsa (eski database) mevcut veriden bir kez doldur
+  const panelCount = db.prepare('SELECT COUNT(*) as count FROM hourly_panel').get() as { count: number };
+  if (panelCount.count === 0) {
+    refreshHourlyPanel();
+  }
+
   console.log('✅ Database initialized successfully');
 }
 
+/**
+ * hourly_panel tablosunu verilen tarih aralığı için yeniden hesaplar
+ *
+ * Tarih verilmezse tüm tablo yeniden doldurulur. Insert fonksiyonları
+ * sadece eklenen günlerin aralığı için çağırır (artımlı güncelleme).
+ *
+ * @param fromDate - Başlangıç tarihi (dahil, YYYY-MM-DD veya tam tarih)
+ * @param toDate - Bitiş tarihi (dahil, YYYY-MM-DD veya tam tarih)
+ * @returns Güncellenen panel satırı sayısı
+ */
+export function refreshHourlyPanel(fromDate?: string, toDate?: string): number {
+  const from = fromDate ? fromDate.substring(0, 10) : '0000-00-00';
+  // '~' tüm tarih/saat karakterlerinden büyük -> toDate gününün tüm saatleri dahil
+  const to = toDate ? `${toDate.substring(0, 10)}~` : '9999-99-99';
+
+  const refresh = db.prepare(`
+    INSERT OR REPLACE INTO hourly_panel (
+      ts, date, price, price_usd, price_eur, consumption, generation_total,
+      biomass, fueloil, geothermal, hydro, import_export, lignite, lng,
+      natural_gas, naphtha, river, solar, wind, wasteheat,
+      asphaltite_coal, black_coal, import_coal
+    )
+    SELECT
+      CAST(strftime('%s', substr(m.date, 1, 10)) AS INTEGER) / 3600
+        + CAST(substr(m.hour, 1, 2) AS INTEGER),
+      m.date, m.price, m.price_usd, m.price_eur, c.consumption, g.total,
+      g.biomass, g.fueloil, g.geothermal, g.hydro, g.import_export, g.lignite, g.lng,
+      g.natural_gas, g.naphtha, g.river, g.solar, g.wind, g.wasteheat,
+      g.asphaltite_coal, g.black_coal, g.import_coal
+    FROM mcp_data m
+    LEFT JOIN consumption_data c ON c.date = m.date AND c.hour = m.hour
+    LEFT JOIN generation_data g ON g.date = m.date AND g.hour = m.hour
+    WHERE m.date >= ? AND m.date <= ?
+  `);
+
+  return refresh.run(from, to).changes;
+}
+
+/**
+ * Eklenen kayıtların kapsadığı gün aralığı için paneli günceller
+ */
+function refreshHourlyPanelFor(items: { date: string }[]) {
+  if (items.length === 0) return;
+
+  let minDate = items[0].date;
+  let maxDate = items[0].date;
+  for (const item of items) {
+    if (item.date < minDate) minDate = item.date;
+    if (item.date > maxDate) maxDate = item.date;
+  }
+
+  refreshHourlyPanel(minDate, maxDate);
+}
+
 /**
  * MCP verilerini database'e toplu olarak ekler
  *
@@ -169,6 +261,7 @@ export function insertMCPData(items: MCPItem[]): number {
   });
 
   insertMany(items);
+  refreshHourlyPanelFor(items);
 
   console.log(`✅ Inserted ${items.length} MCP records into database`);
   return items.length;
@@ -231,6 +324,7 @@ export function insertGenerationData(items: GenerationItem[]): number {
   });
 
   insertMany(items);
+  refreshHourlyPanelFor(items);
 
   console.log(`✅ Inserted ${items.length} Generation records into database`);
   return items.length;
@@ -256,6 +350,7 @@ export function insertConsumptionData(items: ConsumptionItem[]): number {
   });
 
   insertMany(items);
+  refreshHourlyPanelFor(items);
 
   console.log(`✅ Inserted ${items.length} Consumption records into database`);
   return items.length;